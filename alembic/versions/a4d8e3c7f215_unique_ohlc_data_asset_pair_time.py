@@ -0,0 +1,94 @@
+"""Unique ohlc_data (asset_pair_id, time)
+
+Creates the OHLC tables when the database predates them, otherwise removes
+duplicated candles and replaces idx_ohlc_data_asset_pair_time by a unique
+constraint on the same columns.
+
+Revision ID: a4d8e3c7f215
+Revises: 7c1e5b2f9a63
+Create Date: 2026-10-18 13:05:51.884120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e3c7f215"
+down_revision: Union[str, None] = "7c1e5b2f9a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("ohlc_asset_pairs"):
+        op.create_table(
+            "ohlc_asset_pairs",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(["name"], ["assets_pairs.pair_name"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("name"),
+        )
+
+    if not inspector.has_table("ohlc_results"):
+        op.create_table(
+            "ohlc_results",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("asset_pair_id", sa.Integer(), nullable=False),
+            sa.Column("last", sa.BigInteger(), nullable=False),
+            sa.ForeignKeyConstraint(["asset_pair_id"], ["ohlc_asset_pairs.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if not inspector.has_table("ohlc_data"):
+        op.create_table(
+            "ohlc_data",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("asset_pair_id", sa.Integer(), nullable=False),
+            sa.Column("time", sa.BigInteger(), nullable=False),
+            sa.Column("open", sa.Float(), nullable=False),
+            sa.Column("high", sa.Float(), nullable=False),
+            sa.Column("low", sa.Float(), nullable=False),
+            sa.Column("close", sa.Float(), nullable=False),
+            sa.Column("vwap", sa.Float(), nullable=False),
+            sa.Column("volume", sa.Float(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["asset_pair_id"], ["ohlc_asset_pairs.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "asset_pair_id", "time", name="uq_ohlc_data_asset_pair_time"
+            ),
+        )
+        op.create_index(op.f("ix_ohlc_data_time"), "ohlc_data", ["time"], unique=False)
+        return
+
+    # Keep the first imported row of every duplicated candle
+    op.execute(
+        """
+        DELETE FROM ohlc_data a
+        USING ohlc_data b
+        WHERE a.asset_pair_id = b.asset_pair_id
+          AND a.time = b.time
+          AND a.id > b.id
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS idx_ohlc_data_asset_pair_time")
+    op.create_unique_constraint(
+        "uq_ohlc_data_asset_pair_time", "ohlc_data", ["asset_pair_id", "time"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_ohlc_data_asset_pair_time", "ohlc_data", type_="unique")
+    op.create_index(
+        "idx_ohlc_data_asset_pair_time",
+        "ohlc_data",
+        ["asset_pair_id", "time"],
+        unique=False,
+    )
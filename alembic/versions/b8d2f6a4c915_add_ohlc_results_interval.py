@@ -0,0 +1,50 @@
+"""Add ohlc_results.interval
+
+The OHLC polling cursor is kept per pair and interval. Existing cursors are
+assigned to the 1 minute interval, only the most recent one of a pair is kept.
+
+Revision ID: b8d2f6a4c915
+Revises: e7a3c1d5f942
+Create Date: 2026-10-18 17:30:12.408361
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d2f6a4c915"
+down_revision: Union[str, None] = "e7a3c1d5f942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM ohlc_results a
+        USING ohlc_results b
+        WHERE a.asset_pair_id = b.asset_pair_id
+          AND (a.last, a.id) < (b.last, b.id)
+        """
+    )
+    op.add_column(
+        "ohlc_results",
+        sa.Column("interval", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.alter_column("ohlc_results", "interval", server_default=None)
+    op.create_unique_constraint(
+        "uq_ohlc_results_asset_pair_interval",
+        "ohlc_results",
+        ["asset_pair_id", "interval"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_ohlc_results_asset_pair_interval", "ohlc_results", type_="unique"
+    )
+    op.drop_column("ohlc_results", "interval")
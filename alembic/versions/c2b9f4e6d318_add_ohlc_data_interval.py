@@ -0,0 +1,75 @@
+"""Add ohlc_data.interval
+
+Candles imported so far were stored without their timeframe, it is inferred
+per pair from the smallest gap between two candles (in minutes, 1 when a
+pair has a single candle).
+
+Revision ID: c2b9f4e6d318
+Revises: a4d8e3c7f215
+Create Date: 2026-10-18 15:21:09.640557
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2b9f4e6d318"
+down_revision: Union[str, None] = "a4d8e3c7f215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ohlc_data", sa.Column("interval", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE ohlc_data d
+        SET interval = g.interval
+        FROM (
+            SELECT asset_pair_id, GREATEST(1, MIN(gap) / 60)::integer AS interval
+            FROM (
+                SELECT asset_pair_id,
+                       time - LAG(time) OVER (
+                           PARTITION BY asset_pair_id ORDER BY time
+                       ) AS gap
+                FROM ohlc_data
+            ) gaps
+            WHERE gap > 0
+            GROUP BY asset_pair_id
+        ) g
+        WHERE d.asset_pair_id = g.asset_pair_id
+        """
+    )
+    op.execute("UPDATE ohlc_data SET interval = 1 WHERE interval IS NULL")
+    op.alter_column("ohlc_data", "interval", nullable=False)
+
+    op.drop_constraint("uq_ohlc_data_asset_pair_time", "ohlc_data", type_="unique")
+    op.create_unique_constraint(
+        "uq_ohlc_data_asset_pair_interval_time",
+        "ohlc_data",
+        ["asset_pair_id", "interval", "time"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_ohlc_data_asset_pair_interval_time", "ohlc_data", type_="unique"
+    )
+    # Only the candles of the smallest interval of each pair are kept
+    op.execute(
+        """
+        DELETE FROM ohlc_data a
+        USING ohlc_data b
+        WHERE a.asset_pair_id = b.asset_pair_id
+          AND a.time = b.time
+          AND a.interval > b.interval
+        """
+    )
+    op.create_unique_constraint(
+        "uq_ohlc_data_asset_pair_time", "ohlc_data", ["asset_pair_id", "time"]
+    )
+    op.drop_column("ohlc_data", "interval")
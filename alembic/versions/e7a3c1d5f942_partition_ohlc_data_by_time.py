@@ -0,0 +1,123 @@
+"""Partition ohlc_data by time
+
+ohlc_data becomes a PostgreSQL table range partitioned by month on `time`,
+one partition ohlc_data_yYYYYmMM per calendar month (UTC). The surrogate id
+is dropped, (asset_pair_id, interval, time) is the primary key as it has to
+contain the partition key. Existing candles are copied into the partitions
+covering them, later partitions are created on demand by the importer.
+
+Revision ID: e7a3c1d5f942
+Revises: c2b9f4e6d318
+Create Date: 2026-10-18 16:42:37.215903
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a3c1d5f942"
+down_revision: Union[str, None] = "c2b9f4e6d318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "asset_pair_id, interval, time, open, high, low, close, vwap, volume, count"
+
+
+def ohlc_columns():
+    return [
+        sa.Column("asset_pair_id", sa.Integer(), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("time", sa.BigInteger(), nullable=False),
+        sa.Column("open", sa.Float(), nullable=False),
+        sa.Column("high", sa.Float(), nullable=False),
+        sa.Column("low", sa.Float(), nullable=False),
+        sa.Column("close", sa.Float(), nullable=False),
+        sa.Column("vwap", sa.Float(), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    ]
+
+
+def create_month_partitions(min_time, max_time) -> None:
+    month = datetime.fromtimestamp(min_time, tz=timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    while int(month.timestamp()) <= max_time:
+        if month.month == 12:
+            next_month = month.replace(year=month.year + 1, month=1)
+        else:
+            next_month = month.replace(month=month.month + 1)
+        op.execute(
+            f"CREATE TABLE ohlc_data_y{month.year}m{month.month:02d} "
+            f"PARTITION OF ohlc_data FOR VALUES "
+            f"FROM ({int(month.timestamp())}) TO ({int(next_month.timestamp())})"
+        )
+        month = next_month
+
+
+def upgrade() -> None:
+    op.rename_table("ohlc_data", "ohlc_data_old")
+    # Free the index names, the old table is only read sequentially from now on
+    op.execute("ALTER TABLE ohlc_data_old DROP CONSTRAINT IF EXISTS ohlc_data_pkey")
+    op.execute(
+        "ALTER TABLE ohlc_data_old "
+        "DROP CONSTRAINT IF EXISTS uq_ohlc_data_asset_pair_interval_time"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_ohlc_data_time")
+
+    op.create_table(
+        "ohlc_data",
+        *ohlc_columns(),
+        sa.ForeignKeyConstraint(["asset_pair_id"], ["ohlc_asset_pairs.id"]),
+        sa.PrimaryKeyConstraint("asset_pair_id", "interval", "time"),
+        postgresql_partition_by="RANGE (time)",
+    )
+    op.create_index(op.f("ix_ohlc_data_time"), "ohlc_data", ["time"], unique=False)
+
+    min_time, max_time = (
+        op.get_bind()
+        .execute(sa.text("SELECT MIN(time), MAX(time) FROM ohlc_data_old"))
+        .one()
+    )
+    if min_time is not None:
+        create_month_partitions(min_time, max_time)
+        op.execute(
+            f"INSERT INTO ohlc_data ({COLUMNS}) SELECT {COLUMNS} FROM ohlc_data_old"
+        )
+    op.drop_table("ohlc_data_old")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "ohlc_data_unpartitioned",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        *ohlc_columns(),
+        sa.ForeignKeyConstraint(["asset_pair_id"], ["ohlc_asset_pairs.id"]),
+        sa.PrimaryKeyConstraint("id", name="ohlc_data_unpartitioned_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO ohlc_data_unpartitioned ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM ohlc_data ORDER BY asset_pair_id, interval, time"
+    )
+    # Dropping the parent drops its partitions, detached ones are left as is
+    op.drop_table("ohlc_data")
+
+    op.rename_table("ohlc_data_unpartitioned", "ohlc_data")
+    op.execute(
+        "ALTER TABLE ohlc_data "
+        "RENAME CONSTRAINT ohlc_data_unpartitioned_pkey TO ohlc_data_pkey"
+    )
+    op.execute(
+        "ALTER SEQUENCE ohlc_data_unpartitioned_id_seq RENAME TO ohlc_data_id_seq"
+    )
+    op.create_unique_constraint(
+        "uq_ohlc_data_asset_pair_interval_time",
+        "ohlc_data",
+        ["asset_pair_id", "interval", "time"],
+    )
+    op.create_index(op.f("ix_ohlc_data_time"), "ohlc_data", ["time"], unique=False)
@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import logging
+import os
+import posixpath
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.repository.ohlcGaps import (
+    OHLCBackfillTask,
+    OHLCGap,
+    find_ohlc_gaps,
+    plan_ohlc_backfill,
+)
+from krakenfx.repository.storeOHLC import process_ohlc
+from krakenfx.services.spot_market_data.getOHLCService import get_ohlc
+from krakenfx.services.spot_market_data.schemas.ohlcSchemas import OHLCResult
+
+from .import_OHLCVT import (
+    OHLC_TIME_INDEX,
+    container,
+    deduce_asset_pair_name,
+    deduce_interval,
+    execution_logger,
+    get_async_session,
+    get_chunks,
+    init_session_factory,
+    list_csv_files_largest_first,
+    list_zip_members_largest_first,
+    open_ohlcvt_source,
+    parse_ohlcvt_chunk,
+    supports_copy,
+    write_ohlc_records,
+)
+
+
+def format_time(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def report_gaps(gaps: List[OHLCGap], tasks: List[OHLCBackfillTask]):
+    """Log the gaps per series and the backfill planned for them."""
+    series = defaultdict(list)
+    for gap in gaps:
+        series[(gap.pair_name, gap.interval)].append(gap)
+    for (pair_name, interval), series_gaps in series.items():
+        missing = sum(gap.missing for gap in series_gaps)
+        execution_logger.info(
+            f"{pair_name} {interval}m: {len(series_gaps)} gaps, {missing} missing candles."
+        )
+        for gap in series_gaps:
+            execution_logger.info(
+                f"  {format_time(gap.start)} -> {format_time(gap.end)} "
+                f"({gap.missing} candles)"
+            )
+
+    by_source = defaultdict(int)
+    for task in tasks:
+        by_source[task.source] += (task.end - task.start) // (task.gap.interval * 60)
+    execution_logger.info(
+        f"Backfill plan: {by_source['csv']} candles from CSV, "
+        f"{by_source['api']} candles from the API."
+    )
+
+
+def group_tasks(
+    tasks: List[OHLCBackfillTask], source: str
+) -> Dict[Tuple[str, int], List[OHLCBackfillTask]]:
+    """Tasks of a source per (pair name, interval), sorted by start."""
+    grouped = defaultdict(list)
+    for task in tasks:
+        if task.source == source:
+            grouped[(task.gap.pair_name, task.gap.interval)].append(task)
+    for series_tasks in grouped.values():
+        series_tasks.sort(key=lambda task: task.start)
+    return grouped
+
+
+def in_task_ranges(timestamp: int, starts: List[int], ends: List[int]) -> bool:
+    """Whether a time falls in one of the sorted, disjoint [start, end) ranges."""
+    position = bisect_right(starts, timestamp) - 1
+    return position >= 0 and timestamp < ends[position]
+
+
+def find_csv_sources(
+    directory: Optional[str], zip_path: Optional[str]
+) -> Dict[Tuple[str, int], str]:
+    """Map (pair name, interval) to the CSV file, or zip member, holding the series."""
+    if zip_path:
+        paths = list_zip_members_largest_first(zip_path)
+    elif directory:
+        paths = list_csv_files_largest_first(directory)
+    else:
+        return {}
+    sources = {}
+    for path in paths:
+        file_name = posixpath.basename(path)
+        sources[(deduce_asset_pair_name(file_name), deduce_interval(file_name))] = path
+    return sources
+
+
+async def backfill_from_csv(
+    session: AsyncSession,
+    tasks: List[OHLCBackfillTask],
+    csv_file_path: str,
+    zip_path: Optional[str] = None,
+    chunk_size: int = 10000,
+) -> int:
+    """Import only the rows of a CSV file falling in the task ranges.
+
+    Rows are filtered right after parsing and the file is read no further than
+    the end of the last range. Existing rows are left untouched.
+
+    Returns:
+        int: Number of inserted candles.
+    """
+    starts = [task.start for task in tasks]
+    ends = [task.end for task in tasks]
+    asset_pair_id = tasks[0].gap.asset_pair_id
+    interval = tasks[0].gap.interval
+    use_copy = supports_copy(session)
+    inserted = 0
+    previous_time = None
+
+    with open_ohlcvt_source(csv_file_path, zip_path) as csvfile:
+        for chunk in get_chunks(csvfile, chunk_size):
+            records, _ = parse_ohlcvt_chunk(
+                chunk, asset_pair_id, interval, previous_time=previous_time
+            )
+            if not records:
+                continue
+            previous_time = records[-1][OHLC_TIME_INDEX]
+            if records[0][OHLC_TIME_INDEX] >= ends[-1]:
+                break
+            records = [
+                record
+                for record in records
+                if in_task_ranges(record[OHLC_TIME_INDEX], starts, ends)
+            ]
+            if records:
+                chunk_inserted, _ = await write_ohlc_records(
+                    session, records, use_copy, "nothing"
+                )
+                await session.commit()
+                inserted += chunk_inserted
+    return inserted
+
+
+async def backfill_from_api(
+    session: AsyncSession, settings, tasks: List[OHLCBackfillTask]
+) -> int:
+    """Fetch the candles of the task ranges from /0/public/OHLC and store them.
+
+    Returns:
+        int: Number of inserted candles.
+    """
+    starts = [task.start for task in tasks]
+    ends = [task.end for task in tasks]
+    pair_name = tasks[0].gap.pair_name
+    interval = tasks[0].gap.interval
+
+    ohlc_result = await get_ohlc(
+        settings, pair_name, interval, since=starts[0] - interval * 60
+    )
+    data = {
+        pair: [
+            candle for candle in candles if in_task_ranges(candle.time, starts, ends)
+        ]
+        for pair, candles in ohlc_result.data.items()
+    }
+    # Stored under the name of the gap, not the one Kraken answers with
+    inserted, _ = await process_ohlc(
+        interval,
+        OHLCResult(data=data, last=ohlc_result.last),
+        session,
+        pair_name=pair_name,
+    )
+    return inserted
+
+
+async def run(args):
+    await init_session_factory(args.dry_run)
+    settings = container.config_container().config()
+
+    async with get_async_session() as session:
+        gaps = await find_ohlc_gaps(
+            session,
+            pairs=args.pairs.split(",") if args.pairs else None,
+            intervals=(
+                [int(interval) for interval in args.intervals.split(",")]
+                if args.intervals
+                else None
+            ),
+            min_missing=args.min_missing,
+        )
+        tasks = plan_ohlc_backfill(gaps)
+        report_gaps(gaps, tasks)
+        if not args.execute:
+            return
+        # End the transaction of the gap scan, its lock on ohlc_data would
+        # block the partitions created for the backfilled candles
+        await session.commit()
+
+        csv_sources = find_csv_sources(args.directory, args.zip)
+        for (pair_name, interval), series_tasks in group_tasks(tasks, "csv").items():
+            csv_file_path = csv_sources.get((pair_name, interval))
+            if csv_file_path is None:
+                execution_logger.warning(
+                    f"No CSV file for {pair_name} {interval}m, "
+                    f"{len(series_tasks)} ranges left missing."
+                )
+                continue
+            inserted = await backfill_from_csv(
+                session, series_tasks, csv_file_path, args.zip, args.chunk_size
+            )
+            execution_logger.info(
+                f"{pair_name} {interval}m: {inserted} candles backfilled from "
+                f"{csv_file_path}."
+            )
+
+        for (pair_name, interval), series_tasks in group_tasks(tasks, "api").items():
+            inserted = await backfill_from_api(session, settings, series_tasks)
+            execution_logger.info(
+                f"{pair_name} {interval}m: {inserted} candles backfilled from the API."
+            )
+
+
+def setup_argparse():
+    parser = argparse.ArgumentParser(
+        description="Find the gaps of the stored OHLC series and backfill them."
+    )
+    parser.add_argument(
+        "--pairs", type=str, help="Comma separated asset pairs to check (default all)."
+    )
+    parser.add_argument(
+        "--intervals",
+        type=str,
+        help="Comma separated intervals in minutes to check (default all).",
+    )
+    parser.add_argument(
+        "--min-missing",
+        type=int,
+        default=1,
+        help="Only report gaps of at least this many candles.",
+    )
+    parser.add_argument(
+        "-x",
+        "--execute",
+        action="store_true",
+        help="Backfill the gaps, otherwise only report them.",
+    )
+    parser.add_argument(
+        "-d", "--directory", type=str, help="Directory of the OHLCVT CSV files."
+    )
+    parser.add_argument(
+        "-z", "--zip", type=str, help="Kraken OHLCVT zip archive, read in place."
+    )
+    parser.add_argument(
+        "-c", "--chunk-size", type=int, default=10000, help="Rows per CSV chunk."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Use the SQLite dry run database."
+    )
+    parser.add_argument(
+        "-v", "--verbosity", action="store_true", help="Enable debug logging."
+    )
+    return parser
+
+
+def main():
+    args = setup_argparse().parse_args()
+    if args.verbosity:
+        execution_logger.setLevel(logging.DEBUG)
+    if args.directory and not os.path.isdir(args.directory):
+        execution_logger.error(f"{args.directory} is not a directory.")
+        return
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
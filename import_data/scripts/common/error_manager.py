@@ -31,6 +31,19 @@ class ErrorManager:
         """
         self.loggers[name] = logger
 
+    def merge(self, other: "ErrorManager"):
+        """
+        Add the errors tracked by another manager (e.g. of a single file import).
+
+        Parameters:
+        other (ErrorManager): The manager whose counters and messages are merged.
+        """
+        self.total_errors_counter += other.total_errors_counter
+        for error_type, count in other.error_counter.items():
+            self.error_counter[error_type] += count
+        for error_type, messages in other.error_lists.items():
+            self.error_lists[error_type].extend(messages)
+
     # def add_custom_error_method(self, error_type):
     #     """
     #     Dynamically create a log method for a custom error type.
@@ -116,7 +129,9 @@ class ErrorManager:
         summary += f"{formatter('highlight', 'Started at:')} {self.started_time.strftime('%Y-%m-%d %H:%M:%S %Z%z')}\n"
         summary += f"{formatter('highlight', 'Ended at:')} {self.ended_time.strftime('%Y-%m-%d %H:%M:%S %Z%z')}\n"
         summary += f"{formatter('highlight', 'Duration:')} {duration}\n"
-        summary += f"{formatter('highlight', 'Total Errors:')} {sum(self.total_errors_counter.values())}\n"
+        summary += (
+            f"{formatter('highlight', 'Total Errors:')} {self.total_errors_counter}\n"
+        )
         summary += f"{formatter('highlight', 'Total Import Failures:')} {self.error_counter['validation_errors']}\n\n"
 
         for error_type, count in self.error_counter.items():
@@ -159,16 +174,20 @@ class ErrorManager:
         for logger in self.loggers.values():
             use_console_formatter = True
             for handler in logger.handlers:
-                if isinstance(handler, logging.FileHandler):
+                # Handlers moved behind the log queue are wrapped by a
+                # LogQueueHandler (see krakenfx.utils.log_queue)
+                wrapped = getattr(handler, "handlers", (handler,))
+                if any(isinstance(h, logging.FileHandler) for h in wrapped):
                     use_console_formatter = False
                     break
 
-        if use_console_formatter:
-            summary_console = self.generate_summary(self.format_console)
-            print(summary_console)
-        else:
-            summary_log = self.generate_summary(self.format_log)
-            logger.info(summary_log)
+            if use_console_formatter:
+                if summary_console is None:
+                    summary_console = self.generate_summary(self.format_console)
+                    print(summary_console)
+            else:
+                summary_log = self.generate_summary(self.format_log)
+                logger.info(summary_log)
 
     def close_loggers(self):
         """
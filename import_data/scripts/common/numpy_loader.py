@@ -0,0 +1,96 @@
+from itertools import repeat
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only required by --parser numpy
+    np = None
+
+NUMPY_MISSING = (
+    "numpy is not installed, it is an optional dependency: "
+    "poetry install --extras numpy"
+)
+
+# Columns of the Kraken OHLCVT CSV files
+OHLCVT_DTYPE = [
+    ("time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("count", "i8"),
+]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def load_ohlcvt_block(lines) -> "np.ndarray":
+    """
+    Parse a block of raw CSV lines into a structured array.
+
+    Parameters:
+    lines (List[bytes]): Lines of the 7 columns OHLCVT file.
+    """
+    if np is None:
+        raise ImportError(NUMPY_MISSING)
+    return np.loadtxt(lines, delimiter=",", dtype=OHLCVT_DTYPE, ndmin=1)
+
+
+def check_ohlcvt_block(block, previous_time: Optional[int] = None) -> "np.ndarray":
+    """
+    Return the mask of the rows failing the sanity checks.
+
+    A row is rejected when high < low, volume is negative or its time is not
+    greater than the time of every row accepted before it, starting from
+    `previous_time` (the last row accepted from the previous chunks).
+    """
+    invalid = block["high"] < block["low"]
+    invalid |= block["volume"] < 0
+
+    times = block["time"]
+    floor = np.iinfo(times.dtype).min if previous_time is None else previous_time
+    # Latest time accepted before each row. Rows failing the other checks are
+    # left out, a row failing the time check is not later than it anyway.
+    accepted = np.where(invalid, floor, times)
+    latest = np.maximum.accumulate(np.r_[floor, accepted[:-1]])
+    invalid |= times <= latest
+    return invalid
+
+
+def parse_ohlcvt_lines_numpy(
+    lines, asset_pair_id: int, interval: int, previous_time: Optional[int] = None
+) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Parse and check a block of lines, numpy equivalent of parse_ohlcvt_lines.
+
+    The block is loaded and checked column-wise, the valid rows are then turned
+    back into record tuples for the COPY and ORM writers.
+
+    Returns:
+    Tuple[List[tuple], List[tuple]]: The valid records, in the ohlc_data column
+    order, and the rejected rows.
+    """
+    block = load_ohlcvt_block(lines)
+    if not len(block):
+        return [], []
+
+    invalid = check_ohlcvt_block(block, previous_time)
+    valid = block[~invalid]
+    records = list(
+        zip(
+            repeat(asset_pair_id),
+            repeat(interval),
+            valid["time"].tolist(),
+            valid["open"].tolist(),
+            valid["high"].tolist(),
+            valid["low"].tolist(),
+            valid["close"].tolist(),
+            repeat(0.0),  # vwap, not provided by the OHLCVT files
+            valid["volume"].tolist(),
+            valid["count"].tolist(),
+        )
+    )
+    return records, block[invalid].tolist()
@@ -3,23 +3,39 @@ import asyncio
 import csv
 import logging
 import os
+import posixpath
 import time
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
+from typing import Optional, Tuple
 
+from asyncpg.exceptions import IntegrityConstraintViolationError
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
 
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.bulkOperations import bulk_insert_ignore, bulk_upsert
+from krakenfx.repository.models._base import Base
 from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
-from krakenfx.repository.models.ohlcModel import ModelOHLCData
-from krakenfx.utils.database import (
-    get_async_postgresql_session,
-    get_async_sqlite_session,
+from krakenfx.repository.models.ohlcModel import (
+    ModelOHLCAssetPair,
+    ModelOHLCData,
+    ModelOHLCImportCheckpoint,
 )
-from krakenfx.utils.logger import setup_custom_logging, setup_main_logging
+from krakenfx.repository.ohlcPartitions import ensure_ohlc_partitions
+from krakenfx.utils.logger import setup_custom_logging
 from krakenfx.utils.user_utils import ask_user_yn
 
 from .common.error_manager import ErrorManager
+from .common.numpy_loader import (
+    NUMPY_MISSING,
+    numpy_available,
+    parse_ohlcvt_lines_numpy,
+)
 
 # Determine the root directory of the project
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -29,15 +45,288 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 current_date = datetime.now().strftime("%Y%m%d")
 
+# Database used by --dry-run instead of PostgreSQL
+DRY_RUN_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+# Column order of the records written to ohlc_data, matches ModelOHLCData.__init__
+OHLC_COLUMNS = (
+    "asset_pair_id",
+    "interval",
+    "time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "vwap",
+    "volume",
+    "count",
+)
+
+# Position of the candle time in the records
+OHLC_TIME_INDEX = OHLC_COLUMNS.index("time")
+
+# Columns compared with the CSV rows by validate_data
+OHLC_VALIDATED_COLUMNS = ("open", "high", "low", "close", "volume", "count")
+
+# Available CSV parsers, numpy is optional
+PARSERS = ("csv", "numpy")
+
+# Unique key of ohlc_data and behaviour of the import when a row already exists
+OHLC_CONFLICT_COLUMNS = ("asset_pair_id", "interval", "time")
+ON_CONFLICT_MODES = ("nothing", "update")
+
+# Temporary table receiving the COPY before the merge into ohlc_data
+OHLC_STAGING_TABLE = "ohlc_data_staging"
+
+container = AppContainer()
+
 # Setup global loggers
-execution_logger = setup_main_logging()
+execution_logger = container.logger_container().logger()
 # Create a global ErrorManager instance
 global_error_manager = ErrorManager({"execution": execution_logger})
 
+# Session factory selected by main() from the --dry-run argument
+async_session_factory = None
+
+
+async def init_session_factory(dry_run: bool = False):
+    """Create the session factory used by the import, SQLite for dry runs."""
+    global async_session_factory
+    if dry_run:
+        engine = create_async_engine(DRY_RUN_DATABASE_URL, future=True)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        engine = (
+            await container.database_container().database_factory().get_async_engine()
+        )
+    async_session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+@asynccontextmanager
+async def get_async_session():
+    async with async_session_factory() as session:
+        yield session
+
+
+async def get_or_create_ohlc_asset_pair(
+    session: AsyncSession, asset_pair_name: str
+) -> ModelOHLCAssetPair:
+    """Return the ohlc_asset_pairs row referenced by ohlc_data, creating it if needed."""
+    result = await session.execute(
+        select(ModelOHLCAssetPair).where(ModelOHLCAssetPair.name == asset_pair_name)
+    )
+    ohlc_asset_pair = result.scalar_one_or_none()
+    if ohlc_asset_pair is None:
+        ohlc_asset_pair = ModelOHLCAssetPair(name=asset_pair_name)
+        session.add(ohlc_asset_pair)
+        await session.commit()
+    return ohlc_asset_pair
+
+
+def supports_copy(session: AsyncSession) -> bool:
+    """COPY is only available when writing to PostgreSQL through asyncpg."""
+    return (
+        session.bind.dialect.name == "postgresql"
+        and session.bind.dialect.driver == "asyncpg"
+    )
+
+
+def parse_ohlcvt_row(row, asset_pair_id: int, interval: int) -> tuple:
+    """Convert a CSV row (time, open, high, low, close, volume, count) to a record."""
+    return (
+        asset_pair_id,
+        interval,
+        int(row[0]),
+        float(row[1]),
+        float(row[2]),
+        float(row[3]),
+        float(row[4]),
+        0.0,  # vwap, not provided by the OHLCVT files
+        float(row[5]),
+        int(row[6]),
+    )
+
+
+def parse_ohlcvt_lines(
+    lines, asset_pair_id: int, interval: int, previous_time: Optional[int] = None
+) -> Tuple[list, list]:
+    """Parse and check a chunk of raw CSV lines (bytes), run in the worker processes with --jobs.
+
+    Same sanity checks as check_ohlcvt_block, the rejected rows are returned as
+    (time, open, high, low, close, volume, count) tuples.
+    """
+    records = []
+    rejected = []
+    for row in csv.reader(line.decode("utf-8") for line in lines):
+        record = parse_ohlcvt_row(row, asset_pair_id, interval)
+        _, _, time, open_, high, low, close, _, volume, count = record
+        if (
+            high < low
+            or volume < 0
+            or (previous_time is not None and time <= previous_time)
+        ):
+            rejected.append((time, open_, high, low, close, volume, count))
+            continue
+        records.append(record)
+        previous_time = time
+    return records, rejected
+
+
+def parse_ohlcvt_chunk(
+    lines,
+    asset_pair_id: int,
+    interval: int,
+    parser: str = "csv",
+    previous_time: Optional[int] = None,
+) -> Tuple[list, list]:
+    """Parse a chunk with the selected parser, return the records and rejected rows.
+
+    Both parsers run the same sanity checks (high >= low, volume >= 0 and time
+    after the last accepted row, `previous_time` for the first one).
+    """
+    if parser == "numpy":
+        return parse_ohlcvt_lines_numpy(lines, asset_pair_id, interval, previous_time)
+    return parse_ohlcvt_lines(lines, asset_pair_id, interval, previous_time)
+
+
+async def get_import_checkpoint(
+    session: AsyncSession, csv_file_path: str, zip_path: Optional[str] = None
+) -> ModelOHLCImportCheckpoint:
+    """Load the import checkpoint of a file, reset if the file changed since.
+
+    The file is fingerprinted by size and mtime, a new or reset checkpoint is
+    committed right away so it survives a rollback of the first chunk.
+    """
+    file_path, *fingerprint = get_source_fingerprint(csv_file_path, zip_path)
+    fingerprint = tuple(fingerprint)
+
+    checkpoint = await session.get(ModelOHLCImportCheckpoint, file_path)
+    if (
+        checkpoint is not None
+        and (
+            checkpoint.file_size,
+            checkpoint.file_mtime,
+        )
+        == fingerprint
+    ):
+        return checkpoint
+
+    if checkpoint is None:
+        checkpoint = ModelOHLCImportCheckpoint(file_path=file_path)
+        session.add(checkpoint)
+    checkpoint.file_size, checkpoint.file_mtime = fingerprint
+    checkpoint.byte_offset = 0
+    checkpoint.last_time = None
+    checkpoint.rows_imported = 0
+    checkpoint.completed = False
+    checkpoint.updated_at = time.time()
+    await session.commit()
+    return checkpoint
+
+
+def advance_checkpoint(
+    checkpoint: ModelOHLCImportCheckpoint, lines, records, imported_rows: int
+):
+    """Move the checkpoint past a chunk, committed together with the chunk rows."""
+    checkpoint.byte_offset += sum(len(line) for line in lines)
+    if records:
+        checkpoint.last_time = records[-1][OHLC_TIME_INDEX]
+    checkpoint.rows_imported += imported_rows
+    checkpoint.updated_at = time.time()
+
+
+def merge_staged_ohlc_sql(on_conflict: str) -> str:
+    """INSERT ... SELECT moving the staged rows into ohlc_data."""
+    columns = ", ".join(OHLC_COLUMNS)
+    conflict_columns = ", ".join(OHLC_CONFLICT_COLUMNS)
+    if on_conflict == "nothing":
+        return (
+            f"INSERT INTO {ModelOHLCData.__tablename__} ({columns}) "
+            f"SELECT {columns} FROM {OHLC_STAGING_TABLE} "
+            f"ON CONFLICT ({conflict_columns}) DO NOTHING"
+        )
+    value_columns = [c for c in OHLC_COLUMNS if c not in OHLC_CONFLICT_COLUMNS]
+    set_clause = ", ".join(f"{c} = EXCLUDED.{c}" for c in value_columns)
+    current = ", ".join(f"{ModelOHLCData.__tablename__}.{c}" for c in value_columns)
+    excluded = ", ".join(f"EXCLUDED.{c}" for c in value_columns)
+    # DISTINCT ON as DO UPDATE cannot affect the same row twice in one statement
+    return (
+        f"INSERT INTO {ModelOHLCData.__tablename__} ({columns}) "
+        f"SELECT DISTINCT ON ({conflict_columns}) {columns} FROM {OHLC_STAGING_TABLE} "
+        f"ON CONFLICT ({conflict_columns}) DO UPDATE SET {set_clause} "
+        f"WHERE ({current}) IS DISTINCT FROM ({excluded}) "
+        f"RETURNING (xmax = 0)"
+    )
+
+
+async def copy_ohlc_records(
+    session: AsyncSession, records, on_conflict: str = "nothing"
+) -> Tuple[int, int]:
+    """Stream records into ohlc_data with COPY FROM STDIN, bypassing the ORM.
+
+    COPY cannot skip conflicting rows, so records are copied into a temporary
+    staging table and merged with a single INSERT ... ON CONFLICT. Everything
+    runs on the session connection, in the session transaction.
+
+    Returns:
+        Tuple[int, int]: Number of inserted and updated rows.
+    """
+    connection = await session.connection()
+    await connection.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {OHLC_STAGING_TABLE} "
+        f"ON COMMIT DELETE ROWS AS SELECT {', '.join(OHLC_COLUMNS)} "
+        f"FROM {ModelOHLCData.__tablename__} WITH NO DATA"
+    )
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        OHLC_STAGING_TABLE, records=records, columns=OHLC_COLUMNS
+    )
+
+    result = await connection.exec_driver_sql(merge_staged_ohlc_sql(on_conflict))
+    if on_conflict == "nothing":
+        return result.rowcount, 0
+    flags = result.scalars().all()
+    inserted = sum(1 for flag in flags if flag)
+    return inserted, len(flags) - inserted
+
+
+async def write_ohlc_records(
+    session: AsyncSession, records, use_copy: bool, on_conflict: str = "nothing"
+) -> Tuple[int, int]:
+    """Write a chunk of records with COPY, or through the ORM as fallback.
+
+    Rows conflicting on (asset_pair_id, interval, time) are skipped
+    (`on_conflict` set to "nothing") or overwritten when their values differ
+    ("update"). The monthly partitions covering the chunk are created first,
+    the session must not hold a transaction which used ohlc_data.
+
+    Returns:
+        Tuple[int, int]: Number of inserted and updated rows.
+    """
+    if not records:
+        return 0, 0
+
+    times = [record[OHLC_TIME_INDEX] for record in records]
+    await ensure_ohlc_partitions(session.bind, min(times), max(times))
+
+    if use_copy:
+        return await copy_ohlc_records(session, records, on_conflict)
+
+    rows = [dict(zip(OHLC_COLUMNS, record)) for record in records]
+    if on_conflict == "nothing":
+        inserted = await bulk_insert_ignore(
+            session, ModelOHLCData, rows, OHLC_CONFLICT_COLUMNS
+        )
+        return inserted, 0
+    return await bulk_upsert(session, ModelOHLCData, rows, OHLC_CONFLICT_COLUMNS)
+
 
 async def list_asset_pairs():
     """List all asset pairs available in the database."""
-    async with get_async_postgresql_session() as session:
+    async with get_async_session() as session:
         result = await session.execute(select(ModelAssetsPairs))
         asset_pairs = result.scalars().all()
         for asset_pair in asset_pairs:
@@ -67,25 +356,35 @@ def get_chunks(reader, chunk_size: int = 1000):
         yield chunk
 
 
-async def validate_data(
-    session: AsyncSession, ohlc_data_list, error_manager: ErrorManager
-):
-    """Validate the imported OHLC data."""
+async def validate_data(session: AsyncSession, records, error_manager: ErrorManager):
+    """Validate the imported OHLC data.
+
+    The stored rows of the chunk are loaded with a single range query on
+    (asset_pair_id, interval, time) and compared with the records in memory.
+    """
+    if not records:
+        return True
+
+    first_record = dict(zip(OHLC_COLUMNS, records[0]))
+    times = [record[OHLC_TIME_INDEX] for record in records]
+    value_columns = [
+        getattr(ModelOHLCData, column) for column in OHLC_VALIDATED_COLUMNS
+    ]
+    query_result = await session.execute(
+        select(ModelOHLCData.time, *value_columns).where(
+            ModelOHLCData.asset_pair_id == first_record["asset_pair_id"],
+            ModelOHLCData.interval == first_record["interval"],
+            ModelOHLCData.time.between(min(times), max(times)),
+        )
+    )
+    stored = {row[0]: tuple(row[1:]) for row in query_result}
+
     fail_validation_count = 0
     failed_rows = []
-    for data in ohlc_data_list:
-        query_result = await session.execute(
-            select(ModelOHLCData).where(ModelOHLCData.time == data.time)
-        )
-        record = query_result.scalar_one_or_none()
-        if not record or (
-            record.open,
-            record.high,
-            record.low,
-            record.close,
-            record.volume,
-            record.count,
-        ) != (data.open, data.high, data.low, data.close, data.volume, data.count):
+    for record in records:
+        data = dict(zip(OHLC_COLUMNS, record))
+        expected = tuple(data[column] for column in OHLC_VALIDATED_COLUMNS)
+        if stored.get(data["time"]) != expected:
             fail_validation_count += 1
             failed_rows.append(data)
 
@@ -113,40 +412,174 @@ def deduce_asset_pair_name(file_name):
         return None
 
 
-async def import_files_in_directory(
-    directory: str, chunk_size=1000, interactive=False, validate=False
-):
-    """Import OHLC data from all CSV files in a directory."""
-    for file_name in os.listdir(directory):
-        if file_name.endswith(".csv"):
-            asset_pair_name = deduce_asset_pair_name(file_name)
-            if not asset_pair_name:
-                global_error_manager.log_error(
-                    "import", f"Unable to deduce asset pair from filename: {file_name}"
-                )
+def deduce_interval(file_name) -> Optional[int]:
+    """Deduce the interval in minutes from the CSV file name, e.g. XBTUSD_60.csv."""
+    try:
+        return int(os.path.splitext(file_name)[0].rsplit("_", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def list_csv_files_largest_first(directory: str) -> list:
+    """List the CSV files of a directory, largest first to balance the workers."""
+    csv_files = [
+        os.path.join(directory, file_name)
+        for file_name in os.listdir(directory)
+        if file_name.endswith(".csv")
+    ]
+    return sorted(csv_files, key=os.path.getsize, reverse=True)
+
+
+def list_zip_members_largest_first(
+    zip_path: str, pairs: Optional[set] = None, intervals: Optional[set] = None
+) -> list:
+    """List the CSV members of a zip archive matching the pairs and intervals.
+
+    Members are filtered on their file name (PAIR_INTERVAL.csv) without being
+    extracted, largest (uncompressed) first to balance the workers.
+    """
+    with zipfile.ZipFile(zip_path) as archive:
+        members = []
+        for member in archive.infolist():
+            file_name = posixpath.basename(member.filename)
+            if member.is_dir() or not file_name.endswith(".csv"):
+                continue
+            if pairs and deduce_asset_pair_name(file_name) not in pairs:
                 continue
+            if intervals and deduce_interval(file_name) not in intervals:
+                continue
+            members.append(member)
+    members.sort(key=lambda member: member.file_size, reverse=True)
+    return [member.filename for member in members]
 
-            status = await import_ohlc_data_from_csv(
-                os.path.join(directory, file_name),
-                asset_pair_name,
-                chunk_size,
-                interactive,
-                validate,
-            )
 
-            if status == "Succeed with warnings":
-                global_error_manager.log_warning(
-                    "import_warnings",
-                    f"Import {file_name} with status: {status}.",
+@contextmanager
+def open_ohlcvt_source(csv_file_path: str, zip_path: Optional[str] = None):
+    """Open a CSV file, or a member of a zip archive, for binary reading.
+
+    Zip members are decompressed on the fly while they are read.
+    """
+    if zip_path is None:
+        with open(csv_file_path, "rb") as csvfile:
+            yield csvfile
+    else:
+        with zipfile.ZipFile(zip_path) as archive:
+            with archive.open(csv_file_path) as csvfile:
+                yield csvfile
+
+
+def get_source_fingerprint(
+    csv_file_path: str, zip_path: Optional[str] = None
+) -> Tuple[str, int, float]:
+    """Return the checkpoint key, size and mtime of a CSV file or zip member."""
+    if zip_path is None:
+        file_path = os.path.abspath(csv_file_path)
+        file_stat = os.stat(file_path)
+        return file_path, file_stat.st_size, file_stat.st_mtime
+
+    with zipfile.ZipFile(zip_path) as archive:
+        member = archive.getinfo(csv_file_path)
+    file_path = f"{os.path.abspath(zip_path)}::{csv_file_path}"
+    return file_path, member.file_size, time.mktime(member.date_time + (0, 0, -1))
+
+
+async def import_files_in_directory(directory: str, **import_options):
+    """Import OHLC data from all CSV files in a directory."""
+    await import_csv_files(list_csv_files_largest_first(directory), **import_options)
+
+
+async def import_zip_archive(
+    zip_path: str,
+    pairs: Optional[set] = None,
+    intervals: Optional[set] = None,
+    **import_options,
+):
+    """Import OHLC data straight from the Kraken OHLCVT zip archive.
+
+    Only the members matching `pairs` and `intervals` are imported, they are
+    streamed from the archive without extracting them to disk.
+    """
+    members = list_zip_members_largest_first(zip_path, pairs, intervals)
+    global_error_manager.log_info(f"{len(members)} files selected in {zip_path}.")
+    await import_csv_files(members, zip_path=zip_path, **import_options)
+
+
+async def import_csv_files(
+    csv_files: list,
+    chunk_size=1000,
+    interactive=False,
+    validate=False,
+    use_copy=True,
+    jobs=1,
+    on_conflict="nothing",
+    parser="csv",
+    zip_path: Optional[str] = None,
+):
+    """Import OHLC data from a list of CSV files (or members of `zip_path`).
+
+    With `jobs` > 1 up to `jobs` files are imported concurrently, each holding
+    one database connection, and CSV parsing is offloaded to a pool of `jobs`
+    processes. A file failing with an exception is reported as Failed, the
+    import of the other files goes on.
+    """
+    total_files = len(csv_files)
+    completed_files = 0
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def import_file(csv_file_path: str):
+        nonlocal completed_files
+        file_name = os.path.basename(csv_file_path)
+        asset_pair_name = deduce_asset_pair_name(file_name)
+        if not asset_pair_name:
+            global_error_manager.log_error(
+                "import", f"Unable to deduce asset pair from filename: {file_name}"
+            )
+            return
+
+        async with semaphore:
+            try:
+                status = await import_ohlc_data_from_csv(
+                    csv_file_path,
+                    asset_pair_name,
+                    chunk_size=chunk_size,
+                    interactive=interactive,
+                    validate=validate,
+                    use_copy=use_copy,
+                    executor=executor,
+                    on_conflict=on_conflict,
+                    parser=parser,
+                    zip_path=zip_path,
                 )
-            elif status == "Failed":
+            except Exception as e:
+                # Recorded for the summary, the other files keep importing
                 global_error_manager.log_error(
-                    "import_errors", f"Import {file_name} with status: {status}."
-                )
-            elif status == "Success":
-                global_error_manager.log_info(
-                    f"Import {file_name} with status: {status}"
+                    "execution_errors", f"Import of {csv_file_path} failed: {e!r}"
                 )
+                status = "Failed"
+
+        completed_files += 1
+        progress = f"[{completed_files}/{total_files}]"
+        if status == "Succeed with warnings":
+            global_error_manager.log_warning(
+                "import_warnings",
+                f"{progress} Import {file_name} with status: {status}.",
+            )
+        elif status == "Failed":
+            global_error_manager.log_error(
+                "import_errors", f"{progress} Import {file_name} with status: {status}."
+            )
+        else:
+            global_error_manager.log_info(
+                f"{progress} Import {file_name} with status: {status}"
+            )
+
+    try:
+        await asyncio.gather(*(import_file(csv_file) for csv_file in csv_files))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
 
 async def import_ohlc_data_from_csv(
@@ -155,12 +588,35 @@ async def import_ohlc_data_from_csv(
     chunk_size=1000,
     interactive=False,
     validate=False,
+    use_copy=True,
+    executor: Optional[Executor] = None,
+    on_conflict="nothing",
+    parser="csv",
+    zip_path: Optional[str] = None,
+    interval: Optional[int] = None,
 ):
-    """Import OHLC data from a single CSV file."""
+    """Import OHLC data from a single CSV file, or a member of `zip_path`.
+
+    Candles are stored with their `interval` in minutes, deduced from the file
+    name (e.g. XBTUSD_60.csv) when not given.
+
+    Rows are parsed straight from the csv reader into records and written with
+    PostgreSQL COPY when available (`use_copy`), otherwise through the ORM.
+    When an `executor` is given, chunks are parsed in it instead of the event loop.
+    `parser` selects the csv module or the vectorized numpy loader, both drop
+    the rows failing the sanity checks.
+
+    Rows already stored for the pair, interval and time are skipped or updated according
+    to `on_conflict`, see write_ohlc_records.
+
+    Progress is checkpointed per chunk: a rerun resumes after the last committed
+    chunk and files already imported (same size and mtime) are skipped.
+    """
     error_manager = ErrorManager()
 
+    # setup_custom_logging adds the .log extension
     audit_log_name = (
-        f"{current_date}_audit_{os.path.basename(csv_file_path).split('.')[0]}.log"
+        f"{current_date}_audit_{os.path.basename(csv_file_path).split('.')[0]}"
     )
     audit_logger = setup_custom_logging(audit_log_name, LOG_DIR, noscreen=True)
     error_manager.add_logger("audit", audit_logger)
@@ -172,7 +628,20 @@ async def import_ohlc_data_from_csv(
         f"\n\nImporting {csv_file_path} with asset pair {asset_pair_name}\n\n"
     )
 
-    async with get_async_postgresql_session() as session:
+    if interval is None:
+        interval = deduce_interval(os.path.basename(csv_file_path))
+    if interval is None:
+        error_manager.log_error(
+            "execution_errors",
+            f"Unable to deduce the interval of {csv_file_path}. Aborting ...",
+        )
+        global_error_manager.log_error(
+            "execution_errors",
+            f"Unable to deduce the interval of {csv_file_path}. Aborting ...",
+        )
+        return "Failed"
+
+    async with get_async_session() as session:
 
         asset_pair = await session.execute(
             select(ModelAssetsPairs).where(
@@ -192,29 +661,61 @@ async def import_ohlc_data_from_csv(
             )
             return "Failed"
 
-        with open(csv_file_path, newline="") as csvfile:
-            reader = csv.reader(csvfile)
-            for chunk in get_chunks(reader, chunk_size):
-                ohlc_data_list = []
-                for row in chunk:
-                    ohlc_data = ModelOHLCData(
-                        asset_pair_id=asset_pair.id,
-                        time=int(row[0]),
-                        open=float(row[1]),
-                        high=float(row[2]),
-                        low=float(row[3]),
-                        close=float(row[4]),
-                        vwap=0.0,  # Set to 0.0 if not provided
-                        volume=float(row[5]),
-                        count=int(row[6]),
+        ohlc_asset_pair = await get_or_create_ohlc_asset_pair(session, asset_pair_name)
+
+        checkpoint = await get_import_checkpoint(session, csv_file_path, zip_path)
+        if checkpoint.completed:
+            error_manager.log_info(
+                f"{csv_file_path} already imported ({checkpoint.rows_imported} rows), skipped."
+            )
+            error_manager.close_loggers()
+            return "Skipped"
+        if checkpoint.byte_offset:
+            error_manager.log_info(
+                f"Resuming {csv_file_path} at byte {checkpoint.byte_offset} "
+                f"(last time imported: {checkpoint.last_time})."
+            )
+
+        use_copy = use_copy and supports_copy(session)
+        error_manager.log_info(
+            f"Writing with {'COPY' if use_copy else 'ORM'} in chunks of {chunk_size} rows."
+        )
+        imported_rows = 0
+        updated_rows = 0
+        skipped_rows = 0
+
+        loop = asyncio.get_running_loop()
+        previous_time = checkpoint.last_time
+        with open_ohlcvt_source(csv_file_path, zip_path) as csvfile:
+            csvfile.seek(checkpoint.byte_offset)
+            for chunk in get_chunks(csvfile, chunk_size):
+                if executor is not None:
+                    records, rejected = await loop.run_in_executor(
+                        executor,
+                        parse_ohlcvt_chunk,
+                        chunk,
+                        ohlc_asset_pair.id,
+                        interval,
+                        parser,
+                        previous_time,
+                    )
+                else:
+                    records, rejected = parse_ohlcvt_chunk(
+                        chunk, ohlc_asset_pair.id, interval, parser, previous_time
+                    )
+                if records:
+                    previous_time = records[-1][OHLC_TIME_INDEX]
+                if rejected:
+                    error_manager.log_warning(
+                        "sanity_errors",
+                        [f"Row rejected by sanity checks: {row}" for row in rejected],
                     )
-                    ohlc_data_list.append(ohlc_data)
 
                 if interactive:
                     global_error_manager.log_info(
-                        f"Chunk data for asset pair {asset_pair_name}:\n {ohlc_data_list}"
+                        f"Chunk data for asset pair {asset_pair_name}:\n {records}"
                     )
-                    if not ask_user_yn():
+                    if not ask_user_yn("Import this chunk?"):
                         error_manager.log_error(
                             "user_abort",
                             f"Import pair {asset_pair_name} aborted by user.",
@@ -226,29 +727,53 @@ async def import_ohlc_data_from_csv(
                         return "Aborted"
 
                 try:
-                    session.add_all(ohlc_data_list)
+                    inserted, updated = await write_ohlc_records(
+                        session, records, use_copy, on_conflict
+                    )
+                    advance_checkpoint(checkpoint, chunk, records, inserted + updated)
                     await session.commit()
-                except IntegrityError:
+                    imported_rows += inserted
+                    updated_rows += updated
+                    skipped_rows += len(records) - inserted - updated
+                except (IntegrityError, IntegrityConstraintViolationError):
                     await session.rollback()
-                    error_manager.log_warning(
-                        "duplicate_errors",
-                        f"Duplicate entries found in {csv_file_path} asset pair {asset_pair_name}. Duplicates Ignored...",
+                    # The chunk is skipped, move the checkpoint past it
+                    checkpoint = await session.get(
+                        ModelOHLCImportCheckpoint, checkpoint.file_path
                     )
-                    global_error_manager.log_warning(
-                        "duplicate_errors",
-                        f"Duplicate entries found in {csv_file_path} asset pair {asset_pair_name}. Duplicates Ignored...",
+                    advance_checkpoint(checkpoint, chunk, records, 0)
+                    await session.commit()
+                    # Duplicates are handled by on_conflict, this is any other violation
+                    error_manager.log_error(
+                        "integrity_errors",
+                        f"Integrity error in {csv_file_path} asset pair {asset_pair_name}. Chunk skipped...",
+                    )
+                    global_error_manager.log_error(
+                        "integrity_errors",
+                        f"Integrity error in {csv_file_path} asset pair {asset_pair_name}. Chunk skipped...",
                     )
 
                 if validate:
-                    if not await validate_data(session, ohlc_data_list, error_manager):
-                        await session.rollback()
-                    else:
+                    # Rows are already committed, failures are reported in the summary
+                    if await validate_data(session, records, error_manager):
                         success_message = f"Chunk successfully validated: {chunk}"
                         error_manager.log_info(f"{success_message}")
                         global_error_manager.log_info(f"{success_message}")
+                    # End the read transaction, its lock on ohlc_data would
+                    # block the partitions created for the next chunk
+                    await session.commit()
+
+        checkpoint.completed = True
+        checkpoint.updated_at = time.time()
+        await session.commit()
+        error_manager.log_info(
+            f"{csv_file_path}: {imported_rows} rows imported, {updated_rows} updated, "
+            f"{skipped_rows} already stored."
+        )
 
         # Before destroying object, we need to collect all errors in global_error_manager
-        error_manager.close()
+        global_error_manager.merge(error_manager)
+        error_manager.close_loggers()
 
     if error_manager.error_counter["execution_errors"] > 0:
         return "Failed"
@@ -265,14 +790,57 @@ def setup_argparse():
     )
     parser.add_argument("-a", "--assetpair", type=str, help="Asset pair name")
     parser.add_argument("-f", "--file", type=str, help="Path to the CSV file")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        help="Interval in minutes of --file, deduced from the file name by default",
+    )
     parser.add_argument(
         "-d", "--directory", type=str, help="Path to the directory containing CSV files"
     )
+    parser.add_argument(
+        "-z", "--zip", type=str, help="Path to the Kraken OHLCVT zip archive"
+    )
+    parser.add_argument(
+        "--pairs",
+        type=str,
+        help="Comma separated asset pairs imported from --zip, e.g. XBTUSD,ETHUSD",
+    )
+    parser.add_argument(
+        "--intervals",
+        type=str,
+        help="Comma separated intervals in minutes imported from --zip, e.g. 60,1440",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Perform a dry run without making any database changes",
     )
+    parser.add_argument(
+        "--no-copy",
+        action="store_true",
+        help="Write rows through the ORM instead of PostgreSQL COPY",
+    )
+    parser.add_argument(
+        "--on-conflict",
+        choices=ON_CONFLICT_MODES,
+        default="nothing",
+        help="Skip ('nothing') or overwrite ('update') rows already stored",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSERS,
+        default="csv",
+        help="CSV parser, 'numpy' (requires numpy) parses and checks whole chunks at once, "
+        "both reject the same rows",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files imported in parallel with --directory",
+    )
     parser.add_argument(
         "-i",
         "--interactive",
@@ -297,30 +865,16 @@ def setup_argparse():
     return parser
 
 
-def main():
-    """Main function to execute the script."""
-    parser = setup_argparse()
-    args = parser.parse_args()
-
-    # Start Logging
-    global_error_manager.log_info(f"Starting import OHLCVT data from {args.file}.")
-    global_error_manager.log_info(
-        f"Started at: {time.strftime('%H:%M:%S', time.gmtime(global_error_manager.started_time))}"
-    )
-
-    if args.verbosity:
-        execution_logger.setLevel(logging.DEBUG)
-
-    # Select the database session based on the dry-run argument
-    if args.dry_run:
-        session_maker = get_async_sqlite_session("sqlite+aiosqlite:///./test.db")
-    else:
-        session_maker = get_async_postgresql_session()
-
-    session = asyncio.run(session_maker)
+async def run(args, parser):
+    """Run the requested action on a single event loop and database engine."""
+    if args.parser == "numpy" and not numpy_available():
+        execution_logger.error(f"--parser numpy: {NUMPY_MISSING}.")
+        return
+    await init_session_factory(args.dry_run)
+    use_copy = not args.no_copy
 
     if args.list:
-        asyncio.run(list_asset_pairs())
+        await list_asset_pairs()
         return
 
     if args.file:
@@ -333,37 +887,75 @@ def main():
                 return
 
         if args.interactive:
-            asyncio.run(display_mock_data(args.file))
+            await display_mock_data(args.file)
             if not args.yes:
-                if not ask_user_yn():
+                if not ask_user_yn("Start the import?"):
                     execution_logger.info("Import aborted by user.")
                     return
 
-        asyncio.run(
-            import_ohlc_data_from_csv(
-                session,
-                args.file,
-                args.assetpair,
-                interactive=args.interactive,
-                validate=True,
-            )
+        await import_ohlc_data_from_csv(
+            args.file,
+            args.assetpair,
+            interactive=args.interactive,
+            validate=True,
+            use_copy=use_copy,
+            on_conflict=args.on_conflict,
+            parser=args.parser,
+            interval=args.interval,
         )
 
-    elif args.directory:
-        asyncio.run(
-            import_files_in_directory(
-                args.directory, interactive=args.interactive, validate=True
-            )
+    elif args.directory or args.zip:
+        jobs = max(1, args.jobs)
+        if args.interactive and jobs > 1:
+            execution_logger.warning("Interactive mode imports one file at a time.")
+            jobs = 1
+        import_options = dict(
+            interactive=args.interactive,
+            validate=True,
+            use_copy=use_copy,
+            jobs=jobs,
+            on_conflict=args.on_conflict,
+            parser=args.parser,
         )
+        if args.zip:
+            await import_zip_archive(
+                args.zip,
+                pairs=set(args.pairs.split(",")) if args.pairs else None,
+                intervals=(
+                    {int(interval) for interval in args.intervals.split(",")}
+                    if args.intervals
+                    else None
+                ),
+                **import_options,
+            )
+        else:
+            await import_files_in_directory(args.directory, **import_options)
 
     else:
         parser.print_help()
 
+
+def main():
+    """Main function to execute the script."""
+    parser = setup_argparse()
+    args = parser.parse_args()
+
+    # Start Logging
+    global_error_manager.log_info(f"Starting import OHLCVT data from {args.file}.")
+    global_error_manager.log_info(
+        f"Started at: {global_error_manager.started_time.strftime('%H:%M:%S')}"
+    )
+
+    if args.verbosity:
+        execution_logger.setLevel(logging.DEBUG)
+
+    asyncio.run(run(args, parser))
+
     # Print and log the summary
     summary_logger = setup_custom_logging(
-        f"{current_date}_summary_import_OHLCVT.log", LOG_DIR, noscreen=True
+        f"{current_date}_summary_import_OHLCVT", LOG_DIR, noscreen=True
     )
-    global_error_manager.add_logger(summary_logger)
+    global_error_manager.add_logger("summary", summary_logger)
     global_error_manager.print_summary()
 
 
@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+import import_data.scripts.import_OHLCVT as import_OHLCVT
+from import_data.scripts.backfill_OHLCVT import backfill_from_csv, in_task_ranges
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
+from krakenfx.repository.models.ohlcModel import ModelOHLCData
+from krakenfx.repository.ohlcGaps import find_ohlc_gaps, plan_ohlc_backfill
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+# 2024-01-01 00:00:00 UTC
+BASE_TIME = 1704067200
+FULL_CSV = "".join(
+    f"{BASE_TIME + minute * 60},1.0,2.0,0.5,1.5,{minute + 1},1\n"
+    for minute in range(10)
+)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def log_dir(monkeypatch, tmp_path_factory):
+    # Keep the audit logs of the imports out of import_data/import_logs
+    monkeypatch.setattr(
+        import_OHLCVT, "LOG_DIR", str(tmp_path_factory.mktemp("import_logs"))
+    )
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    import_OHLCVT.async_session_factory = async_session
+    async with async_session() as session:
+        yield session
+
+
+def test_in_task_ranges():
+    starts, ends = [10, 30], [20, 40]
+    assert [
+        t for t in (5, 10, 19, 20, 30, 39, 40) if in_task_ranges(t, starts, ends)
+    ] == [
+        10,
+        19,
+        30,
+        39,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backfill_from_csv_only_writes_gaps(db_session, tmp_path):
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+
+    # Import the series with minutes 3, 4 and 8 missing
+    lines = FULL_CSV.splitlines(keepends=True)
+    partial_csv = tmp_path / "partial" / "XBTUSD_1.csv"
+    partial_csv.parent.mkdir()
+    partial_csv.write_text("".join(lines[:3] + lines[5:8] + lines[9:]))
+    await import_OHLCVT.import_ohlc_data_from_csv(
+        str(partial_csv), "XBTUSD", use_copy=False
+    )
+
+    gaps = await find_ohlc_gaps(db_session)
+    assert [gap.missing for gap in gaps] == [2, 1]
+    tasks = plan_ohlc_backfill(gaps, now=BASE_TIME)
+
+    full_csv = tmp_path / "XBTUSD_1.csv"
+    full_csv.write_text(FULL_CSV)
+    inserted = await backfill_from_csv(db_session, tasks, str(full_csv), chunk_size=4)
+
+    assert inserted == 3
+    assert await find_ohlc_gaps(db_session) == []
+    result = await db_session.execute(
+        select(ModelOHLCData.time).order_by(ModelOHLCData.time)
+    )
+    assert result.scalars().all() == [BASE_TIME + minute * 60 for minute in range(10)]
@@ -0,0 +1,414 @@
+import logging
+import zipfile
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event, func, select
+
+import import_data.scripts.import_OHLCVT as import_OHLCVT
+from import_data.scripts.common.error_manager import ErrorManager
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
+from krakenfx.repository.models.ohlcModel import (
+    ModelOHLCData,
+    ModelOHLCImportCheckpoint,
+)
+from krakenfx.utils.logger import setup_custom_logging
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+SAMPLE_CSV = """1381095240,122.0,122.0,122.0,122.0,0.1,1
+1381179000,123.61,123.61,123.61,123.61,0.1,1
+1381201080,123.91,123.91,123.9,123.9,1.9916,2
+1381209960,124.19,124.19,124.18,124.18,2,2
+1381311000,124.01687,124.01687,124.01687,124.01687,1,1
+"""
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def log_dir(monkeypatch, tmp_path_factory):
+    # Keep the audit logs of the imports out of import_data/import_logs
+    monkeypatch.setattr(
+        import_OHLCVT, "LOG_DIR", str(tmp_path_factory.mktemp("import_logs"))
+    )
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    import_OHLCVT.async_session_factory = async_session
+    async with async_session() as session:
+        yield session
+
+
+def test_parse_ohlcvt_row():
+    row = ["1381095240", "122.0", "123.0", "121.0", "122.5", "0.1", "3"]
+    assert import_OHLCVT.parse_ohlcvt_row(row, 7, 60) == (
+        7,
+        60,
+        1381095240,
+        122.0,
+        123.0,
+        121.0,
+        122.5,
+        0.0,
+        0.1,
+        3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_falls_back_to_orm_on_sqlite(db_session, tmp_path):
+    asset_pair = ModelAssetsPairs(pair_name="XBTUSD", data={})
+    db_session.add(asset_pair)
+    await db_session.commit()
+
+    csv_file = tmp_path / "XBTUSD_1.csv"
+    csv_file.write_text(SAMPLE_CSV)
+
+    assert not import_OHLCVT.supports_copy(db_session)
+    status = await import_OHLCVT.import_ohlc_data_from_csv(
+        str(csv_file), "XBTUSD", chunk_size=2, validate=True, use_copy=True
+    )
+    assert status == "Succeed"
+
+    result = await db_session.execute(
+        select(ModelOHLCData.time).order_by(ModelOHLCData.time)
+    )
+    assert result.scalars().all() == [
+        1381095240,
+        1381179000,
+        1381201080,
+        1381209960,
+        1381311000,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_directory_with_jobs(db_session, tmp_path):
+    db_session.add_all(
+        [
+            ModelAssetsPairs(pair_name="XBTUSD", data={}),
+            ModelAssetsPairs(pair_name="ETHUSD", data={}),
+        ]
+    )
+    await db_session.commit()
+
+    (tmp_path / "XBTUSD_1.csv").write_text(SAMPLE_CSV)
+    (tmp_path / "ETHUSD_1.csv").write_text(SAMPLE_CSV.splitlines()[0] + "\n")
+    assert import_OHLCVT.list_csv_files_largest_first(str(tmp_path)) == [
+        str(tmp_path / "XBTUSD_1.csv"),
+        str(tmp_path / "ETHUSD_1.csv"),
+    ]
+
+    await import_OHLCVT.import_files_in_directory(
+        str(tmp_path), chunk_size=2, validate=False, jobs=2
+    )
+
+    result = await db_session.execute(select(ModelOHLCData))
+    assert len(result.scalars().all()) == 6
+
+
+@pytest.mark.asyncio
+async def test_import_directory_continues_after_failed_file(db_session, tmp_path):
+    db_session.add_all(
+        [
+            ModelAssetsPairs(pair_name="XBTUSD", data={}),
+            ModelAssetsPairs(pair_name="ETHUSD", data={}),
+        ]
+    )
+    await db_session.commit()
+
+    (tmp_path / "XBTUSD_1.csv").write_text(SAMPLE_CSV)
+    (tmp_path / "ETHUSD_1.csv").write_text("not,a,candle\n")
+    errors = import_OHLCVT.global_error_manager.error_counter["execution_errors"]
+
+    await import_OHLCVT.import_files_in_directory(str(tmp_path), chunk_size=2, jobs=2)
+
+    result = await db_session.execute(select(ModelOHLCData))
+    assert len(result.scalars().all()) == 5
+    assert (
+        import_OHLCVT.global_error_manager.error_counter["execution_errors"]
+        == errors + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_from_checkpoint(db_session, tmp_path):
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+
+    csv_file = tmp_path / "XBTUSD_1.csv"
+    csv_file.write_text(SAMPLE_CSV)
+    assert (
+        await import_OHLCVT.import_ohlc_data_from_csv(
+            str(csv_file), "XBTUSD", chunk_size=2
+        )
+        == "Succeed"
+    )
+
+    # Unchanged files are skipped by fingerprint
+    assert (
+        await import_OHLCVT.import_ohlc_data_from_csv(
+            str(csv_file), "XBTUSD", chunk_size=2
+        )
+        == "Skipped"
+    )
+
+    # Simulate a crash after the first chunk: checkpoint and rows of chunk 1 only
+    first_chunk = "".join(SAMPLE_CSV.splitlines(keepends=True)[:2])
+    checkpoint = await db_session.get(ModelOHLCImportCheckpoint, str(csv_file))
+    checkpoint.completed = False
+    checkpoint.byte_offset = len(first_chunk.encode())
+    checkpoint.rows_imported = 2
+    checkpoint.last_time = 1381179000
+    await db_session.execute(
+        delete(ModelOHLCData).where(ModelOHLCData.time > 1381179000)
+    )
+    await db_session.commit()
+
+    assert (
+        await import_OHLCVT.import_ohlc_data_from_csv(
+            str(csv_file), "XBTUSD", chunk_size=2
+        )
+        == "Succeed"
+    )
+    result = await db_session.execute(select(ModelOHLCData.time))
+    assert len(result.scalars().all()) == 5
+
+    await db_session.refresh(checkpoint)
+    assert checkpoint.completed
+    assert checkpoint.rows_imported == 5
+    assert checkpoint.last_time == 1381311000
+
+
+@pytest.mark.asyncio
+async def test_import_overlapping_file_skips_duplicates(db_session, tmp_path):
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+
+    lines = SAMPLE_CSV.splitlines(keepends=True)
+    first_dump = tmp_path / "first" / "XBTUSD_1.csv"
+    first_dump.parent.mkdir()
+    first_dump.write_text("".join(lines[:3]))
+    await import_OHLCVT.import_ohlc_data_from_csv(
+        str(first_dump), "XBTUSD", chunk_size=2
+    )
+
+    # Overlaps the first dump on two rows, one of them with a corrected close
+    second_dump = tmp_path / "second" / "XBTUSD_1.csv"
+    second_dump.parent.mkdir()
+    second_dump.write_text(
+        lines[1]
+        + lines[2].replace("123.9,123.9,1.9916", "123.9,124.0,1.9916")
+        + "".join(lines[3:])
+    )
+
+    async with import_OHLCVT.async_session_factory() as session:
+        records = [
+            import_OHLCVT.parse_ohlcvt_row(line.strip().split(","), 1, 1)
+            for line in second_dump.read_text().splitlines()
+        ]
+        assert await import_OHLCVT.write_ohlc_records(
+            session, records, use_copy=False, on_conflict="nothing"
+        ) == (2, 0)
+        await session.rollback()
+
+        assert await import_OHLCVT.write_ohlc_records(
+            session, records, use_copy=False, on_conflict="update"
+        ) == (2, 1)
+        await session.commit()
+
+    result = await db_session.execute(
+        select(ModelOHLCData.close).where(ModelOHLCData.time == 1381201080)
+    )
+    assert result.scalars().all() == [124.0]
+    result = await db_session.execute(select(ModelOHLCData.time))
+    assert len(result.scalars().all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_validate_data_one_query_per_chunk(db_session, engine):
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+    ohlc_asset_pair = await import_OHLCVT.get_or_create_ohlc_asset_pair(
+        db_session, "XBTUSD"
+    )
+
+    records = [
+        import_OHLCVT.parse_ohlcvt_row(line.split(","), ohlc_asset_pair.id, 1)
+        for line in SAMPLE_CSV.splitlines()
+    ]
+    await import_OHLCVT.write_ohlc_records(db_session, records, use_copy=False)
+    await db_session.commit()
+
+    selects = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if "ohlc_data" in statement and statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_selects)
+    try:
+        error_manager = import_OHLCVT.ErrorManager()
+        assert await import_OHLCVT.validate_data(db_session, records, error_manager)
+
+        # A row differing from the stored one is reported
+        records[2] = records[2][:6] + (999.0,) + records[2][7:]
+        assert not await import_OHLCVT.validate_data(db_session, records, error_manager)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_selects)
+
+    assert len(selects) == 2
+    assert "999.0" in error_manager.error_lists["validation_errors"][-1]
+
+
+def test_numpy_parser_matches_csv_parser():
+    pytest.importorskip("numpy")
+    lines = SAMPLE_CSV.encode().splitlines(keepends=True)
+
+    records, rejected = import_OHLCVT.parse_ohlcvt_chunk(lines, 3, 1, parser="numpy")
+    assert rejected == []
+    assert records == import_OHLCVT.parse_ohlcvt_lines(lines, 3, 1)[0]
+
+
+@pytest.mark.parametrize("parser", import_OHLCVT.PARSERS)
+def test_parser_sanity_checks(parser):
+    if parser == "numpy":
+        pytest.importorskip("numpy")
+    lines = [
+        b"1381095240,122.0,122.0,122.0,122.0,0.1,1\n",
+        b"1381179000,123.61,120.0,123.61,123.61,0.1,1\n",  # high < low
+        b"1381190000,123.91,123.91,123.9,123.9,-1.9916,2\n",  # negative volume
+        b"1381201080,123.91,123.91,123.9,123.9,1.9916,2\n",
+        b"1381201080,124.19,124.19,124.18,124.18,2,2\n",  # time not increasing
+    ]
+
+    records, rejected = import_OHLCVT.parse_ohlcvt_chunk(
+        lines, 3, 1, parser=parser, previous_time=1381095240
+    )
+    assert [record[2] for record in records] == [1381201080]
+    assert [row[0] for row in rejected] == [
+        1381095240,
+        1381179000,
+        1381190000,
+        1381201080,
+    ]
+
+
+@pytest.mark.parametrize("parser", import_OHLCVT.PARSERS)
+def test_parser_time_check_same_within_and_across_chunks(parser):
+    if parser == "numpy":
+        pytest.importorskip("numpy")
+    lines = [
+        b"100,1.0,1.0,1.0,1.0,1,1\n",
+        b"300,1.0,1.0,1.0,1.0,1,1\n",
+        b"200,1.0,1.0,1.0,1.0,1,1\n",  # before 300
+        b"400,1.0,1.0,1.0,1.0,1,1\n",
+        b"500,1.0,0.5,1.0,1.0,1,1\n",  # high < low, does not move the time
+        b"450,1.0,1.0,1.0,1.0,1,1\n",
+        b"1000000000000,1.0,1.0,1.0,1.0,1,1\n",
+        b"600,1.0,1.0,1.0,1.0,1,1\n",  # before the row accepted above
+    ]
+
+    records, _ = import_OHLCVT.parse_ohlcvt_chunk(lines, 3, 1, parser=parser)
+    accepted = [record[2] for record in records]
+    assert accepted == [100, 300, 400, 450, 1000000000000]
+
+    chunked = []
+    previous_time = None
+    for start in range(0, len(lines), 3):
+        records, _ = import_OHLCVT.parse_ohlcvt_chunk(
+            lines[start : start + 3], 3, 1, parser=parser, previous_time=previous_time
+        )
+        chunked += [record[2] for record in records]
+        previous_time = chunked[-1] if chunked else previous_time
+    assert chunked == accepted
+
+
+@pytest.mark.asyncio
+async def test_import_zip_archive_filters_members(db_session, tmp_path):
+    db_session.add_all(
+        [
+            ModelAssetsPairs(pair_name="XBTUSD", data={}),
+            ModelAssetsPairs(pair_name="ETHUSD", data={}),
+        ]
+    )
+    await db_session.commit()
+
+    zip_path = tmp_path / "Kraken_OHLCVT.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("Kraken_OHLCVT/XBTUSD_1.csv", SAMPLE_CSV)
+        archive.writestr("Kraken_OHLCVT/XBTUSD_60.csv", SAMPLE_CSV)
+        archive.writestr("Kraken_OHLCVT/ETHUSD_1.csv", SAMPLE_CSV)
+
+    assert import_OHLCVT.list_zip_members_largest_first(
+        str(zip_path), pairs={"XBTUSD"}, intervals={1}
+    ) == ["Kraken_OHLCVT/XBTUSD_1.csv"]
+
+    await import_OHLCVT.import_zip_archive(
+        str(zip_path), pairs={"XBTUSD"}, intervals={1}, chunk_size=2
+    )
+    result = await db_session.execute(select(ModelOHLCData.time))
+    assert len(result.scalars().all()) == 5
+
+    checkpoint = await db_session.get(
+        ModelOHLCImportCheckpoint, f"{zip_path}::Kraken_OHLCVT/XBTUSD_1.csv"
+    )
+    assert checkpoint.completed
+    assert checkpoint.byte_offset == len(SAMPLE_CSV)
+
+
+@pytest.mark.asyncio
+async def test_import_intervals_side_by_side(db_session, tmp_path):
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+
+    (tmp_path / "XBTUSD_1.csv").write_text(SAMPLE_CSV)
+    (tmp_path / "XBTUSD_1440.csv").write_text(SAMPLE_CSV)
+    await import_OHLCVT.import_files_in_directory(str(tmp_path), chunk_size=2)
+
+    result = await db_session.execute(
+        select(ModelOHLCData.interval, func.count()).group_by(ModelOHLCData.interval)
+    )
+    assert sorted(result.all()) == [(1, 5), (1440, 5)]
+
+
+def test_summary_written_to_queued_file_logger(tmp_path, capsys):
+    summary_logger = setup_custom_logging("summary_test", str(tmp_path), noscreen=True)
+    error_manager = ErrorManager({"summary": summary_logger})
+    error_manager.log_error("import_errors", "Import XBTUSD_1.csv with status: Failed.")
+
+    error_manager.print_summary()
+    error_manager.close_loggers()
+
+    (log_file,) = tmp_path.glob("*.log")
+    assert "## Summary of Execution" in log_file.read_text()
+    assert capsys.readouterr().out == ""
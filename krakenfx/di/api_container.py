@@ -0,0 +1,24 @@
+# krakenfx/di/api_container.py
+from dependency_injector import containers, providers
+
+from krakenfx.di.config_container import ConfigContainer
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.utils.http_client import HttpClientFactory
+from krakenfx.utils.nonce import NonceManager
+from krakenfx.utils.rate_limiter import KrakenRateLimiter
+
+
+class ApiContainer(containers.DeclarativeContainer):
+    config_container = providers.Container(ConfigContainer)
+    logger_container = providers.Container(LoggerContainer)
+
+    config = config_container.provided.config()
+    logger = logger_container.provided.logger()
+
+    http_client_factory = providers.Singleton(
+        HttpClientFactory, settings=config, logger=logger
+    )
+    rate_limiter = providers.Singleton(
+        KrakenRateLimiter, settings=config, logger=logger
+    )
+    nonce_manager = providers.Singleton(NonceManager, settings=config, logger=logger)
@@ -1,5 +1,6 @@
 from dependency_injector import containers, providers
 
+from krakenfx.di.api_container import ApiContainer
 from krakenfx.di.config_container import ConfigContainer
 from krakenfx.di.database_container import DatabaseContainer
 from krakenfx.di.logger_container import LoggerContainer
@@ -9,3 +10,4 @@ class AppContainer(containers.DeclarativeContainer):
     config_container = providers.Container(ConfigContainer)
     logger_container = providers.Container(LoggerContainer)
     database_container = providers.Container(DatabaseContainer)
+    api_container = providers.Container(ApiContainer)
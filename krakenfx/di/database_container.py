@@ -4,6 +4,7 @@ from dependency_injector import containers, providers
 from krakenfx.di.config_container import ConfigContainer
 from krakenfx.di.logger_container import LoggerContainer
 from krakenfx.utils.database import DatabaseFactory
+from krakenfx.utils.resample_cache import OHLCResampleCache
 
 
 class DatabaseContainer(containers.DeclarativeContainer):
@@ -16,3 +17,8 @@ class DatabaseContainer(containers.DeclarativeContainer):
     database_factory = providers.Singleton(
         DatabaseFactory, settings=config, logger=logger
     )
+    # `async with container.session() as session:`, one pooled session
+    session = database_factory.provided.session.call()
+    ohlc_resample_cache = providers.Singleton(
+        OHLCResampleCache, settings=config, logger=logger
+    )
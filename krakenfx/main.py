@@ -4,23 +4,23 @@ import asyncio
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from .di.app_container import AppContainer
-from .repository.storeAssetsPairs import process_asset_pairs
-
-# Could benefit Factory design pattern
-#   An attributes could be define for each repository script to define interval
-#   A loop could replace import and scheduler definition
-from .repository.storeBalance import process_balance
-from .repository.storeLedgers import process_ledgers
-from .repository.storeOpenPositions import process_openPositions
-from .repository.storeOrders import process_orders
-from .repository.storeTradeBalance import process_tradeBalance
-from .repository.storeTradeHistory import process_tradeHistory
-from .utils.logger import setup_main_logging
-
-logger = setup_main_logging()
+from .services.syncJobs import (
+    asset_pairs_job,
+    balance_job,
+    ledgers_job,
+    open_positions_job,
+    orders_job,
+    sync_ohlc_job,
+    sync_recent_trades_job,
+    sync_spreads_job,
+    trade_balance_job,
+    trade_history_job,
+)
+from .utils.jobs import session_job
 
 # Defining dependency injector pattern & Wire application components
 container = AppContainer()
+logger = container.logger_container().logger()
 container.wire(
     modules=[
         "krakenfx.services.account_data.OrderService",
@@ -36,6 +36,7 @@ container.wire(
         "krakenfx.services.spot_market_data.getAssetsPairsService",
         "krakenfx.services.spot_market_data.getAssetsService",
         "krakenfx.services.spot_market_data.getDepthService",
+        "krakenfx.services.spot_market_data.getOHLCService",
         "krakenfx.services.spot_market_data.getSpreadsService",
         "krakenfx.services.spot_market_data.getSystemStatusService",
         "krakenfx.services.spot_market_data.getTickerService",
@@ -46,14 +47,21 @@ container.wire(
 
 
 async def main():
+    # Each run opens its own session from the pool and gives it back when done
+    session = container.database_container().session
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(process_balance, "interval", minutes=60)
-    scheduler.add_job(process_tradeBalance, "interval", minutes=60)
-    scheduler.add_job(process_tradeHistory, "interval", minutes=60)
-    scheduler.add_job(process_orders, "interval", minutes=60)
-    scheduler.add_job(process_ledgers, "interval", minutes=60)
-    scheduler.add_job(process_openPositions, "interval", minutes=10)
-    scheduler.add_job(process_asset_pairs, "interval", minutes=720)
+    scheduler.add_job(session_job(balance_job, session), "interval", minutes=60)
+    scheduler.add_job(session_job(trade_balance_job, session), "interval", minutes=60)
+    scheduler.add_job(session_job(trade_history_job, session), "interval", minutes=60)
+    scheduler.add_job(session_job(orders_job, session), "interval", minutes=60)
+    scheduler.add_job(session_job(ledgers_job, session), "interval", minutes=60)
+    scheduler.add_job(session_job(open_positions_job, session), "interval", minutes=10)
+    scheduler.add_job(session_job(asset_pairs_job, session), "interval", minutes=720)
+    scheduler.add_job(session_job(sync_ohlc_job, session), "interval", minutes=1)
+    scheduler.add_job(
+        session_job(sync_recent_trades_job, session), "interval", minutes=1
+    )
+    scheduler.add_job(session_job(sync_spreads_job, session), "interval", minutes=1)
     scheduler.start()
 
     try:
@@ -61,6 +69,8 @@ async def main():
             await asyncio.sleep(3600)  # Keep the script running
     except (KeyboardInterrupt, SystemExit):
         pass
+    finally:
+        await container.api_container().http_client_factory().close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import literal_column, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.utils.errors import KrakenValueError, async_handle_errors
+
+logger = LoggerContainer().logger()
+
+# Maximum number of bind parameters in a single statement.
+# asyncpg is limited to 32767, SQLite to 32766 since 3.32.
+BIND_PARAM_LIMITS = {
+    "postgresql": 32767,
+    "sqlite": 32766,
+}
+
+
+def _chunks(rows: List[Dict], size: int) -> Iterable[List[Dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+@async_handle_errors
+async def fetch_existing_by_ids(
+    session: AsyncSession, model, ids: Iterable[str], chunk_size: int = 5000
+) -> Dict[str, object]:
+    """Load the `model` instances whose primary key `id` is in `ids`.
+
+    One IN query is issued per `chunk_size` ids, the instances are returned
+    in a dictionary keyed by id so callers can decide insert vs. update in memory.
+    """
+    ids = list(ids)
+    existing = {}
+    for start in range(0, len(ids), chunk_size):
+        result = await session.execute(
+            select(model).where(model.id.in_(ids[start : start + chunk_size]))
+        )
+        for instance in result.scalars():
+            existing[instance.id] = instance
+    logger.flow2(
+        f"Prefetched {len(existing)} existing rows of {model.__tablename__} "
+        f"out of {len(ids)} ids."
+    )
+    return existing
+
+
+def _get_insert(session: AsyncSession):
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        return dialect, postgresql.insert
+    if dialect == "sqlite":
+        return dialect, sqlite.insert
+    raise KrakenValueError(f"Bulk upsert is not supported on dialect {dialect}.")
+
+
+@async_handle_errors
+async def bulk_insert_ignore(
+    session: AsyncSession,
+    model,
+    rows: List[Dict],
+    index_elements: Sequence[str],
+) -> int:
+    """Insert `rows` of `model` with INSERT ... ON CONFLICT DO NOTHING.
+
+    Rows conflicting with existing ones on `index_elements` are skipped instead
+    of failing the whole statement.
+
+    Returns:
+        int: Number of inserted rows.
+    """
+    if not rows:
+        return 0
+
+    dialect, insert = _get_insert(session)
+    table = model.__table__
+    chunk_size = max(1, BIND_PARAM_LIMITS[dialect] // len(rows[0]))
+    inserted = 0
+
+    for chunk in _chunks(rows, chunk_size):
+        stmt = insert(table).values(chunk)
+        stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+        result = await session.execute(stmt)
+        inserted += result.rowcount
+        logger.flow2(
+            f"Bulk insert of {len(chunk)} rows into {table.name}: "
+            f"{result.rowcount} inserted, {len(chunk) - result.rowcount} skipped."
+        )
+
+    return inserted
+
+
+@async_handle_errors
+async def bulk_upsert(
+    session: AsyncSession,
+    model,
+    rows: List[Dict],
+    index_elements: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+) -> Tuple[int, int]:
+    """Insert or update `rows` of `model` with INSERT ... ON CONFLICT DO UPDATE.
+
+    Existing rows are only rewritten when at least one of `update_columns`
+    differs, so re-syncing unchanged records does not generate dead tuples.
+    Rows are sent in as few statements as the bind parameter limit allows.
+
+    Args:
+        session: Session the statements are executed in, it is not committed.
+        model: ORM model of the target table.
+        rows: Records as dictionaries, all with the same keys.
+        index_elements: Columns of the unique constraint used to detect conflicts.
+        update_columns: Columns rewritten on conflict, defaults to all non key columns.
+
+    Returns:
+        Tuple[int, int]: Number of inserted and updated rows.
+    """
+    if not rows:
+        return 0, 0
+
+    dialect, insert = _get_insert(session)
+    table = model.__table__
+    columns = list(rows[0].keys())
+    if update_columns is None:
+        update_columns = [column for column in columns if column not in index_elements]
+
+    chunk_size = max(1, BIND_PARAM_LIMITS[dialect] // len(columns))
+    inserted = updated = 0
+
+    for chunk in _chunks(rows, chunk_size):
+        stmt = insert(table).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={column: stmt.excluded[column] for column in update_columns},
+            where=or_(
+                *(
+                    table.c[column].is_distinct_from(stmt.excluded[column])
+                    for column in update_columns
+                )
+            ),
+        )
+
+        if dialect == "postgresql":
+            # xmax is 0 for a freshly inserted tuple, rows skipped by the WHERE
+            # clause are not returned
+            result = await session.execute(
+                stmt.returning(literal_column("(xmax = 0)").label("inserted"))
+            )
+            flags = result.scalars().all()
+            chunk_inserted = sum(1 for flag in flags if flag)
+            chunk_updated = len(flags) - chunk_inserted
+        else:
+            key_columns = [table.c[column] for column in index_elements]
+            keys = [tuple(row[column] for column in index_elements) for row in chunk]
+            existing = await session.execute(
+                select(*key_columns).where(tuple_(*key_columns).in_(keys))
+            )
+            chunk_inserted = len(set(keys)) - len(existing.all())
+            result = await session.execute(stmt.returning(*key_columns))
+            chunk_updated = len(result.all()) - chunk_inserted
+
+        inserted += chunk_inserted
+        updated += chunk_updated
+        logger.flow2(
+            f"Bulk upsert of {len(chunk)} rows into {table.name}: "
+            f"{chunk_inserted} inserted, {chunk_updated} updated."
+        )
+
+    return inserted, updated
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
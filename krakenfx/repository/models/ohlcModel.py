@@ -1,4 +1,13 @@
-from sqlalchemy import BigInteger, Column, Float, ForeignKey, Index, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from krakenfx.repository.models._base import Base
@@ -21,10 +30,15 @@ class ModelOHLCAssetPair(Base):
 
 class ModelOHLCData(Base):
     __tablename__ = "ohlc_data"
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    asset_pair_id = Column(Integer, ForeignKey("ohlc_asset_pairs.id"), nullable=False)
-    time = Column(BigInteger, nullable=False, index=True)
+    # On PostgreSQL the table is range partitioned by month on `time`, the
+    # partitions are created on demand (see repository.ohlcPartitions).
+    # The primary key has to include the partition key, it is one candle per
+    # pair, interval and time and serves to range-scan a timeframe of a pair.
+    __table_args__ = {"postgresql_partition_by": "RANGE (time)"}
+
+    asset_pair_id = Column(Integer, ForeignKey("ohlc_asset_pairs.id"), primary_key=True)
+    interval = Column(Integer, primary_key=True)  # Candle timeframe in minutes
+    time = Column(BigInteger, primary_key=True, index=True)
     open = Column(Float, nullable=False)
     high = Column(Float, nullable=False)
     low = Column(Float, nullable=False)
@@ -36,9 +50,10 @@ class ModelOHLCData(Base):
     rel_asset_pair = relationship("ModelOHLCAssetPair", back_populates="rel_ohlc_data")
 
     def __init__(
-        self, asset_pair_id, time, open, high, low, close, vwap, volume, count
+        self, asset_pair_id, interval, time, open, high, low, close, vwap, volume, count
     ):
         self.asset_pair_id = asset_pair_id
+        self.interval = interval
         self.time = time
         self.open = open
         self.high = high
@@ -49,21 +64,55 @@ class ModelOHLCData(Base):
         self.count = count
 
 
-# Adding index to improve query performance
-Index("idx_ohlc_data_asset_pair_time", ModelOHLCData.asset_pair_id, ModelOHLCData.time)
+class ModelOHLCResult(Base):
+    """Cursor of the /0/public/OHLC polling, one per pair and interval.
 
+    `last` is the time of the last committed candle returned by Kraken, it is
+    sent back as `since` to only fetch newer candles.
+    """
 
-class ModelOHLCResult(Base):
     __tablename__ = "ohlc_results"
+    __table_args__ = (
+        UniqueConstraint(
+            "asset_pair_id", "interval", name="uq_ohlc_results_asset_pair_interval"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     asset_pair_id = Column(Integer, ForeignKey("ohlc_asset_pairs.id"), nullable=False)
+    interval = Column(Integer, nullable=False)  # Candle timeframe in minutes
     last = Column(BigInteger, nullable=False)
 
     rel_asset_pair = relationship(
         "ModelOHLCAssetPair", back_populates="rel_ohlc_results"
     )
 
-    def __init__(self, asset_pair_id, last):
+    def __init__(self, asset_pair_id, interval, last):
         self.asset_pair_id = asset_pair_id
+        self.interval = interval
         self.last = last
+
+
+class ModelOHLCImportCheckpoint(Base):
+    """Progress of the OHLCVT CSV import of a file.
+
+    The file is identified by its path and fingerprinted by size and mtime,
+    `byte_offset` is the position right after the last committed chunk.
+    """
+
+    __tablename__ = "ohlc_import_checkpoints"
+
+    file_path = Column(String, primary_key=True)
+    file_size = Column(BigInteger, nullable=False)
+    file_mtime = Column(Float, nullable=False)
+    byte_offset = Column(BigInteger, nullable=False, default=0)
+    last_time = Column(BigInteger, nullable=True)
+    rows_imported = Column(BigInteger, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"file_path={self.file_path}, byte_offset={self.byte_offset}, "
+            f"completed={self.completed}"
+        )
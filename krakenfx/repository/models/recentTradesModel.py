@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Column, Float, String
+
+from krakenfx.repository.models._base import Base
+
+
+class ModelRecentTrade(Base):
+    """
+    Model for the public trades of an asset pair (/0/public/Trades).
+
+    Attributes:
+        pair: Asset pair name the trades were requested for.
+        trade_id: Kraken trade ID, unique per pair.
+        price: Trade price.
+        volume: Trade volume.
+        time: Unix timestamp of the trade.
+        type: Side of the trade, "b" (buy) or "s" (sell).
+        order_type: Order type, "m" (market) or "l" (limit).
+        miscellaneous: Miscellaneous information.
+    """
+
+    __tablename__ = "recent_trades"
+
+    pair = Column(String, primary_key=True)
+    trade_id = Column(BigInteger, primary_key=True)
+    price = Column(String, nullable=False)
+    volume = Column(String, nullable=False)
+    time = Column(Float, nullable=False, index=True)
+    type = Column(String, nullable=False)
+    order_type = Column(String, nullable=False)
+    miscellaneous = Column(String, nullable=True)
+
+    def __repr__(self):
+        return f"RecentTrade(pair={self.pair}, trade_id={self.trade_id}, price={self.price}, volume={self.volume}, time={self.time})"
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, String
+
+from krakenfx.repository.models._base import Base
+
+
+class ModelSpread(Base):
+    """
+    Model for the best bid and ask of an asset pair (/0/public/Spread).
+
+    Attributes:
+        pair: Asset pair name the spreads were requested for.
+        timestamp: Unix timestamp of the spread.
+        bid: Best bid price.
+        ask: Best ask price.
+    """
+
+    __tablename__ = "spreads"
+
+    pair = Column(String, primary_key=True)
+    timestamp = Column(BigInteger, primary_key=True)
+    bid = Column(String, nullable=False)
+    ask = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"Spread(pair={self.pair}, timestamp={self.timestamp}, bid={self.bid}, ask={self.ask})"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Float, String
+
+from krakenfx.repository.models._base import Base
+
+
+class ModelSyncState(Base):
+    """
+    Model for the incremental synchronisation cursors.
+
+    Attributes:
+        endpoint: Kraken endpoint the cursor belongs to (e.g. Ledgers, TradesHistory).
+        scope: Sub-key of the cursor, the asset pair for public endpoints, empty otherwise.
+        last_time: Unix timestamp of the newest record stored.
+        last_id: ID of the newest record stored, or the 'last' value returned by public endpoints.
+        updated_at: Unix timestamp of the last cursor update.
+    """
+
+    __tablename__ = "sync_state"
+
+    endpoint = Column(String, primary_key=True)
+    scope = Column(String, primary_key=True, default="")
+    last_time = Column(Float, nullable=True)
+    last_id = Column(String, nullable=True)
+    updated_at = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"SyncState(endpoint={self.endpoint}, scope={self.scope}, last_time={self.last_time}, last_id={self.last_id})"
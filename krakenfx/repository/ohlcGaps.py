@@ -0,0 +1,127 @@
+import time
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.models.ohlcModel import ModelOHLCAssetPair, ModelOHLCData
+from krakenfx.utils.errors import async_handle_errors
+
+logger = LoggerContainer().logger()
+
+# /0/public/OHLC only returns the 720 most recent candles of an interval
+OHLC_API_WINDOW = 720
+
+
+class OHLCGap(NamedTuple):
+    """Missing candles of a series, from `start` (included) to `end` (excluded)."""
+
+    pair_name: str
+    asset_pair_id: int
+    interval: int
+    start: int
+    end: int
+
+    @property
+    def missing(self) -> int:
+        return (self.end - self.start) // (self.interval * 60)
+
+
+class OHLCBackfillTask(NamedTuple):
+    """Range of a gap to fetch again, from the CSV dumps or the API."""
+
+    source: str  # "csv" or "api"
+    gap: OHLCGap
+    start: int
+    end: int
+
+
+@async_handle_errors
+async def find_ohlc_gaps(
+    session: AsyncSession,
+    pairs: Optional[Iterable[str]] = None,
+    intervals: Optional[Iterable[int]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    min_missing: int = 1,
+) -> List[OHLCGap]:
+    """Find the holes of the stored series with a single window query.
+
+    Each candle is compared to the next one of its (pair, interval) series
+    with LEAD(), a hole is reported when at least `min_missing` candles are
+    missing in between. Only holes between two stored candles are found.
+    Kraken does not publish candles of intervals without trades, so small
+    holes are expected on illiquid pairs.
+    """
+    step = ModelOHLCData.interval * 60
+    next_time = (
+        func.lead(ModelOHLCData.time)
+        .over(
+            partition_by=(ModelOHLCData.asset_pair_id, ModelOHLCData.interval),
+            order_by=ModelOHLCData.time,
+        )
+        .label("next_time")
+    )
+    conditions = []
+    if pairs is not None:
+        conditions.append(ModelOHLCAssetPair.name.in_(list(pairs)))
+    if intervals is not None:
+        conditions.append(ModelOHLCData.interval.in_(list(intervals)))
+    if start is not None:
+        conditions.append(ModelOHLCData.time >= start)
+    if end is not None:
+        conditions.append(ModelOHLCData.time < end)
+
+    candles = (
+        select(
+            ModelOHLCAssetPair.name,
+            ModelOHLCData.asset_pair_id,
+            ModelOHLCData.interval,
+            (ModelOHLCData.time + step).label("gap_start"),
+            next_time,
+        )
+        .join(ModelOHLCAssetPair)
+        .where(*conditions)
+        .subquery()
+    )
+    stmt = (
+        select(candles)
+        .where(
+            candles.c.next_time - candles.c.gap_start
+            >= candles.c.interval * 60 * min_missing
+        )
+        .order_by(candles.c.name, candles.c.interval, candles.c.gap_start)
+    )
+    result = await session.execute(stmt)
+    gaps = [OHLCGap(*row) for row in result]
+    logger.flow1(f"Found {len(gaps)} gaps in the stored OHLC series.")
+    return gaps
+
+
+def plan_ohlc_backfill(
+    gaps: Iterable[OHLCGap], now: Optional[float] = None
+) -> List[OHLCBackfillTask]:
+    """Split the gaps into API and CSV backfill tasks.
+
+    The part of a gap within the last OHLC_API_WINDOW candles of its interval
+    can be fetched from /0/public/OHLC, anything older has to come from the
+    OHLCVT CSV dumps.
+    """
+    now = int(time.time() if now is None else now)
+    tasks = []
+    for gap in gaps:
+        api_start = now - OHLC_API_WINDOW * gap.interval * 60
+        if gap.start < api_start:
+            tasks.append(
+                OHLCBackfillTask("csv", gap, gap.start, min(gap.end, api_start))
+            )
+        if gap.end > api_start:
+            tasks.append(
+                OHLCBackfillTask("api", gap, max(gap.start, api_start), gap.end)
+            )
+    return tasks
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.models.ohlcModel import ModelOHLCData
+from krakenfx.utils.errors import async_handle_errors
+
+logger = LoggerContainer().logger()
+
+# On PostgreSQL ohlc_data is range partitioned on `time` (unix seconds),
+# one partition per calendar month (UTC) named ohlc_data_yYYYYmMM.
+OHLC_PARENT_TABLE = ModelOHLCData.__tablename__
+
+# Partitions known to exist, per database url, to skip the DDL round trip
+_known_partitions = set()
+_lock = None
+_lock_loop = None
+
+
+def _get_lock() -> asyncio.Lock:
+    # asyncio.Lock binds to the running loop, recreate it if the loop changed
+    global _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock = asyncio.Lock()
+        _lock_loop = loop
+    return _lock
+
+
+def _month_start(timestamp: int) -> datetime:
+    date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{OHLC_PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def iter_month_partitions(
+    min_time: int, max_time: int
+) -> Iterable[Tuple[str, int, int]]:
+    """Yield (name, start, end) of the monthly partitions covering the range.
+
+    The partitions cover [min_time, max_time], bounds are unix timestamps with
+    `start` inclusive and `end` exclusive as in FOR VALUES FROM (start) TO (end).
+    """
+    month = _month_start(min_time)
+    while int(month.timestamp()) <= max_time:
+        next_month = _next_month(month)
+        yield partition_name(month), int(month.timestamp()), int(next_month.timestamp())
+        month = next_month
+
+
+def create_partition_sql(name: str, start: int, end: int) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {OHLC_PARENT_TABLE} "
+        f"FOR VALUES FROM ({start}) TO ({end})"
+    )
+
+
+@async_handle_errors
+async def ensure_ohlc_partitions(
+    engine: AsyncEngine, min_time: int, max_time: int
+) -> List[str]:
+    """Create the monthly partitions of ohlc_data needed to store [min_time, max_time].
+
+    The DDL runs on its own connection and is committed right away: creating
+    a partition locks the parent table, holding that lock in the import
+    transaction would block (or deadlock with) the other import jobs.
+    Nothing is done on dialects other than PostgreSQL.
+
+    The DDL waits for every transaction using ohlc_data or writing to
+    ohlc_asset_pairs, so it has to be called before the caller's transaction
+    reads or writes them, or after it is committed: otherwise the caller
+    waits on itself forever.
+
+    Returns:
+        List[str]: Names of the partitions created by this call.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    database = engine.url.render_as_string(hide_password=True)
+    missing = [
+        partition
+        for partition in iter_month_partitions(min_time, max_time)
+        if (database, partition[0]) not in _known_partitions
+    ]
+    if not missing:
+        return []
+
+    created = []
+    async with _get_lock():
+        async with engine.begin() as connection:
+            for name, start, end in missing:
+                if (database, name) in _known_partitions:
+                    continue
+                exists = await connection.scalar(
+                    text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+                )
+                if not exists:
+                    await connection.exec_driver_sql(
+                        create_partition_sql(name, start, end)
+                    )
+                    created.append(name)
+                _known_partitions.add((database, name))
+
+    if created:
+        logger.flow1(f"Created {OHLC_PARENT_TABLE} partitions: {', '.join(created)}")
+    return created
+
+
+@async_handle_errors
+async def list_ohlc_partitions(engine: AsyncEngine) -> List[str]:
+    """Names of the partitions attached to ohlc_data, oldest first."""
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass) "
+                "ORDER BY c.relname"
+            ),
+            {"parent": OHLC_PARENT_TABLE},
+        )
+        return list(result.scalars())
+
+
+@async_handle_errors
+async def detach_ohlc_partitions(engine: AsyncEngine, before_time: int) -> List[str]:
+    """Detach the monthly partitions entirely older than `before_time`.
+
+    Detached partitions become standalone tables which can be dumped, moved
+    to another tablespace or dropped without touching ohlc_data.
+
+    Returns:
+        List[str]: Names of the detached partitions.
+    """
+    cutoff = partition_name(_month_start(before_time))
+    detached = [name for name in await list_ohlc_partitions(engine) if name < cutoff]
+    if not detached:
+        return []
+
+    async with engine.begin() as connection:
+        for name in detached:
+            await connection.exec_driver_sql(
+                f"ALTER TABLE {OHLC_PARENT_TABLE} DETACH PARTITION {name}"
+            )
+
+    database = engine.url.render_as_string(hide_password=True)
+    _known_partitions.difference_update((database, name) for name in detached)
+    logger.flow1(f"Detached {OHLC_PARENT_TABLE} partitions: {', '.join(detached)}")
+    return detached
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 from krakenfx.di.logger_container import LoggerContainer
 from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
 from krakenfx.utils.errors import async_handle_errors
+from krakenfx.utils.logger import LazyJson
 
 logger = LoggerContainer().logger()
 
@@ -15,7 +16,10 @@ async def process_asset_pairs(assetsPairs: json, session: AsyncSession):
     logger.info("Processing asset pairs.")
 
     for asset_name, asset_data in assetsPairs.items():
-        # logger.trace("L> Variable: process_asset_pairs(_ForLoop).asset_data:\n{}".format(json.dumps(asset_data, indent=4, default=str)))
+        logger.trace(
+            "L> Variable: process_asset_pairs(_ForLoop).asset_data:\n%s",
+            LazyJson(asset_data),
+        )
         await store_asset_pair(asset_name, asset_data, session)
 
     logger.flow1("Completed processing asset pairs.")
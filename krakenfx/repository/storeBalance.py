@@ -1,5 +1,3 @@
-import json
-
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -7,6 +5,7 @@ from krakenfx.di.logger_container import LoggerContainer
 from krakenfx.repository.models.balanceModel import ModelBalance as ORMBalance
 from krakenfx.services.account_data.schemas.balanceSchemas import SchemasAccountBalance
 from krakenfx.utils.errors import async_handle_errors
+from krakenfx.utils.logger import LazyJson
 
 logger = LoggerContainer().logger()
 
@@ -16,12 +15,11 @@ async def process_balance(Balances: SchemasAccountBalance, session: AsyncSession
     logger.info("Processing Balance")
 
     logger.trace(
-        "L> Variable: process_balance(_ForLoop).Balances:\n{}".format(
-            json.dumps(Balances.model_dump(), indent=4)
-        )
+        "L> Variable: process_balance(_ForLoop).Balances:\n%s",
+        LazyJson(Balances.model_dump),
     )
     for asset, amount in Balances.root.items():
-        logger.trace("L> Variable: process_balance(_ForLoop): {asset}:{amount}")
+        logger.trace("L> Variable: process_balance(_ForLoop): %s:%s", asset, amount)
         await store_balance(asset, amount, session)
 
     logger.flow1("Completed processing the last asset in Balances.")
@@ -39,8 +37,8 @@ async def store_balance(asset: str, amount: str, session: AsyncSession):
     if orm_balance:
         if getattr(orm_balance, amount) != amount:
             setattr(orm_balance, amount, amount)
-            logger.trace(f"L-> Balance Asset {asset} updated to {amount}")
-        logger.flow2(f"Updated Balance: {orm_balance}")
+            logger.trace("L-> Balance Asset %s updated to %s", asset, amount)
+        logger.flow2("Updated Balance: %s", orm_balance)
     else:
         orm_balance = ORMBalance(asset=asset, amount=amount)
         session.add(orm_balance)
@@ -1,98 +1,55 @@
 # krakenfx/scripts/fetch_ledgers.py
-import json
+from typing import Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.bulkOperations import bulk_upsert
 from krakenfx.repository.models.ledgerModel import ModelLedger as ORMLedger
+from krakenfx.repository.storeSyncState import newest_record, update_sync_cursor
 from krakenfx.services.account_data.schemas.ledgerSchemas import (
     SchemasLedger,
     SchemasLedgers,
 )
 from krakenfx.utils.errors import async_handle_errors
-from krakenfx.utils.utils import object_as_dict
+from krakenfx.utils.logger import LazyJson
 
 logger = LoggerContainer().logger()
 
 
 @async_handle_errors
-async def process_ledgers(Ledgers: SchemasLedgers, session: AsyncSession):
+async def process_ledgers(
+    Ledgers: SchemasLedgers, session: AsyncSession, update_cursor: bool = True
+):
+    """Store ledger entries, moving the sync cursor unless update_cursor is False."""
     logger.info("Processing ledgers.")
 
-    logger.trace(
-        "L> Variable: process_ledgers(_ForLoop).Ledgers:\n{}".format(
-            json.dumps(Ledgers, indent=4, default=str)
-        )
-    )
+    logger.trace("L> Variable: process_ledgers.Ledgers:\n%s", LazyJson(Ledgers))
+
+    # Write the whole batch with a single upsert per chunk of rows
+    rows = [
+        create_ledger_row(ledger_id, ledger) for ledger_id, ledger in Ledgers.items()
+    ]
+    inserted, updated = await bulk_upsert(session, ORMLedger, rows, ["id"])
+    logger.flow1(f"Ledgers stored: {inserted} created, {updated} updated.")
 
-    # Iterate all Ledgers
-    for ledger_id, ledger in Ledgers.items():
-        logger.trace(
-            "L> Variable: process_ledgers(_ForLoop).Ledger:\n{}".format(
-                json.dumps(ledger.model_dump(), indent=4, default=str)
-            )
+    # Record the newest ledger so the next run only requests newer entries
+    newest = newest_record(Ledgers)
+    if update_cursor and newest:
+        await update_sync_cursor(
+            "Ledgers", session, last_time=newest[0], last_id=newest[1]
         )
-        await store_ledger(ledger_id, ledger, session)
 
-    logger.flow1("Completed last ledger.")
-    # Commit the session after processing all orders
+    # Commit the session after processing all ledgers
     logger.info("Adding Ledgers to database.")
     await session.commit()
+    return inserted, updated
 
 
-@async_handle_errors
-async def store_ledger(ledger_id: str, ledger: SchemasLedger, session: AsyncSession):
-    logger.flow1(f"Processing Ledger ID: {ledger_id}")
-
-    # Check if the order exists
-    resultLedger = await session.execute(
-        select(ORMLedger).where(ORMLedger.id == ledger_id)
-    )
-    orm_ledger = resultLedger.scalar_one_or_none()
-
-    if orm_ledger:
-        logger.flow2(f"Ledger ID {ledger_id} found. Updating ledger.")
-
-        ledger_dict = ledger.model_dump()
-        for key, value in ledger_dict.items():
-            if getattr(orm_ledger, key) != value:
-                setattr(orm_ledger, key, value)
-                logger.trace(
-                    f"L-> Ledger ID {ledger_id} - Field {key} updated to {value}"
-                )
-
-        logger.flow2(f"Ledger ID {ledger_id} updated.")
-    else:
-        logger.flow2(f"Ledger ID {ledger_id} not found. Creating new order.")
-
-        # - Add order to session
-        orm_ledger: ORMLedger = await create_orm_ledger(ledger_id, ledger)
-        logger.trace(
-            "L-> Variable: process_orders().orm_ledger:\n{}".format(
-                json.dumps(object_as_dict(orm_ledger), indent=4, default=str)
-            )
-        )
-        logger.trace(
-            f"Table name of {orm_ledger.__class__.__name__}: {orm_ledger.__tablename__}"
-        )
-        logger.flow2(f"L-> Adding Ledger ID {orm_ledger.id} to session.")
-
-        logger.flow2(f"Ledger ID {ledger_id} created.")
-
-        session.add(orm_ledger)
-
-    await session.flush()
-    logger.flow1(f"L-> Finished processing ledger ID {ledger_id}.")
-
-
-@async_handle_errors
-async def create_orm_ledger(ledger_id: str, ledger: SchemasLedger) -> ORMLedger:
-    logger.flow2(f"L--> Create instance of ORM model ORMLedger for {ledger_id}.")
-    ledger_dict = ledger.model_dump(exclude_unset=True)
-
-    orm_ledger = ORMLedger(id=ledger_id, **ledger_dict)
-    return orm_ledger
+def create_ledger_row(ledger_id: str, ledger: SchemasLedger) -> Dict:
+    ledger_dict = ledger.model_dump()
+    logger.trace("L-> Variable: create_ledger_row().ledger:\n%s", LazyJson(ledger_dict))
+    return {"id": ledger_id, **ledger_dict}
 
 
 if __name__ == "__main__":
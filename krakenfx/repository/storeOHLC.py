@@ -0,0 +1,138 @@
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from krakenfx.di.database_container import DatabaseContainer
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.bulkOperations import bulk_upsert
+from krakenfx.repository.models.ohlcModel import (
+    ModelOHLCAssetPair,
+    ModelOHLCData,
+    ModelOHLCResult,
+)
+from krakenfx.repository.ohlcPartitions import ensure_ohlc_partitions
+from krakenfx.services.spot_market_data.schemas.ohlcSchemas import OHLCData, OHLCResult
+from krakenfx.utils.errors import async_handle_errors
+
+logger = LoggerContainer().logger()
+resample_cache = DatabaseContainer().ohlc_resample_cache()
+
+OHLC_KEY_COLUMNS = ["asset_pair_id", "interval", "time"]
+
+
+@async_handle_errors
+async def get_ohlc_asset_pair(
+    pair_name: str, session: AsyncSession
+) -> ModelOHLCAssetPair:
+    """Return the ohlc_asset_pairs row of a pair, creating it if needed."""
+    result = await session.execute(
+        select(ModelOHLCAssetPair).where(ModelOHLCAssetPair.name == pair_name)
+    )
+    orm_ohlc_asset_pair = result.scalar_one_or_none()
+    if orm_ohlc_asset_pair is None:
+        logger.flow2(f"OHLC asset pair {pair_name} not found. Creating it.")
+        orm_ohlc_asset_pair = ModelOHLCAssetPair(name=pair_name)
+        session.add(orm_ohlc_asset_pair)
+        await session.flush()
+    return orm_ohlc_asset_pair
+
+
+@async_handle_errors
+async def get_ohlc_since(
+    pair_name: str, interval: int, session: AsyncSession
+) -> Optional[int]:
+    """Return the stored `last` cursor of a pair and interval, None if never polled."""
+    result = await session.execute(
+        select(ModelOHLCResult.last)
+        .join(ModelOHLCAssetPair)
+        .where(
+            ModelOHLCAssetPair.name == pair_name,
+            ModelOHLCResult.interval == interval,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+@async_handle_errors
+async def process_ohlc(
+    interval: int,
+    OHLC: OHLCResult,
+    session: AsyncSession,
+    pair_name: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Store the candles returned by /0/public/OHLC and move the cursor.
+
+    New candles are inserted and the still open last candle, returned again
+    by the next poll, is updated in place. Unchanged candles are not rewritten.
+
+    Kraken answers with its own name of the requested pair (XXBTZUSD when
+    XBTUSD, the name of the OHLCVT files, is requested). When `pair_name` is
+    given the candles and cursor are stored under it, so the polled, imported
+    and backfilled candles of a pair form a single series.
+
+    Returns:
+        Tuple[int, int]: Number of inserted and updated candles.
+    """
+    # Partitions first: their DDL waits for the locks this transaction takes
+    # on ohlc_data and ohlc_asset_pairs, see ensure_ohlc_partitions
+    times = [candle.time for candles in OHLC.data.values() for candle in candles]
+    if times:
+        await ensure_ohlc_partitions(session.bind, min(times), max(times))
+
+    data = OHLC.data
+    if pair_name is not None:
+        data = {pair_name: [candle for candles in data.values() for candle in candles]}
+
+    inserted = updated = 0
+    asset_pair_ids = []
+    for pair_name, candles in data.items():
+        orm_ohlc_asset_pair = await get_ohlc_asset_pair(pair_name, session)
+        asset_pair_id = orm_ohlc_asset_pair.id
+        asset_pair_ids.append(asset_pair_id)
+
+        rows = [create_ohlc_row(asset_pair_id, interval, candle) for candle in candles]
+        if rows:
+            pair_inserted, pair_updated = await bulk_upsert(
+                session, ModelOHLCData, rows, OHLC_KEY_COLUMNS
+            )
+            inserted += pair_inserted
+            updated += pair_updated
+            logger.flow1(
+                f"OHLC {pair_name} {interval}m stored: {pair_inserted} created, "
+                f"{pair_updated} updated."
+            )
+
+        await update_ohlc_cursor(asset_pair_id, interval, OHLC.last, session)
+
+    logger.info("Adding OHLC candles to database.")
+    await session.commit()
+    # Resampled candles of these pairs are now stale
+    for asset_pair_id in asset_pair_ids:
+        resample_cache.invalidate(asset_pair_id)
+    return inserted, updated
+
+
+async def update_ohlc_cursor(
+    asset_pair_id: int, interval: int, last: int, session: AsyncSession
+):
+    result = await session.execute(
+        select(ModelOHLCResult).where(
+            ModelOHLCResult.asset_pair_id == asset_pair_id,
+            ModelOHLCResult.interval == interval,
+        )
+    )
+    orm_ohlc_result = result.scalar_one_or_none()
+    if orm_ohlc_result is None:
+        session.add(ModelOHLCResult(asset_pair_id, interval, last))
+    elif last > orm_ohlc_result.last:
+        orm_ohlc_result.last = last
+    await session.flush()
+
+
+def create_ohlc_row(asset_pair_id: int, interval: int, candle: OHLCData) -> Dict:
+    return {"asset_pair_id": asset_pair_id, "interval": interval, **candle.model_dump()}
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
@@ -1,5 +1,4 @@
 # krakenfx/scripts/fetch_open_positions.py
-import json
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -17,6 +16,7 @@ from krakenfx.services.account_data.schemas.openPositionSchemas import (
     SchemasOpenPositionReturn,
 )
 from krakenfx.utils.errors import async_handle_errors
+from krakenfx.utils.logger import LazyJson
 from krakenfx.utils.utils import object_as_dict
 
 logger = LoggerContainer().logger()
@@ -29,31 +29,25 @@ async def process_openPositions(
     logger.info("Processing Open Positions.")
 
     logger.trace(
-        "L> Variable: process_openPositions(_ForLoop).OpenPositionReturn\n{}".format(
-            json.dumps(OpenPositionReturn.openPositions, indent=4, default=str)
-        )
+        "L> Variable: process_openPositions(_ForLoop).OpenPositionReturn\n%s",
+        LazyJson(OpenPositionReturn.openPositions),
     )
     logger.trace(
-        "L> Variable: process_openPositions(_ForLoop).OpenPositionReturn\n{}".format(
-            json.dumps(
-                OpenPositionReturn.consolidatedOpenPositions, indent=4, default=str
-            )
-        )
+        "L> Variable: process_openPositions(_ForLoop).OpenPositionReturn\n%s",
+        LazyJson(OpenPositionReturn.consolidatedOpenPositions),
     )
     # Iterate open positions:
     for trade_id, openPosition in OpenPositionReturn.openPositions.items():
         logger.trace(
-            "L> Variable: process_openPositions(_ForLoop).OpenPosition\n{}".format(
-                json.dumps(openPosition.to_json(), indent=4, default=str)
-            )
+            "L> Variable: process_openPositions(_ForLoop).OpenPosition\n%s",
+            LazyJson(openPosition.to_json),
         )
         await store_openPosition(trade_id, openPosition, session)
 
     for ConsolidatedOpenPosition in OpenPositionReturn.consolidatedOpenPositions:
         logger.trace(
-            "L> Variable: process_openPositions(_ForLoop).ConsolidatedOpenPosition\n{}".format(
-                json.dumps(ConsolidatedOpenPosition.to_json(), indent=4, default=str)
-            )
+            "L> Variable: process_openPositions(_ForLoop).ConsolidatedOpenPosition\n%s",
+            LazyJson(ConsolidatedOpenPosition.to_json),
         )
         await store_consolidatedOpenPosition(ConsolidatedOpenPosition, session)
 
@@ -88,7 +82,10 @@ async def store_openPosition(
             ):
                 setattr(orm_openPosition, key, value)
                 logger.trace(
-                    f"L-> Open Position Trade ID {trade_id} - Field {key} updated to {value}"
+                    "L-> Open Position Trade ID %s - Field %s updated to %s",
+                    trade_id,
+                    key,
+                    value,
                 )
 
         logger.flow2(f"Open Position Trade ID {trade_id} updated.")
@@ -100,12 +97,13 @@ async def store_openPosition(
 
         orm_openPosition = await create_orm_openPosition(trade_id, openPosition)
         logger.trace(
-            "L-> Variable: store_openPosition().orm_openPosition:\n{}".format(
-                json.dumps(object_as_dict(orm_openPosition), indent=4, default=str)
-            )
+            "L-> Variable: store_openPosition().orm_openPosition:\n%s",
+            LazyJson(lambda: object_as_dict(orm_openPosition)),
         )
         logger.trace(
-            f"Table name of {orm_openPosition.__class__.__name__}: {orm_openPosition.__tablename__}"
+            "Table name of %s: %s",
+            orm_openPosition.__class__.__name__,
+            orm_openPosition.__tablename__,
         )
         logger.flow2(
             f"L-> Adding Open Position Trade ID {orm_openPosition.trade_id} to session."
@@ -159,7 +157,10 @@ async def store_consolidatedOpenPosition(
             ):
                 setattr(orm_ConsolidatedOpenPosition, key, value)
                 logger.trace(
-                    f"L-> Consolidated Open Position Pair {orm_ConsolidatedOpenPosition.pair} - Field {key} updated to {value}"
+                    "L-> Consolidated Open Position Pair %s - Field %s updated to %s",
+                    orm_ConsolidatedOpenPosition.pair,
+                    key,
+                    value,
                 )
 
         logger.flow2(
@@ -175,14 +176,13 @@ async def store_consolidatedOpenPosition(
             consolidatedOpenPosition
         )
         logger.trace(
-            "L-> Variable: store_openPosition().orm_consolidatedOpenPosition:\n{}".format(
-                json.dumps(
-                    object_as_dict(orm_consolidatedOpenPosition), indent=4, default=str
-                )
-            )
+            "L-> Variable: store_openPosition().orm_consolidatedOpenPosition:\n%s",
+            LazyJson(lambda: object_as_dict(orm_consolidatedOpenPosition)),
         )
         logger.trace(
-            f"Table name of {orm_consolidatedOpenPosition.__class__.__name__}: {orm_consolidatedOpenPosition.__tablename__}"
+            "Table name of %s: %s",
+            orm_consolidatedOpenPosition.__class__.__name__,
+            orm_consolidatedOpenPosition.__tablename__,
         )
         logger.flow2(
             f"L-> Adding Consolidated Open Position Pair {orm_consolidatedOpenPosition.pair} to session."
@@ -1,15 +1,17 @@
-import json
-from typing import List
+from collections import defaultdict
+from typing import Dict, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.bulkOperations import bulk_upsert
 from krakenfx.repository.models.OrderModel import ModelOrders as ORMOrder
 from krakenfx.repository.models.OrderModel import (
     ModelOrdersDescription as ORMOrderDescription,
 )
 from krakenfx.repository.models.tradesModel import ModelTradeInfo as ORMTradeInfo
+from krakenfx.repository.storeSyncState import newest_record, update_sync_cursor
 from krakenfx.services.account_data.queryTradesService import get_queryTrades
 from krakenfx.services.account_data.schemas.OrderSchemas import (
     SchemasOrder,
@@ -23,7 +25,7 @@ from krakenfx.utils.errors import (
     KrakenInvalidResponseStructureException,
     async_handle_errors,
 )
-from krakenfx.utils.utils import object_as_dict
+from krakenfx.utils.logger import LazyJson
 
 app_container = AppContainer()
 
@@ -31,29 +33,57 @@ logger = app_container.logger_container().logger()
 
 
 @async_handle_errors
-async def process_orders(Orders: SchemasOrdersResult, session: AsyncSession):
+async def process_orders(
+    Orders: SchemasOrdersResult, session: AsyncSession, update_cursor: bool = True
+):
+    """Store orders, moving the ClosedOrders cursor unless update_cursor is False.
+
+    Only the fields Kraken returned for an order are written (exclude_unset), an
+    optional field missing from the response keeps the value a previous sync
+    stored instead of being cleared. An upsert statement sends the same columns
+    for every row, so the orders are grouped by their set of fields and each
+    group gets its own statement(s). Padding the missing fields with None would
+    merge the groups but overwrite those stored values. A response usually holds
+    one or two sets of fields (open and closed orders).
+    """
     logger.info("Processing Orders.")
 
-    logger.trace(
-        "L> Variable: process_orders(_ForLoop).Orders:\n{}".format(
-            json.dumps(Orders, indent=4, default=str)
-        )
-    )
+    logger.trace("L> Variable: process_orders.Orders:\n%s", LazyJson(Orders))
 
-    # Iterate all Orders
+    descr_rows = []
+    order_rows = []
     for order_id, Order in Orders.items():
-        logger.trace(
-            "L> Variable: process_orders(_ForLoop).Orders:\n{}".format(
-                json.dumps(Order.model_dump(), indent=4, default=str)
-            )
-        )
         await check_Order_has_descr(order_id, Order)
-        await store_Order(order_id, Order, session)
+        descr_rows.append(create_Order_descr_row(order_id, Order.descr))
+        order_rows.append(create_Order_row(order_id, Order))
+
+    # Descriptions first, orders reference them through descr_id
+    descr_inserted, descr_updated = await bulk_upsert(
+        session, ORMOrderDescription, descr_rows, ["id"]
+    )
+    logger.flow1(
+        f"Order descriptions stored: {descr_inserted} created, {descr_updated} updated."
+    )
+    # One upsert per set of fields, see the docstring
+    rows_by_columns = defaultdict(list)
+    for row in order_rows:
+        rows_by_columns[tuple(row)].append(row)
+    inserted = updated = 0
+    for rows in rows_by_columns.values():
+        rows_inserted, rows_updated = await bulk_upsert(session, ORMOrder, rows, ["id"])
+        inserted += rows_inserted
+        updated += rows_updated
+    logger.flow1(f"Orders stored: {inserted} created, {updated} updated.")
+
+    # Record the newest close time so the next run only requests newer closed orders
+    newest = newest_record(Orders, "closetm")
+    if update_cursor and newest:
+        await update_sync_cursor("ClosedOrders", session, last_time=newest[0])
 
-    logger.flow1("Completed last order ")
     # Commit the session after processing all orders
     logger.info("Adding Orders to database.")
     await session.commit()
+    return inserted, updated
 
 
 @async_handle_errors
@@ -64,118 +94,16 @@ async def check_Order_has_descr(order_id: str, Order: SchemasOrder):
         )
 
 
-@async_handle_errors
-async def store_Order(order_id: str, Order: SchemasOrder, session: AsyncSession):
-    logger.flow1(f"Processing Order ID: {order_id}")
-
-    # Check if the order exists
-    resultOrder = await session.execute(select(ORMOrder).where(ORMOrder.id == order_id))
-    orm_order = resultOrder.scalar_one_or_none()
-
-    resultOrderDesc = await session.execute(
-        select(ORMOrderDescription).where(ORMOrderDescription.id == order_id)
-    )
-    orm_order_descr = resultOrderDesc.scalar_one_or_none()
+def create_Order_descr_row(order_id: str, Order_descr: SchemasOrderDescription) -> Dict:
+    return {"id": order_id, **Order_descr.model_dump()}
 
-    if orm_order and orm_order_descr:
-        # Order exists, update only the order fields that are different
-        logger.flow2(f"Order ID {order_id} found. Updating order.")
 
-        order_dict = Order.model_dump()
-        order_descr: SchemasOrderDescription = order_dict.pop("descr", None)
-        order_descr_dict = order_descr.model_dump()
-
-        for key, value in order_dict.items():
-            if getattr(orm_order, key) != value:
-                setattr(orm_order, key, value)
-                logger.trace(
-                    f"L-> Order ID {order_id} - Field {key} updated to {value}"
-                )
-
-        for key, value in order_descr_dict.items():
-            if getattr(orm_order_descr, key) != value:
-                setattr(orm_order_descr, key, value)
-                logger.trace(
-                    f"L-> Order Description ID {orm_order_descr.id} - Field {key} updated to {value}"
-                )
-        logger.flow2(f"Order ID {order_id} updated.")
-
-        # Validate relations dependencies
-        # if Order.trades:
-        #     await update_order_trades(order_id, Order.trades, orm_order, session)
-        #     logger.flow2(f"Trades ID {Order.trades} updated.")
-    else:
-        # Order doesn't exist, create a new order
-        logger.flow2(f"Order ID {order_id} not found. Creating new order.")
-
-        # - Add order description to session
-        orm_OrderDescr: ORMOrderDescription = await create_orm_Order_desc(
-            order_id, Order.descr
-        )
-        logger.trace(
-            "L-> Variable: store_Order().orm_OrderDescr:\n{}".format(
-                json.dumps(object_as_dict(orm_OrderDescr), indent=4, default=str)
-            )
-        )
-        logger.trace(
-            f"Table name of {orm_OrderDescr.__class__.__name__}: {orm_OrderDescr.__tablename__}"
-        )
-        logger.flow2(f"L-> Adding Order Description ID {orm_OrderDescr.id} to session.")
-
-        # - Add order to session
-        orm_Order: ORMOrder = await create_orm_Order_withoutDescr(
-            order_id, Order, orm_OrderDescr
-        )
-        logger.trace(
-            "L-> Variable: process_orders().orm_Order:\n{}".format(
-                json.dumps(object_as_dict(orm_Order), indent=4, default=str)
-            )
-        )
-        logger.trace(
-            f"Table name of {orm_Order.__class__.__name__}: {orm_Order.__tablename__}"
-        )
-        logger.flow2(f"L-> Adding Order ID {orm_Order.id} to session.")
-
-        session.add(orm_OrderDescr)
-        session.add(orm_Order)
-
-        # Validate relations dependencies
-        # if Order.trades:
-        #     await update_order_trades(order_id, Order.trades, orm_Order, session)
-        #     logger.flow2(f"Order ID {order_id} created.")
-    await session.flush()
-    logger.flow1(f"L-> Finished processing orders ID {order_id}.")
-
-
-@async_handle_errors
-async def create_orm_Order_desc(
-    order_id: str, Order_descr: SchemasOrderDescription
-) -> ORMOrderDescription:
-    logger.flow2(
-        f"L--> Create instance of ORM model ORMOrderDescription for {order_id}."
-    )
-    Order_descr_dict = Order_descr.model_dump()
-    orm_OrderDescr = ORMOrderDescription(id=order_id, **Order_descr_dict)
-    return orm_OrderDescr
-
-
-@async_handle_errors
-async def create_orm_Order_withoutDescr(
-    order_id: str, Order: SchemasOrder, orm_OrderDescr: ORMOrderDescription
-) -> ORMOrder:
-    logger.flow2(f"L--> Create instance of ORM model ORMOrder for {order_id}.")
-    Order_dict = Order.model_dump(exclude_unset=True)
-    if "descr" in Order_dict:
-        del Order_dict[
-            "descr"
-        ]  # Need to remove the descr dict() descr from the schemas in preparation to ORM
-    if "trades" in Order_dict:
-        del Order_dict[
-            "trades"
-        ]  # Need to remove the trades list() trades from the schemas in preparation to ORM
-
-    orm_Order = ORMOrder(id=order_id, descr_id=orm_OrderDescr.id, **Order_dict)
-    return orm_Order
+def create_Order_row(order_id: str, Order: SchemasOrder) -> Dict:
+    # descr is stored in its own table and trades through the association table
+    # Unset fields are left out so they don't overwrite the stored values
+    Order_dict = Order.model_dump(exclude_unset=True, exclude={"descr", "trades"})
+    logger.trace("L-> Variable: create_Order_row().Order:\n%s", LazyJson(Order_dict))
+    return {"id": order_id, "descr_id": order_id, **Order_dict}
 
 
 @async_handle_errors
@@ -0,0 +1,68 @@
+from typing import Dict, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.bulkOperations import bulk_upsert
+from krakenfx.repository.models.recentTradesModel import ModelRecentTrade
+from krakenfx.repository.storeSyncState import update_sync_cursor
+from krakenfx.services.spot_market_data.schemas.recentTradesSchemas import (
+    SchemasRecentTradesResponse,
+    SchemasTradeEntry,
+)
+from krakenfx.utils.errors import async_handle_errors
+from krakenfx.utils.logger import LazyJson
+
+logger = LoggerContainer().logger()
+
+
+@async_handle_errors
+async def process_recent_trades(
+    pair: str, Trades: SchemasRecentTradesResponse, session: AsyncSession
+) -> Tuple[int, int]:
+    """Store the public trades of `pair` and move its 'Trades' cursor to `last`.
+
+    Rows are stored under the pair name the trades were requested for, Kraken
+    may answer with another name of the same pair.
+    """
+    logger.trace("L> Variable: process_recent_trades.Trades:\n%s", LazyJson(Trades))
+
+    rows = [
+        create_recent_trade_row(pair, trade)
+        for trades in Trades.result.values()
+        for trade in trades
+    ]
+    inserted, updated = await bulk_upsert(
+        session, ModelRecentTrade, rows, ["pair", "trade_id"]
+    )
+    logger.flow1(f"Recent trades {pair} stored: {inserted} created, {updated} updated.")
+
+    # The next poll only requests the trades newer than `last`
+    if rows and Trades.last:
+        await update_sync_cursor(
+            "Trades",
+            session,
+            last_time=max(row["time"] for row in rows),
+            last_id=Trades.last,
+            scope=pair,
+        )
+
+    await session.commit()
+    return inserted, updated
+
+
+def create_recent_trade_row(pair: str, trade: SchemasTradeEntry) -> Dict:
+    return {
+        "pair": pair,
+        "trade_id": trade.trade_id,
+        "price": trade.price,
+        "volume": trade.volume,
+        "time": trade.time,
+        "type": trade.type,
+        "order_type": trade.order_type,
+        "miscellaneous": trade.miscellaneous,
+    }
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
@@ -0,0 +1,64 @@
+from typing import Dict, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.bulkOperations import bulk_upsert
+from krakenfx.repository.models.spreadsModel import ModelSpread
+from krakenfx.repository.storeSyncState import update_sync_cursor
+from krakenfx.services.spot_market_data.schemas.spreadsSchemas import (
+    SchemasGetRecentSpreadsResponse,
+    SchemasSpread,
+)
+from krakenfx.utils.errors import async_handle_errors
+from krakenfx.utils.logger import LazyJson
+
+logger = LoggerContainer().logger()
+
+
+@async_handle_errors
+async def process_spreads(
+    pair: str, Spreads: SchemasGetRecentSpreadsResponse, session: AsyncSession
+) -> Tuple[int, int]:
+    """Store the spreads of `pair` and move its 'Spread' cursor to `last`.
+
+    Rows are stored under the pair name the spreads were requested for, Kraken
+    may answer with another name of the same pair.
+    """
+    logger.trace("L> Variable: process_spreads.Spreads:\n%s", LazyJson(Spreads))
+
+    # Kraken can return several spreads within the same second, the last one
+    # is kept as a single statement cannot update the same row twice
+    rows = {
+        spread.timestamp: create_spread_row(pair, spread)
+        for key, spreads in Spreads.result.items()
+        if key != "last"
+        for spread in spreads
+    }
+    inserted, updated = await bulk_upsert(
+        session, ModelSpread, list(rows.values()), ["pair", "timestamp"]
+    )
+    logger.flow1(f"Spreads {pair} stored: {inserted} created, {updated} updated.")
+
+    # The next poll only requests the spreads newer than `last`
+    last = Spreads.result.get("last")
+    if rows and last:
+        await update_sync_cursor(
+            "Spread", session, last_time=max(rows), last_id=str(last), scope=pair
+        )
+
+    await session.commit()
+    return inserted, updated
+
+
+def create_spread_row(pair: str, spread: SchemasSpread) -> Dict:
+    return {
+        "pair": pair,
+        "timestamp": spread.timestamp,
+        "bid": spread.bid,
+        "ask": spread.ask,
+    }
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
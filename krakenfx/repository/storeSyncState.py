@@ -0,0 +1,90 @@
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.models.syncStateModel import ModelSyncState as ORMSyncState
+from krakenfx.utils.errors import async_handle_errors
+
+logger = LoggerContainer().logger()
+
+
+@async_handle_errors
+async def get_sync_cursor(
+    endpoint: str, session: AsyncSession, scope: str = ""
+) -> Optional[ORMSyncState]:
+    result = await session.execute(
+        select(ORMSyncState).where(
+            ORMSyncState.endpoint == endpoint, ORMSyncState.scope == scope
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+@async_handle_errors
+async def get_sync_start(
+    endpoint: str, session: AsyncSession, scope: str = ""
+) -> Optional[Union[str, float]]:
+    """Return the value to send as 'start'/'since' to only fetch new records.
+
+    The record ID is preferred as Kraken treats it as an exclusive bound, the
+    timestamp is used for endpoints that only store a time cursor.
+    """
+    orm_syncState = await get_sync_cursor(endpoint, session, scope)
+    if orm_syncState is None:
+        logger.flow2(f"No sync cursor for {endpoint} {scope}, full synchronisation.")
+        return None
+    if orm_syncState.last_id is not None:
+        return orm_syncState.last_id
+    return orm_syncState.last_time
+
+
+@async_handle_errors
+async def update_sync_cursor(
+    endpoint: str,
+    session: AsyncSession,
+    last_time: float = None,
+    last_id: str = None,
+    scope: str = "",
+):
+    """Move the cursor forward, older values (e.g. from a backfill) are ignored."""
+    orm_syncState = await get_sync_cursor(endpoint, session, scope)
+
+    if orm_syncState is None:
+        orm_syncState = ORMSyncState(endpoint=endpoint, scope=scope)
+        session.add(orm_syncState)
+    elif (
+        last_time is not None
+        and orm_syncState.last_time is not None
+        and last_time < orm_syncState.last_time
+    ):
+        logger.flow2(
+            f"Sync cursor {endpoint} {scope} is ahead of {last_time}, not updated."
+        )
+        return
+
+    orm_syncState.last_time = last_time
+    orm_syncState.last_id = last_id
+    orm_syncState.updated_at = time.time()
+    await session.flush()
+    logger.flow1(
+        f"Sync cursor {endpoint} {scope} moved to time={last_time} id={last_id}."
+    )
+
+
+def newest_record(
+    records: Dict[str, Any], time_field: str = "time"
+) -> Optional[Tuple[float, str]]:
+    """(time, id) of the most recent record of a batch, None if none has a time."""
+    stamped = [
+        (getattr(record, time_field), record_id)
+        for record_id, record in records.items()
+        if getattr(record, time_field, None)
+    ]
+    return max(stamped) if stamped else None
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
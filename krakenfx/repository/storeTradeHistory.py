@@ -1,77 +1,75 @@
 # krakenfx/scripts/fetch_trade_history.py
-import json
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.repository.bulkOperations import fetch_existing_by_ids
 from krakenfx.repository.models.tradesModel import ModelTradeInfo as ORMTradeInfo
+from krakenfx.repository.storeSyncState import newest_record, update_sync_cursor
 from krakenfx.services.account_data.schemas.tradesSchemas import (
     SchemasTradeInfo,
     SchemasTradesReturn,
 )
 from krakenfx.utils.errors import async_handle_errors
-from krakenfx.utils.utils import object_as_dict
+from krakenfx.utils.logger import LazyJson
 
 logger = LoggerContainer().logger()
 
 
 @async_handle_errors
-async def process_tradeHistory(Trades: SchemasTradesReturn, session: AsyncSession):
+async def process_tradeHistory(
+    Trades: SchemasTradesReturn, session: AsyncSession, update_cursor: bool = True
+):
+    """Store trades, moving the sync cursor unless update_cursor is False."""
     logger.info("Processing trades history.")
 
+    # Load every known trade of the batch at once instead of one SELECT per trade
+    existing = await fetch_existing_by_ids(session, ORMTradeInfo, Trades.keys())
+
+    new_tradeInfos = []
+    updated = 0
     for trade_id, Trade in Trades.items():
         logger.trace(
-            "L> Variable: process_tradeHistory(_ForLoop).Trades:\n{}".format(
-                json.dumps(Trade.model_dump(), indent=4, default=str)
-            )
+            "L> Variable: process_tradeHistory(_ForLoop).Trades:\n%s",
+            LazyJson(Trade.model_dump),
         )
-        await store_trade(trade_id, Trade, session)
-
-    logger.flow1("Completed last order ")
-    logger.info("Adding Trades to database.")
-    await session.commit()
+        orm_tradeInfo = existing.get(trade_id)
+        if orm_tradeInfo is None:
+            new_tradeInfos.append(await create_orm_tradeInfo(trade_id, Trade))
+        elif update_orm_tradeInfo(orm_tradeInfo, Trade):
+            updated += 1
 
+    session.add_all(new_tradeInfos)
+    await session.flush()
+    logger.flow1(f"Trades stored: {len(new_tradeInfos)} created, {updated} updated.")
 
-async def store_trade(trade_id: str, trade: SchemasTradeInfo, session: AsyncSession):
-    logger.flow1(f"Processing Trade ID: {trade_id}")
-
-    resultTradeInfo = await session.execute(
-        select(ORMTradeInfo).where(ORMTradeInfo.id == trade_id)
-    )
-    orm_tradeInfo = resultTradeInfo.scalar_one_or_none()
-
-    if orm_tradeInfo:
-        # Trade History exists, update only the trade fields that are different
-        logger.flow2(f"Trade ID {trade_id} found. Updating trade.")
+    # Record the newest trade so the next run only requests newer trades
+    newest = newest_record(Trades)
+    if update_cursor and newest:
+        await update_sync_cursor(
+            "TradesHistory", session, last_time=newest[0], last_id=newest[1]
+        )
 
-        trade_dict = trade.model_dump()
-        for key, value in trade_dict.items():
-            if hasattr(orm_tradeInfo, key) and getattr(orm_tradeInfo, key) != value:
-                setattr(orm_tradeInfo, key, value)
-                logger.trace(
-                    f"L-> TradeInfo ID {orm_tradeInfo.tradeinfo_id} - Field {key} updated to {value}"
-                )
+    logger.info("Adding Trades to database.")
+    await session.commit()
+    return len(new_tradeInfos), updated
 
-        logger.flow2(f"Trade ID {trade_id} updated.")
-    else:
-        # Trade doesn't exist, create new trade
-        logger.flow2(f"Trade ID {trade_id} not found. Creating new trade.")
 
-        orm_tradeInfo = await create_orm_tradeInfo(trade_id, trade)
-        logger.trace(
-            "L-> Variable: store_trade().orm_tradeInfo:\n{}".format(
-                json.dumps(object_as_dict(orm_tradeInfo), indent=4, default=str)
+def update_orm_tradeInfo(orm_tradeInfo: ORMTradeInfo, trade: SchemasTradeInfo) -> bool:
+    """Copy the fields that changed onto an existing trade, return True if any did."""
+    changed = False
+    trade_dict = trade.model_dump()
+    for key, value in trade_dict.items():
+        if hasattr(orm_tradeInfo, key) and getattr(orm_tradeInfo, key) != value:
+            setattr(orm_tradeInfo, key, value)
+            changed = True
+            logger.trace(
+                "L-> TradeInfo ID %s - Field %s updated to %s",
+                orm_tradeInfo.id,
+                key,
+                value,
             )
-        )
-        logger.trace(
-            f"Table name of {orm_tradeInfo.__class__.__name__}: {orm_tradeInfo.__tablename__}"
-        )
-        logger.flow2(f"L-> Adding TradeInfo ID {orm_tradeInfo.id} to session.")
-        session.add(orm_tradeInfo)
-
-    await session.flush()
-    logger.flow1(f"L-> Finished processing Trade ID {trade_id}.")
+    return changed
 
 
 async def create_orm_tradeInfo(trade_id: str, trade: SchemasTradeInfo) -> ORMTradeInfo:
@@ -0,0 +1,80 @@
+# krakenfx/scripts/benchmark_trace_logging.py
+"""Per-row cost of the trace logging of the repository loops.
+
+Compares the former eager calls (json.dumps inside str.format) with the lazy
+%-style LazyJson calls, with TRACE disabled (INFO) and enabled.
+
+Usage: python -m krakenfx.scripts.benchmark_trace_logging [-n ROWS]
+"""
+import argparse
+import json
+import logging
+import os
+import timeit
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.utils.logger import LazyJson
+
+TRACE_LEVEL_NUM = 5
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "refid": f"TJKLXX-{i:06d}",
+            "time": 1688671200.1234 + i,
+            "type": "trade",
+            "subtype": "",
+            "aclass": "currency",
+            "asset": "ZUSD",
+            "amount": "-24.5000",
+            "fee": "0.0490",
+            "balance": "459567.9171",
+        }
+        for i in range(count)
+    ]
+
+
+def eager(logger: logging.Logger, rows: list):
+    for row in rows:
+        logger.trace(
+            "L-> Variable: create_ledger_row().ledger:\n{}".format(
+                json.dumps(row, indent=4, default=str)
+            )
+        )
+
+
+def lazy(logger: logging.Logger, rows: list):
+    for row in rows:
+        logger.trace("L-> Variable: create_ledger_row().ledger:\n%s", LazyJson(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trace logging")
+    parser.add_argument("-n", "--rows", type=int, default=10000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Installs the trace/flow1/flow2 levels
+    LoggerContainer().logger()
+    logger = logging.getLogger("benchmark_trace_logging")
+    logger.propagate = False
+    devnull = open(os.devnull, "w")
+    logger.addHandler(logging.StreamHandler(devnull))
+
+    rows = make_rows(args.rows)
+    for level_name, level in (("INFO", logging.INFO), ("TRACE", TRACE_LEVEL_NUM)):
+        logger.setLevel(level)
+        for name, func in (("eager", eager), ("lazy", lazy)):
+            best = min(
+                timeit.repeat(lambda: func(logger, rows), number=1, repeat=args.repeat)
+            )
+            print(
+                f"{level_name:5} {name:5}: {best * 1e9 / args.rows:10.0f} ns/row "
+                f"({best * 1e3:.1f} ms for {args.rows} rows)"
+            )
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
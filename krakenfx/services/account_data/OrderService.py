@@ -3,12 +3,13 @@ import json
 import logging
 import time
 import urllib.parse
+from typing import AsyncIterator, Dict, Union
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
 from krakenfx.services.account_data.schemas.OrderSchemas import (
+    SchemasOrder,
     SchemasOrdersResponse,
     SchemasOrdersResult,
 )
@@ -21,16 +22,26 @@ from krakenfx.utils.errors import (
     KrakenNoItemsReturnedException,
     async_handle_errors,
 )
+from krakenfx.utils.pagination import iter_offset_pages
 from krakenfx.utils.utils import generate_api_signature
 from krakenfx.utils.validations import (
     check_response_errors,
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
-async def get_Orders(settings: Settings, order_status: str):
-    nonce = int(time.time() * 1000)
+async def fetch_Orders(
+    settings: Settings,
+    order_status: str,
+    start: Union[int, float, str] = None,
+    end: Union[int, float, str] = None,
+    ofs: int = None,
+) -> SchemasOrdersResponse:
     match order_status:
         case "open":
             urlpath = "/0/private/OpenOrders"
@@ -42,22 +53,75 @@ async def get_Orders(settings: Settings, order_status: str):
             )
 
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {"nonce": nonce, "trades": True}
+
+    # Only closed orders can be filtered, on their close time, and paginated
+    if order_status == "closed":
+        if start is not None or end is not None:
+            data["closetime"] = "close"
+        if start is not None:
+            data["start"] = start
+        if end is not None:
+            data["end"] = end
+        if ofs:
+            data["ofs"] = ofs
+
     headers = {
         "API-Key": settings.KRAKEN_API_KEY,
         "API-Sign": generate_api_signature(urlpath, data, settings.KRAKEN_API_SECRET),
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
-
-        await check_response_errors(response.json())
-        OrdersResponse = SchemasOrdersResponse(**response.json())
-        await check_schemasResponse_empty(OrdersResponse, order_status)
-        Orders: SchemasOrdersResult = getattr(OrdersResponse.result, order_status)
-        return Orders
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
+
+    await check_response_errors(response.json())
+    OrdersResponse = SchemasOrdersResponse(**response.json())
+    return OrdersResponse
+
+
+@async_handle_errors
+async def get_Orders(
+    settings: Settings, order_status: str, start: Union[int, float, str] = None
+):
+    OrdersResponse = await fetch_Orders(settings, order_status, start)
+    await check_schemasResponse_empty(OrdersResponse, order_status)
+    Orders: SchemasOrdersResult = getattr(OrdersResponse.result, order_status)
+    return Orders
+
+
+async def iter_closedOrders(
+    settings: Settings,
+    start: Union[int, float, str] = None,
+    end: Union[int, float, str] = None,
+    concurrency: int = 1,
+) -> AsyncIterator[Dict[str, SchemasOrder]]:
+    """Yield all orders closed between 'start' and 'end', one page at a time.
+
+    ClosedOrders returns 50 orders per call, the remaining ones are fetched
+    with 'ofs'. 'end' is pinned to the current time when omitted so orders
+    closing during the run do not shift the offsets of the pages still to fetch.
+    Pages are fetched one at a time by default: concurrent pages may deliver
+    nonces out of order, the API key needs a nonce window when 'concurrency'
+    is greater than 1.
+    """
+    if end is None:
+        end = int(time.time())
+
+    async def fetch_page(ofs: int) -> SchemasOrdersResponse:
+        return await fetch_Orders(settings, "closed", start, end, ofs)
+
+    async for orders in iter_offset_pages(
+        fetch_page,
+        get_items=lambda page: page.result.closed,
+        get_count=lambda page: page.result.count,
+        concurrency=concurrency,
+    ):
+        yield orders
 
 
 async def main(settings: Settings, logger: logging.Logger, order_status: str):
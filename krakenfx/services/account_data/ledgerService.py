@@ -4,8 +4,8 @@ import json
 import logging
 import time
 import urllib.parse
+from typing import AsyncIterator, Union
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -21,36 +21,94 @@ from krakenfx.utils.errors import (
     KrakenNoItemsReturnedException,
     async_handle_errors,
 )
+from krakenfx.utils.pagination import iter_offset_pages
 from krakenfx.utils.utils import generate_api_signature
 from krakenfx.utils.validations import (
     check_response_errors,
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
-async def get_ledgers(settings: Settings):
-    nonce = int(time.time() * 1000)
+async def fetch_ledgers(
+    settings: Settings,
+    start: Union[int, str] = None,
+    end: Union[int, str] = None,
+    ofs: int = None,
+) -> SchemasLedgerResponse:
     urlpath = "/0/private/Ledgers"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {"nonce": nonce}
+
+    # 'start' and 'end' accept a unix timestamp or a ledger ID
+    if start is not None:
+        data["start"] = start
+    if end is not None:
+        data["end"] = end
+    if ofs:
+        data["ofs"] = ofs
+
     headers = {
         "API-Key": settings.KRAKEN_API_KEY,
         "API-Sign": generate_api_signature(urlpath, data, settings.KRAKEN_API_SECRET),
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
+
+    await check_response_errors(response.json())
+    ledgerResponse = SchemasLedgerResponse(**response.json())
+    return ledgerResponse
+
+
+@async_handle_errors
+async def get_ledgers(
+    settings: Settings, start: Union[int, str] = None, end: Union[int, str] = None
+):
+    ledgerResponse: SchemasLedgerResponse = await fetch_ledgers(settings, start, end)
+    await check_schemasResponse_empty(ledgerResponse, "ledger")
+    ledgersReturn: SchemasLedgers = ledgerResponse.result.ledger
+
+    return ledgersReturn
+
+
+async def iter_ledgers(
+    settings: Settings,
+    start: Union[int, str] = None,
+    end: Union[int, str] = None,
+    concurrency: int = 1,
+) -> AsyncIterator[SchemasLedgers]:
+    """Yield all ledger entries between 'start' and 'end', one page at a time.
+
+    'end' is pinned to the current time when omitted so entries booked during
+    the backfill do not shift the offsets of the pages still to fetch.
+    Pages are fetched one at a time by default: concurrent pages may deliver
+    nonces out of order, the API key needs a nonce window when 'concurrency'
+    is greater than 1.
+    """
+    if end is None:
+        end = int(time.time())
 
-        await check_response_errors(response.json())
-        ledgerResponse = SchemasLedgerResponse(**response.json())
-        await check_schemasResponse_empty(ledgerResponse, "ledger")
-        ledgersReturn: SchemasLedgers = ledgerResponse.result.ledger
+    async def fetch_page(ofs: int) -> SchemasLedgerResponse:
+        return await fetch_ledgers(settings, start, end, ofs)
 
-        return ledgersReturn
+    async for ledgers in iter_offset_pages(
+        fetch_page,
+        get_items=lambda page: page.result.ledger,
+        get_count=lambda page: page.result.count,
+        concurrency=concurrency,
+    ):
+        yield ledgers
 
 
 async def main(settings: Settings, logger: logging.Logger):
@@ -2,10 +2,8 @@
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -29,14 +27,21 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def fetch_openPositions(
     settings: Settings, docalcs: bool = False, consolidation: str = None
 ):
-    nonce = int(time.time() * 1000)
     urlpath = "/0/private/OpenPositions"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
+
     # Base data dictionary
     data = {
         "nonce": nonce,
@@ -58,15 +63,15 @@ async def fetch_openPositions(
         "API-Key": settings.KRAKEN_API_KEY,
         "API-Sign": generate_api_signature(urlpath, data, settings.KRAKEN_API_SECRET),
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        openPositionResponse = SchemasOpenPositionResponse(**response.json())
-        return openPositionResponse
+    await check_response_errors(response.json())
+    openPositionResponse = SchemasOpenPositionResponse(**response.json())
+    return openPositionResponse
 
 
 @async_handle_errors
@@ -81,7 +86,7 @@ async def get_openPositions(
 
     # Consolidated view
     openConsolidatedPositionResponse: SchemasOpenPositionResponse = (
-        await fetch_openPositions(docalcs=True, consolidation="market")
+        await fetch_openPositions(settings, docalcs=True, consolidation="market")
     )
     await check_schemasResponse_empty(openConsolidatedPositionResponse)
     ConsolidatedopenPositions: SchemasConsolidatedOpenPositions = (
@@ -3,10 +3,8 @@ import argparse
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -27,30 +25,36 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def get_queryLedgers(settings: Settings, ledger_id: str):
-    nonce = int(time.time() * 1000)
     urlpath = "/0/private/QueryLedgers"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {"nonce": nonce, "id": ledger_id}
     headers = {
         "API-Key": settings.KRAKEN_API_KEY,
         "API-Sign": generate_api_signature(urlpath, data, settings.KRAKEN_API_SECRET),
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        ledgerResponse = SchemasLedgerQueryResponse(**response.json())
-        await check_schemasResponse_empty(ledgerResponse)
-        ledgerResult = ledgerResponse.result
+    await check_response_errors(response.json())
+    ledgerResponse = SchemasLedgerQueryResponse(**response.json())
+    await check_schemasResponse_empty(ledgerResponse)
+    ledgerResult = ledgerResponse.result
 
-        return ledgerResult
+    return ledgerResult
 
 
 async def main(settings: Settings, logger: logging.Logger):
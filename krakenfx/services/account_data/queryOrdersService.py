@@ -2,11 +2,9 @@ import argparse
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 from typing import List, Optional
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -27,6 +25,10 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def get_queryTrades(
@@ -36,9 +38,11 @@ async def get_queryTrades(
     userref: Optional[int] = None,
     consolidate_taker: bool = False,
 ):
-    nonce = int(time.time() * 1000)
     urlpath = "/0/private/QueryOrders"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     txid_str = ",".join(order_ids)
     data = {
         "nonce": nonce,
@@ -55,17 +59,17 @@ async def get_queryTrades(
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        queryTradesResponse = SchemasQueryOrdersResponse(**response.json())
-        await check_schemasResponse_empty(queryTradesResponse)
+    await check_response_errors(response.json())
+    queryTradesResponse = SchemasQueryOrdersResponse(**response.json())
+    await check_schemasResponse_empty(queryTradesResponse)
 
-        return queryTradesResponse.result
+    return queryTradesResponse.result
 
 
 async def main(settings: Settings, logger: logging.Logger):
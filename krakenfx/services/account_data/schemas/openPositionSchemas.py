@@ -96,7 +96,8 @@ class SchemasOpenPositionResponse(BaseModel):
     ]  # Dictionary of open positions or list of consolidated open positions.
 
     @field_validator("result", mode="before")
-    def validate_result(self, v):
+    @classmethod
+    def validate_result(cls, v):
         if isinstance(v, dict):
             return v  # It's an individual positions response
         elif isinstance(v, list):
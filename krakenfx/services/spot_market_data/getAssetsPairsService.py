@@ -3,10 +3,8 @@ import argparse
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 
-import httpx
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -27,12 +25,18 @@ from krakenfx.utils.errors import (
 from krakenfx.utils.utils import generate_api_signature
 from krakenfx.utils.validations import check_response_errors
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def get_AssetsPairs(settings: Settings, pair: str = None) -> dict:
-    nonce = int(time.time() * 1000)
     urlpath = "/0/public/AssetPairs"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {
         "nonce": nonce,
         "info": "info",
@@ -46,14 +50,14 @@ async def get_AssetsPairs(settings: Settings, pair: str = None) -> dict:
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        return response.json()["result"]
+    await check_response_errors(response.json())
+    return response.json()["result"]
 
 
 @async_handle_errors
@@ -2,10 +2,8 @@
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -27,12 +25,18 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def get_Time(settings: Settings):
-    nonce = int(time.time() * 1000)
     urlpath = "/0/public/Assets"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {
         "nonce": nonce,
     }
@@ -42,17 +46,17 @@ async def get_Time(settings: Settings):
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        assetsResponse = SchemasResponse(**response.json())
-        await check_schemasResponse_empty(assetsResponse)
-        assets: SchemasAssetsReturn = assetsResponse.result
-        return assets
+    await check_response_errors(response.json())
+    assetsResponse = SchemasResponse(**response.json())
+    await check_schemasResponse_empty(assetsResponse)
+    assets: SchemasAssetsReturn = assetsResponse.result
+    return assets
 
 
 async def main(settings: Settings, logger: logging.Logger):
@@ -3,10 +3,8 @@ import argparse
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
 
-import httpx
 from pydantic import ValidationError
 
 from krakenfx.di.app_container import AppContainer
@@ -25,12 +23,18 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+
 
 @async_handle_errors
 async def get_Depth(settings: Settings, pair: str, count: int = 100):
-    nonce = int(time.time() * 1000)
     urlpath = "/0/public/Depth"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {"nonce": nonce, "pair": pair, "count": count}
     headers = {
         "API-Key": settings.KRAKEN_API_KEY,
@@ -38,17 +42,17 @@ async def get_Depth(settings: Settings, pair: str, count: int = 100):
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
 
-        await check_response_errors(response.json())
-        depthResponse = ModelResponseSchema(**response.json())
-        await check_schemasResponse_empty(depthResponse)
-        asset_pair = depthResponse.result[pair]
-        return asset_pair
+    await check_response_errors(response.json())
+    depthResponse = ModelResponseSchema(**response.json())
+    await check_schemasResponse_empty(depthResponse)
+    asset_pair = depthResponse.result[pair]
+    return asset_pair
 
 
 async def main(settings: Settings, logger: logging.Logger):
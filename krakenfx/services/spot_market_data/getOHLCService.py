@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import json
+import logging
+from typing import Iterable, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.storeOHLC import get_ohlc_since, process_ohlc
+from krakenfx.services.spot_market_data.schemas.ohlcSchemas import (
+    OHLCResponse,
+    OHLCResult,
+)
+from krakenfx.utils.config import Settings
+from krakenfx.utils.errors import (
+    KrakenFetchResponseException,
+    KrakenInvalidAPIKeyException,
+    KrakenInvalidResponseStructureException,
+    KrakenNoItemsReturnedException,
+    async_handle_errors,
+)
+from krakenfx.utils.validations import check_response_errors
+
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+logger = AppContainer().logger_container().logger()
+
+
+@async_handle_errors
+async def fetch_ohlc(
+    settings: Settings, pair: str, interval: int = 1, since: Optional[int] = None
+) -> OHLCResponse:
+    urlpath = "/0/public/OHLC"
+    url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    params = {
+        "pair": pair,
+        "interval": interval,
+    }
+    if since:
+        params["since"] = since
+
+    client = http_client_factory.get_async_client()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+
+    response_json = response.json()
+    await check_response_errors(response_json)
+    ohlc_response = OHLCResponse.from_response(response_json)
+    return ohlc_response
+
+
+@async_handle_errors
+async def get_ohlc(
+    settings: Settings, pair: str, interval: int = 1, since: Optional[int] = None
+) -> OHLCResult:
+    """Return the candles of a pair newer than `since` and the next cursor.
+
+    The last candle of the result is the current, still open, one.
+    An empty list of candles only means nothing new since the cursor.
+    """
+    ohlc_response: OHLCResponse = await fetch_ohlc(settings, pair, interval, since)
+    return ohlc_response.result
+
+
+@async_handle_errors
+async def sync_ohlc(
+    settings: Settings, pair: str, interval: int, session: AsyncSession
+) -> Tuple[int, int]:
+    """Poll the candles of a pair since its stored cursor and store them under `pair`."""
+    since = await get_ohlc_since(pair, interval, session)
+    ohlc_result = await get_ohlc(settings, pair, interval, since)
+    return await process_ohlc(interval, ohlc_result, session, pair_name=pair)
+
+
+async def sync_tracked_ohlc(
+    settings: Settings,
+    session: AsyncSession,
+    pairs: Optional[Iterable[str]] = None,
+    intervals: Optional[Iterable[int]] = None,
+):
+    """Poll every tracked pair and interval (OHLC_SYNC_PAIRS x OHLC_SYNC_INTERVALS).
+
+    A failing pair is logged and does not prevent the others from syncing.
+    """
+    pairs = settings.OHLC_SYNC_PAIRS if pairs is None else pairs
+    intervals = settings.OHLC_SYNC_INTERVALS if intervals is None else intervals
+    for pair in pairs:
+        for interval in intervals:
+            try:
+                inserted, updated = await sync_ohlc(settings, pair, interval, session)
+                logger.flow1(
+                    f"OHLC {pair} {interval}m synchronised: {inserted} created, "
+                    f"{updated} updated."
+                )
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"OHLC {pair} {interval}m synchronisation failed: {e}")
+
+
+async def main(settings: Settings, logger: logging.Logger):
+    parser = argparse.ArgumentParser(description="Get OHLC data of an asset pair")
+    parser.add_argument(
+        "-q",
+        "--asset_pair",
+        type=str,
+        default="XXBTZUSD",
+        help="Asset pair to get OHLC data for.",
+        required=False,
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=int,
+        default=1,
+        help="Time frame interval in minutes.",
+        required=False,
+    )
+    parser.add_argument(
+        "-s",
+        "--since",
+        type=int,
+        default=None,
+        help="Return committed OHLC data since this timestamp.",
+        required=False,
+    )
+    args = parser.parse_args()
+    logger.info("Get OHLC data from Kraken server!")
+    response = await get_ohlc(settings, args.asset_pair, args.interval, args.since)
+    return response
+
+
+if __name__ == "__main__":
+    try:
+        settings = AppContainer().config_container().config()
+        response = asyncio.run(main(settings, logger))
+        logger.info(json.dumps(response.model_dump(), indent=4, default=str))
+
+    except TimeoutError as e:
+        logger.error(e)
+    except RuntimeError as e:
+        logger.error(e)
+    except ConnectionError as e:
+        logger.error(e)
+    except KrakenInvalidAPIKeyException as e:
+        logger.error(e)
+    except KrakenFetchResponseException as e:
+        logger.error(e)
+    except KrakenInvalidResponseStructureException as e:
+        logger.error(e)
+    except KrakenNoItemsReturnedException as e:
+        logger.error(e)
+    except ValidationError as e:
+        error = json.dumps(e.errors(), indent=4)
+        logger.error(error)
+    except ValueError as e:
+        logger.error(e)
+    except Exception as e:
+        logger.error(e)
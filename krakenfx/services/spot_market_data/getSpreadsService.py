@@ -2,11 +2,14 @@ import argparse
 import asyncio
 import json
 import logging
+from typing import Iterable, Optional, Tuple
 
-import httpx
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.storeSpreads import process_spreads
+from krakenfx.repository.storeSyncState import get_sync_start
 from krakenfx.services.spot_market_data.schemas.spreadsSchemas import (
     SchemasGetRecentSpreadsResponse,
 )
@@ -23,27 +26,73 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+logger = AppContainer().logger_container().logger()
+
 
 @async_handle_errors
-async def get_recent_spreads(settings: Settings, pair: str):
+async def fetch_recent_spreads(
+    settings: Settings, pair: str, since: int = None
+) -> SchemasGetRecentSpreadsResponse:
     urlpath = "/0/public/Spread"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
     params = {
         "pair": pair,
     }
+    if since:
+        params["since"] = since
+
+    client = http_client_factory.get_async_client()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+
+    response_json = response.json()
+    logger.debug(f"Response JSON: {response_json}")
+
+    await check_response_errors(response_json)
+    spreads_response = SchemasGetRecentSpreadsResponse(**response_json)
+    return spreads_response
+
+
+@async_handle_errors
+async def get_recent_spreads(settings: Settings, pair: str, since: int = None):
+    spreads_response: SchemasGetRecentSpreadsResponse = await fetch_recent_spreads(
+        settings, pair, since
+    )
+    await check_schemasResponse_empty(spreads_response)
+    asset_pair_spreads = spreads_response.result.get(pair, [])
+    return asset_pair_spreads
+
+
+async def sync_spreads(
+    settings: Settings, pair: str, session: AsyncSession
+) -> Tuple[int, int]:
+    """Poll the spreads of a pair since its stored 'last' cursor and store them."""
+    since = await get_sync_start("Spread", session, scope=pair)
+    spreads_response = await fetch_recent_spreads(settings, pair, since)
+    return await process_spreads(pair, spreads_response, session)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
 
-        response_json = response.json()
-        logger.debug(f"Response JSON: {response_json}")
+async def sync_tracked_spreads(
+    settings: Settings, session: AsyncSession, pairs: Optional[Iterable[str]] = None
+):
+    """Poll every pair of SPREADS_SYNC_PAIRS.
 
-        await check_response_errors(response_json)
-        spreads_response = SchemasGetRecentSpreadsResponse(**response_json)
-        await check_schemasResponse_empty(spreads_response)
-        asset_pair_spreads = spreads_response.result.get(pair, [])
-        return asset_pair_spreads
+    A failing pair is logged and does not prevent the others from syncing.
+    """
+    pairs = settings.SPREADS_SYNC_PAIRS if pairs is None else pairs
+    for pair in pairs:
+        try:
+            inserted, updated = await sync_spreads(settings, pair, session)
+            logger.flow1(
+                f"Spreads {pair} synchronised: {inserted} created, {updated} updated."
+            )
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Spreads {pair} synchronisation failed: {e}")
 
 
 async def main(settings: Settings, logger: logging.Logger):
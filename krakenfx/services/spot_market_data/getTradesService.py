@@ -2,13 +2,15 @@ import argparse
 import asyncio
 import json
 import logging
-import time
 import urllib.parse
+from typing import Iterable, Optional, Tuple
 
-import httpx
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.storeRecentTrades import process_recent_trades
+from krakenfx.repository.storeSyncState import get_sync_start
 from krakenfx.services.spot_market_data.schemas.recentTradesSchemas import (
     SchemasRecentTradesResponse,
 )
@@ -26,12 +28,21 @@ from krakenfx.utils.validations import (
     check_schemasResponse_empty,
 )
 
+http_client_factory = AppContainer().api_container().http_client_factory()
+rate_limiter = AppContainer().api_container().rate_limiter()
+nonce_manager = AppContainer().api_container().nonce_manager()
+logger = AppContainer().logger_container().logger()
+
 
 @async_handle_errors
-async def get_recent_trades(settings: Settings, pair: str, since: str = None):
-    nonce = int(time.time() * 1000)
+async def fetch_recent_trades(
+    settings: Settings, pair: str, since: str = None
+) -> SchemasRecentTradesResponse:
     urlpath = "/0/public/Trades"
     url = settings.KRAKEN_API_URL.unicode_string().rstrip("/") + urlpath
+
+    await rate_limiter.acquire(urlpath)
+    nonce = nonce_manager.next_nonce()
     data = {
         "nonce": nonce,
         "pair": pair,
@@ -45,17 +56,54 @@ async def get_recent_trades(settings: Settings, pair: str, since: str = None):
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, headers=headers, content=urllib.parse.urlencode(data)
-        )
-        response.raise_for_status()
+    client = http_client_factory.get_async_client()
+    response = await client.post(
+        url, headers=headers, content=urllib.parse.urlencode(data)
+    )
+    response.raise_for_status()
+
+    await check_response_errors(response.json())
+    trades_response = SchemasRecentTradesResponse.from_response(response.json())
+    return trades_response
+
+
+@async_handle_errors
+async def get_recent_trades(settings: Settings, pair: str, since: str = None):
+    trades_response: SchemasRecentTradesResponse = await fetch_recent_trades(
+        settings, pair, since
+    )
+    await check_schemasResponse_empty(trades_response)
+    asset_pair_trades = trades_response.result.get(pair, [])
+    return asset_pair_trades
+
 
-        await check_response_errors(response.json())
-        trades_response = SchemasRecentTradesResponse.from_response(response.json())
-        await check_schemasResponse_empty(trades_response)
-        asset_pair_trades = trades_response.result.get(pair, [])
-        return asset_pair_trades
+async def sync_recent_trades(
+    settings: Settings, pair: str, session: AsyncSession
+) -> Tuple[int, int]:
+    """Poll the trades of a pair since its stored 'last' cursor and store them."""
+    since = await get_sync_start("Trades", session, scope=pair)
+    trades_response = await fetch_recent_trades(settings, pair, since)
+    return await process_recent_trades(pair, trades_response, session)
+
+
+async def sync_tracked_recent_trades(
+    settings: Settings, session: AsyncSession, pairs: Optional[Iterable[str]] = None
+):
+    """Poll every pair of RECENT_TRADES_SYNC_PAIRS.
+
+    A failing pair is logged and does not prevent the others from syncing.
+    """
+    pairs = settings.RECENT_TRADES_SYNC_PAIRS if pairs is None else pairs
+    for pair in pairs:
+        try:
+            inserted, updated = await sync_recent_trades(settings, pair, session)
+            logger.flow1(
+                f"Recent trades {pair} synchronised: {inserted} created, "
+                f"{updated} updated."
+            )
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Recent trades {pair} synchronisation failed: {e}")
 
 
 async def main(settings: Settings, logger: logging.Logger):
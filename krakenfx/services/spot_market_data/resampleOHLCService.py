@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models.ohlcModel import ModelOHLCAssetPair, ModelOHLCData
+from krakenfx.services.spot_market_data.schemas.ohlcSchemas import OHLCData
+from krakenfx.utils.errors import KrakenValueError, async_handle_errors
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only required by method="numpy"
+    np = None
+
+container = AppContainer()
+logger = container.logger_container().logger()
+resample_cache = container.database_container().ohlc_resample_cache()
+
+RESAMPLE_METHODS = ("sql", "numpy")
+
+
+def check_intervals(base_interval: int, target_interval: int):
+    if target_interval < base_interval or target_interval % base_interval:
+        raise KrakenValueError(
+            f"Cannot resample {base_interval}m candles into {target_interval}m "
+            f"candles, the target interval must be a multiple of the base one."
+        )
+
+
+def align_range(
+    target_interval: int, start: int, end: Optional[int]
+) -> Tuple[int, Optional[int]]:
+    """Widen [start, end) to whole target buckets, so no bucket is cut."""
+    step = target_interval * 60
+    start -= start % step
+    if end is not None and end % step:
+        end += step - end % step
+    return start, end
+
+
+def _base_conditions(
+    asset_pair_id: int, base_interval: int, start: int, end: Optional[int]
+) -> list:
+    conditions = [
+        ModelOHLCData.asset_pair_id == asset_pair_id,
+        ModelOHLCData.interval == base_interval,
+        ModelOHLCData.time >= start,
+    ]
+    if end is not None:
+        conditions.append(ModelOHLCData.time < end)
+    return conditions
+
+
+def _vwap(price_volume: float, volume: float) -> float:
+    return price_volume / volume if volume else 0.0
+
+
+# Candles imported from the OHLCVT files have no vwap (stored as 0), their
+# typical price (high + low + close) / 3 is weighted instead
+CANDLE_VWAP = case(
+    (
+        ModelOHLCData.vwap == 0,
+        (ModelOHLCData.high + ModelOHLCData.low + ModelOHLCData.close) / 3.0,
+    ),
+    else_=ModelOHLCData.vwap,
+)
+
+
+async def resample_ohlc_sql(
+    session: AsyncSession,
+    asset_pair_id: int,
+    base_interval: int,
+    target_interval: int,
+    start: int,
+    end: Optional[int] = None,
+) -> List[OHLCData]:
+    """Aggregate the candles in the database with a single GROUP BY query.
+
+    High, low, volume and count are aggregated per bucket, open and close are
+    then read from the first and last candle of each bucket by primary key.
+    """
+    # The step is inlined so the GROUP BY expression matches the selected one
+    step = literal_column(str(int(target_interval * 60)))
+    bucket = (ModelOHLCData.time - ModelOHLCData.time % step).label("bucket")
+    buckets = (
+        select(
+            bucket,
+            func.min(ModelOHLCData.time).label("first_time"),
+            func.max(ModelOHLCData.time).label("last_time"),
+            func.max(ModelOHLCData.high).label("high"),
+            func.min(ModelOHLCData.low).label("low"),
+            func.sum(ModelOHLCData.volume).label("volume"),
+            func.sum(ModelOHLCData.count).label("count"),
+            func.sum(CANDLE_VWAP * ModelOHLCData.volume).label("price_volume"),
+        )
+        .where(*_base_conditions(asset_pair_id, base_interval, start, end))
+        .group_by(bucket)
+        .subquery()
+    )
+
+    first = aliased(ModelOHLCData)
+    last = aliased(ModelOHLCData)
+    stmt = (
+        select(
+            buckets.c.bucket,
+            first.open,
+            buckets.c.high,
+            buckets.c.low,
+            last.close,
+            buckets.c.price_volume,
+            buckets.c.volume,
+            buckets.c.count,
+        )
+        .select_from(buckets)
+        .join(
+            first,
+            and_(
+                first.asset_pair_id == asset_pair_id,
+                first.interval == base_interval,
+                first.time == buckets.c.first_time,
+            ),
+        )
+        .join(
+            last,
+            and_(
+                last.asset_pair_id == asset_pair_id,
+                last.interval == base_interval,
+                last.time == buckets.c.last_time,
+            ),
+        )
+        .order_by(buckets.c.bucket)
+    )
+    result = await session.execute(stmt)
+    return [
+        OHLCData(
+            time=row.bucket,
+            open=row.open,
+            high=row.high,
+            low=row.low,
+            close=row.close,
+            vwap=_vwap(row.price_volume, row.volume),
+            volume=row.volume,
+            count=row.count,
+        )
+        for row in result
+    ]
+
+
+async def resample_ohlc_numpy(
+    session: AsyncSession,
+    asset_pair_id: int,
+    base_interval: int,
+    target_interval: int,
+    start: int,
+    end: Optional[int] = None,
+) -> List[OHLCData]:
+    """Load the base candles once and aggregate them with vectorized reductions."""
+    if np is None:
+        raise KrakenValueError(
+            "NumPy is required to resample with method 'numpy', "
+            "install the numpy extra: poetry install --extras numpy"
+        )
+
+    result = await session.execute(
+        select(
+            ModelOHLCData.time,
+            ModelOHLCData.open,
+            ModelOHLCData.high,
+            ModelOHLCData.low,
+            ModelOHLCData.close,
+            ModelOHLCData.vwap,
+            ModelOHLCData.volume,
+            ModelOHLCData.count,
+        )
+        .where(*_base_conditions(asset_pair_id, base_interval, start, end))
+        .order_by(ModelOHLCData.time)
+    )
+    rows = result.all()
+    if not rows:
+        return []
+
+    times, opens, highs, lows, closes, vwaps, volumes, counts = (
+        np.asarray(column) for column in zip(*rows)
+    )
+    buckets = times - times % (target_interval * 60)
+    # Index of the first candle of each bucket, rows are sorted by time
+    firsts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    lasts = np.r_[firsts[1:], len(times)] - 1
+
+    volume = np.add.reduceat(volumes, firsts)
+    vwaps = np.where(vwaps == 0, (highs + lows + closes) / 3.0, vwaps)
+    price_volume = np.add.reduceat(vwaps * volumes, firsts)
+    vwap = np.divide(
+        price_volume,
+        volume,
+        out=np.zeros_like(price_volume, dtype=float),
+        where=volume > 0,
+    )
+    columns = zip(
+        buckets[firsts].tolist(),
+        opens[firsts].tolist(),
+        np.maximum.reduceat(highs, firsts).tolist(),
+        np.minimum.reduceat(lows, firsts).tolist(),
+        closes[lasts].tolist(),
+        vwap.tolist(),
+        volume.tolist(),
+        np.add.reduceat(counts, firsts).tolist(),
+    )
+    return [
+        OHLCData(
+            time=time,
+            open=open,
+            high=high,
+            low=low,
+            close=close,
+            vwap=vwap,
+            volume=volume,
+            count=count,
+        )
+        for time, open, high, low, close, vwap, volume, count in columns
+    ]
+
+
+@async_handle_errors
+async def get_resampled_ohlc(
+    session: AsyncSession,
+    asset_pair_id: int,
+    base_interval: int,
+    target_interval: int,
+    start: int = 0,
+    end: Optional[int] = None,
+    method: str = "sql",
+) -> List[OHLCData]:
+    """Return the `target_interval` candles of a pair built from the stored ones.
+
+    Candles are aggregated per bucket of `target_interval` minutes aligned on
+    the epoch: first open, max high, min low, last close, summed volume and
+    count and volume-weighted vwap (0 for a bucket without volume, the typical
+    price of the candles without vwap is used, see CANDLE_VWAP). The range
+    [start, end) is widened to whole buckets, results are cached per pair,
+    intervals and range.
+
+    Args:
+        session: Session used to read ohlc_data.
+        asset_pair_id: Id of the ohlc asset pair.
+        base_interval: Interval in minutes of the stored candles to aggregate.
+        target_interval: Interval in minutes of the returned candles.
+        start: Unix time of the first bucket.
+        end: Unix time the last bucket ends before, None for the latest candles.
+        method: "sql" to aggregate in the database, "numpy" to aggregate here.
+    """
+    check_intervals(base_interval, target_interval)
+    if method not in RESAMPLE_METHODS:
+        raise KrakenValueError(f"Unknown resample method {method}.")
+
+    start, end = align_range(target_interval, start, end)
+    key = (asset_pair_id, base_interval, target_interval, start, end)
+    candles = resample_cache.get(key)
+    if candles is not None:
+        logger.trace(f"Resampled OHLC cache hit for {key}.")
+        return candles
+
+    resample = resample_ohlc_numpy if method == "numpy" else resample_ohlc_sql
+    candles = await resample(
+        session, asset_pair_id, base_interval, target_interval, start, end
+    )
+    logger.flow2(
+        f"Resampled {len(candles)} candles of {target_interval}m from {base_interval}m "
+        f"for asset pair {asset_pair_id} with {resample.__name__}."
+    )
+    resample_cache.set(key, candles)
+    return candles
+
+
+async def main(settings, logger: logging.Logger):
+    parser = argparse.ArgumentParser(description="Resample stored OHLC candles")
+    parser.add_argument(
+        "-q",
+        "--asset_pair",
+        type=str,
+        default="XXBTZUSD",
+        help="Asset pair to resample.",
+    )
+    parser.add_argument(
+        "-b", "--base", type=int, default=1, help="Stored interval in minutes."
+    )
+    parser.add_argument(
+        "-t", "--target", type=int, default=5, help="Target interval in minutes."
+    )
+    parser.add_argument(
+        "-s", "--since", type=int, default=0, help="Unix time of the first bucket."
+    )
+    parser.add_argument("-m", "--method", choices=RESAMPLE_METHODS, default="sql")
+    args = parser.parse_args()
+
+    engine = await container.database_container().database_factory().get_async_engine()
+    async with AsyncSession(engine) as session:
+        result = await session.execute(
+            select(ModelOHLCAssetPair).where(ModelOHLCAssetPair.name == args.asset_pair)
+        )
+        ohlc_asset_pair = result.scalar_one_or_none()
+        if ohlc_asset_pair is None:
+            raise KrakenValueError(f"No OHLC data for asset pair {args.asset_pair}.")
+        return await get_resampled_ohlc(
+            session,
+            ohlc_asset_pair.id,
+            args.base,
+            args.target,
+            args.since,
+            method=args.method,
+        )
+
+
+if __name__ == "__main__":
+    try:
+        settings = container.config_container().config()
+        response = asyncio.run(main(settings, logger))
+        logger.info(json.dumps([candle.model_dump() for candle in response], indent=4))
+    except KrakenValueError as e:
+        logger.error(e)
+    except Exception as e:
+        logger.error(e)
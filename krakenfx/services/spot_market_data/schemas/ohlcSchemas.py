@@ -1,6 +1,8 @@
-from typing import Dict, List
+from typing import Any, Dict, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+
+OHLC_FIELDS = ("time", "open", "high", "low", "close", "vwap", "volume", "count")
 
 
 class OHLCData(BaseModel):
@@ -16,9 +18,32 @@ class OHLCData(BaseModel):
 
 class OHLCResult(BaseModel):
     data: Dict[str, List[OHLCData]]
-    last: int
+    last: int  # Time of the last committed candle, to pass as 'since'
 
 
 class OHLCResponse(BaseModel):
     error: List[str]
     result: OHLCResult
+
+    @model_validator(mode="before")
+    def transform_candles(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        if "result" not in values:
+            raise ValueError("'result' key not found in the response")
+
+        result = values["result"]
+        if "data" in result:
+            return values
+        # Kraken returns {pair: [[time, open, ..., count], ...], "last": time}
+        values["result"] = {
+            "data": {
+                pair: [dict(zip(OHLC_FIELDS, candle)) for candle in candles]
+                for pair, candles in result.items()
+                if pair != "last"
+            },
+            "last": result.get("last", 0),
+        }
+        return values
+
+    @classmethod
+    def from_response(cls, response: dict):
+        return cls.model_validate(response)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, model_validator
 
@@ -16,6 +16,7 @@ class SchemasTradeEntry(BaseModel):
 class SchemasRecentTradesResponse(BaseModel):
     error: List[str]
     result: Dict[str, List[SchemasTradeEntry]]
+    last: Optional[str] = None  # Cursor to pass as 'since' to only get newer trades
 
     @model_validator(mode="before")
     def transform_trades(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -23,6 +24,8 @@ class SchemasRecentTradesResponse(BaseModel):
             raise ValueError("'result' key not found in the response")
 
         result = values["result"]
+        if "last" in result:
+            values["last"] = str(result["last"])
         parsed_result = {
             pair: [
                 {
@@ -0,0 +1,177 @@
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.storeAssetsPairs import process_asset_pairs
+from krakenfx.repository.storeBalance import process_balance
+from krakenfx.repository.storeLedgers import process_ledgers
+from krakenfx.repository.storeOpenPositions import process_openPositions
+from krakenfx.repository.storeOrders import process_orders
+from krakenfx.repository.storeSyncState import (
+    get_sync_start,
+    newest_record,
+    update_sync_cursor,
+)
+from krakenfx.repository.storeTradeBalance import process_tradeBalance
+from krakenfx.repository.storeTradeHistory import process_tradeHistory
+from krakenfx.services.account_data.balanceService import get_accountBalance
+from krakenfx.services.account_data.ledgerService import iter_ledgers
+from krakenfx.services.account_data.openPositionService import get_openPositions
+from krakenfx.services.account_data.OrderService import get_Orders, iter_closedOrders
+from krakenfx.services.account_data.tradeBalanceService import get_tradeBalance
+from krakenfx.services.account_data.tradesHistoryService import iter_tradeHistory
+from krakenfx.services.spot_market_data.getAssetsPairsService import get_AssetsPairs
+from krakenfx.services.spot_market_data.getOHLCService import sync_tracked_ohlc
+from krakenfx.services.spot_market_data.getSpreadsService import sync_tracked_spreads
+from krakenfx.services.spot_market_data.getTradesService import (
+    sync_tracked_recent_trades,
+)
+from krakenfx.utils.jobs import skip_if_empty
+from krakenfx.utils.pipeline import run_pipeline
+
+container = AppContainer()
+logger = container.logger_container().logger()
+settings = container.config_container().config()
+
+# Scheduled jobs, each run gets its own session (see utils.jobs.session_job).
+# Paginated and multi-request jobs stream the fetched pages to the store
+# stage through run_pipeline: the next page is requested while the previous
+# one is written, at most PIPELINE_QUEUE_SIZE pages wait in between.
+# Kraken returns the newest page first, so the sync cursors are only moved
+# once every page of the run is stored: a failed run is fetched again.
+
+
+async def iter_fetched(
+    *fetches: Callable[[], Awaitable], description: str
+) -> AsyncIterator:
+    """Yield the result of each fetch in turn, skipping those without items."""
+    for fetch in fetches:
+        result = await skip_if_empty(fetch(), logger, description)
+        if result:
+            yield result
+
+
+async def store_sync_cursor(
+    endpoint: str,
+    session: AsyncSession,
+    newest: List[Optional[Tuple[float, str]]],
+    with_id: bool = True,
+):
+    """Move the cursor of `endpoint` to the newest record stored by the run."""
+    newest = [record for record in newest if record]
+    if not newest:
+        return
+    last_time, last_id = max(newest)
+    await update_sync_cursor(
+        endpoint, session, last_time=last_time, last_id=last_id if with_id else None
+    )
+    await session.commit()
+
+
+async def ledgers_job(session: AsyncSession) -> int:
+    start = await get_sync_start("Ledgers", session)
+    newest = []
+
+    async def store(Ledgers):
+        await process_ledgers(Ledgers, session, update_cursor=False)
+        newest.append(newest_record(Ledgers))
+
+    pages = await run_pipeline(
+        iter_ledgers(
+            settings, start=start, concurrency=settings.KRAKEN_PAGE_CONCURRENCY
+        ),
+        [store],
+        settings.PIPELINE_QUEUE_SIZE,
+    )
+    await store_sync_cursor("Ledgers", session, newest)
+    logger.flow1(f"Ledgers job stored {pages} pages.")
+    return pages
+
+
+async def trade_history_job(session: AsyncSession) -> int:
+    start = await get_sync_start("TradesHistory", session)
+    newest = []
+
+    async def store(Trades):
+        await process_tradeHistory(Trades, session, update_cursor=False)
+        newest.append(newest_record(Trades))
+
+    pages = await run_pipeline(
+        iter_tradeHistory(
+            settings, start=start, concurrency=settings.KRAKEN_PAGE_CONCURRENCY
+        ),
+        [store],
+        settings.PIPELINE_QUEUE_SIZE,
+    )
+    await store_sync_cursor("TradesHistory", session, newest)
+    logger.flow1(f"TradesHistory job stored {pages} pages.")
+    return pages
+
+
+async def iter_orders(start) -> AsyncIterator:
+    """Open orders, then every page of the orders closed since `start`."""
+    async for Orders in iter_fetched(
+        lambda: get_Orders(settings, "open"), description="open orders"
+    ):
+        yield Orders
+    async for Orders in iter_closedOrders(
+        settings, start=start, concurrency=settings.KRAKEN_PAGE_CONCURRENCY
+    ):
+        yield Orders
+
+
+async def orders_job(session: AsyncSession) -> int:
+    start = await get_sync_start("ClosedOrders", session)
+    newest = []
+
+    async def store(Orders):
+        await process_orders(Orders, session, update_cursor=False)
+        newest.append(newest_record(Orders, "closetm"))
+
+    pages = await run_pipeline(
+        iter_orders(start), [store], settings.PIPELINE_QUEUE_SIZE
+    )
+    await store_sync_cursor("ClosedOrders", session, newest, with_id=False)
+    logger.flow1(f"Orders job stored {pages} pages.")
+    return pages
+
+
+async def open_positions_job(session: AsyncSession) -> int:
+    return await run_pipeline(
+        iter_fetched(lambda: get_openPositions(settings), description="open positions"),
+        [lambda OpenPositions: process_openPositions(OpenPositions, session)],
+        settings.PIPELINE_QUEUE_SIZE,
+    )
+
+
+async def asset_pairs_job(session: AsyncSession) -> int:
+    return await run_pipeline(
+        iter_fetched(lambda: get_AssetsPairs(settings), description="asset pairs"),
+        [lambda AssetsPairs: process_asset_pairs(AssetsPairs, session)],
+        settings.PIPELINE_QUEUE_SIZE,
+    )
+
+
+async def balance_job(session: AsyncSession):
+    await process_balance(await get_accountBalance(settings), session)
+
+
+async def trade_balance_job(session: AsyncSession):
+    await process_tradeBalance(await get_tradeBalance(settings), session)
+
+
+async def sync_ohlc_job(session: AsyncSession):
+    await sync_tracked_ohlc(settings, session)
+
+
+async def sync_recent_trades_job(session: AsyncSession):
+    await sync_tracked_recent_trades(settings, session)
+
+
+async def sync_spreads_job(session: AsyncSession):
+    await sync_tracked_spreads(settings, session)
+
+
+if __name__ == "__main__":
+    print("This script cannot be invoked directly!")
@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.ledgerModel import ModelLedger as ORMLedger
+from krakenfx.repository.storeLedgers import process_ledgers
+from krakenfx.services.account_data.schemas.ledgerSchemas import SchemasLedger
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+def make_ledgers(count, balance="1.0"):
+    return {
+        f"L{index:05d}": SchemasLedger(
+            aclass="currency",
+            amount="0.5",
+            asset="XXBT",
+            balance=balance if index == 0 else "1.0",
+            fee="0.0",
+            refid=f"R{index:05d}",
+            time=1700000000.0 + index,
+            type="trade",
+        )
+        for index in range(count)
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_ledgers_bulk_upsert(db_session):
+    # More rows than fit in a single statement to exercise chunking
+    Ledgers = make_ledgers(4000)
+
+    assert await process_ledgers(Ledgers, db_session) == (4000, 0)
+    assert await db_session.scalar(select(func.count(ORMLedger.id))) == 4000
+
+    # Unchanged rows are skipped, changed rows are updated
+    Ledgers = make_ledgers(4001, balance="2.0")
+    assert await process_ledgers(Ledgers, db_session) == (1, 1)
+
+    db_session.expire_all()
+    orm_ledger = await db_session.get(ORMLedger, "L00000")
+    assert orm_ledger.balance == "2.0"
+    assert await db_session.scalar(select(func.count(ORMLedger.id))) == 4001
@@ -0,0 +1,114 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.OrderModel import ModelOrders as ORMOrder
+from krakenfx.repository.models.OrderModel import (
+    ModelOrdersDescription as ORMOrderDescription,
+)
+from krakenfx.repository.storeOrders import process_orders
+from krakenfx.services.account_data.schemas.OrderSchemas import SchemasOrder
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+def make_orders(count, status="closed"):
+    return {
+        f"O{index:05d}": SchemasOrder(
+            status=status if index == 0 else "closed",
+            opentm=1700000000.0 + index,
+            closetm=1700000100.0 + index,
+            descr={
+                "pair": "XBTUSD",
+                "type": "buy",
+                "ordertype": "limit",
+                "price": "30000.0",
+                "price2": "0",
+                "order": "buy 0.5 XBTUSD @ limit 30000.0",
+            },
+            vol="0.5",
+            vol_exec="0.5",
+            cost="15000.0",
+            fee="24.0",
+            price="30000.0",
+            misc="",
+            oflags="fciq",
+            trades=["T0001"],
+        )
+        for index in range(count)
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_orders_bulk_upsert(db_session):
+    Orders = make_orders(3000)
+
+    assert await process_orders(Orders, db_session) == (3000, 0)
+    assert await db_session.scalar(select(func.count(ORMOrder.id))) == 3000
+    assert await db_session.scalar(select(func.count(ORMOrderDescription.id))) == 3000
+
+    Orders = make_orders(3001, status="canceled")
+    assert await process_orders(Orders, db_session) == (1, 1)
+
+    db_session.expire_all()
+    orm_order = await db_session.get(ORMOrder, "O00000")
+    assert orm_order.status == "canceled"
+    assert orm_order.descr_id == "O00000"
+
+
+@pytest.mark.asyncio
+async def test_process_orders_keeps_unset_fields(db_session):
+    Orders = make_orders(2)
+    Orders["O00000"].limitprice = "31000.0"
+    Orders["O00000"].reason = "User requested"
+    await process_orders(Orders, db_session)
+
+    # Kraken omits the optional fields it has no value for
+    Orders = make_orders(2, status="canceled")
+    Orders["O00001"].reason = "Insufficient funds"
+    assert await process_orders(Orders, db_session) == (0, 2)
+
+    db_session.expire_all()
+    orm_order = await db_session.get(ORMOrder, "O00000")
+    assert orm_order.status == "canceled"
+    assert orm_order.limitprice == "31000.0"
+    assert orm_order.reason == "User requested"
+    orm_order = await db_session.get(ORMOrder, "O00001")
+    assert orm_order.reason == "Insufficient funds"
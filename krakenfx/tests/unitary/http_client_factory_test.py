@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from krakenfx.di.app_container import AppContainer
+
+container = AppContainer()
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_between_calls():
+    http_client_factory = container.api_container().http_client_factory()
+
+    client = http_client_factory.get_async_client()
+    assert client is http_client_factory.get_async_client()
+    assert (
+        client
+        is AppContainer().api_container().http_client_factory().get_async_client()
+    )
+
+    await http_client_factory.close()
+    assert client.is_closed
+    assert http_client_factory.get_async_client() is not client
+    await http_client_factory.close()
+
+
+def test_http_client_replaced_on_loop_change_is_closed():
+    http_client_factory = container.api_container().http_client_factory()
+
+    async def get_client():
+        return http_client_factory.get_async_client()
+
+    # The loop owning the first client is closed by asyncio.run
+    old_client = asyncio.run(get_client())
+
+    async def switch_loop():
+        client = http_client_factory.get_async_client()
+        assert client is not old_client
+        await http_client_factory.close()
+
+    asyncio.run(switch_loop())
+    assert old_client.is_closed
+
+
+def test_http_client_replaced_on_loop_change_is_closed_on_its_running_loop():
+    http_client_factory = container.api_container().http_client_factory()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+
+        async def get_client():
+            return http_client_factory.get_async_client()
+
+        old_client = asyncio.run_coroutine_threadsafe(get_client(), other_loop).result()
+
+        async def switch_loop():
+            assert http_client_factory.get_async_client() is not old_client
+            await http_client_factory.close()
+
+        asyncio.run(switch_loop())
+        # The close was scheduled on the loop owning the old client
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), other_loop).result()
+        assert old_client.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -79,6 +79,7 @@ async def test_ohlc_data(db_session):
         ohlc_data = [
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381095240,
                 open=122.0,
                 high=122.0,
@@ -90,6 +91,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381179000,
                 open=123.61,
                 high=123.61,
@@ -101,6 +103,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381201080,
                 open=123.91,
                 high=123.91,
@@ -112,6 +115,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381209960,
                 open=124.19,
                 high=124.19,
@@ -123,6 +127,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381311000,
                 open=124.01687,
                 high=124.01687,
@@ -134,6 +139,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381311060,
                 open=124.01687,
                 high=124.01687,
@@ -145,6 +151,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381431780,
                 open=125.85,
                 high=125.86,
@@ -156,6 +163,7 @@ async def test_ohlc_data(db_session):
             ),
             ModelOHLCData(
                 asset_pair_id=ohlc_asset_pair_id,
+                interval=1,
                 time=1381571220,
                 open=127.5,
                 high=127.5,
@@ -0,0 +1,54 @@
+import logging
+
+from krakenfx.di.logger_container import LoggerContainer
+from krakenfx.utils.logger import LazyJson
+
+# Installs the trace/flow1/flow2 levels
+LoggerContainer().logger()
+
+TRACE_LEVEL_NUM = 5
+
+
+class CountingPayload:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"id": "L4UESK-KG3EQ-UFO4T5", "amount": "-0.2805"}
+
+
+def get_test_logger(level, caplog):
+    logger = logging.getLogger("lazy_logging_test")
+    logger.setLevel(level)
+    caplog.set_level(level, logger="lazy_logging_test")
+    return logger
+
+
+def test_disabled_trace_does_not_serialize(caplog):
+    logger = get_test_logger(logging.INFO, caplog)
+    payload = CountingPayload()
+
+    logger.trace("Ledger:\n%s", LazyJson(payload))
+    logger.trace(lambda: f"Ledger: {payload()}")
+
+    assert payload.calls == 0
+    assert caplog.records == []
+
+
+def test_enabled_trace_formats_lazily(caplog):
+    logger = get_test_logger(TRACE_LEVEL_NUM, caplog)
+    payload = CountingPayload()
+
+    logger.trace("Ledger: %s", LazyJson(payload, indent=None))
+    logger.flow2(lambda: "Ledger amount: {}".format(payload()["amount"]))
+
+    assert [record.getMessage() for record in caplog.records] == [
+        'Ledger: {"id": "L4UESK-KG3EQ-UFO4T5", "amount": "-0.2805"}',
+        "Ledger amount: -0.2805",
+    ]
+    assert payload.calls == 2
+    # The caller is reported, not the logging helpers
+    assert {record.funcName for record in caplog.records} == {
+        "test_enabled_trace_formats_lazily"
+    }
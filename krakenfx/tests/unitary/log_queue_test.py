@@ -0,0 +1,134 @@
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from krakenfx.utils.log_queue import LogQueueHandler, LogQueuePipeline
+
+
+class RecordingHandler(logging.Handler):
+    """Keep the records and the thread they were written from."""
+
+    def __init__(self, gate: threading.Event = None):
+        super().__init__()
+        self.gate = gate
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.records.append(record)
+        self.threads.add(threading.current_thread())
+
+
+def make_pipeline(size=100, policy="drop"):
+    settings = SimpleNamespace(
+        LOGGING_QUEUE_ENABLED=True,
+        LOGGING_QUEUE_SIZE=size,
+        LOGGING_QUEUE_POLICY=policy,
+    )
+    return LogQueuePipeline(settings)
+
+
+@pytest.fixture(autouse=True)
+def fresh_pipeline():
+    # Work on a pipeline of our own, not the one of the application loggers
+    saved = LogQueuePipeline._instance
+    LogQueuePipeline._instance = None
+    yield
+    if LogQueuePipeline.current() is not None:
+        LogQueuePipeline.current().stop()
+    LogQueuePipeline._instance = saved
+
+
+@pytest.fixture
+def test_logger():
+    logger = logging.getLogger("log_queue_test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    logger.handlers = []
+
+
+def test_handlers_run_on_listener_thread(test_logger):
+    pipeline = make_pipeline()
+    handler = RecordingHandler()
+    other = RecordingHandler()
+    test_logger.addHandler(handler)
+    test_logger.addHandler(other)
+
+    pipeline.attach(test_logger, [handler])
+    assert other in test_logger.handlers
+    assert handler not in test_logger.handlers
+
+    test_logger.info("order %s stored", "OABC")
+    pipeline.flush()
+
+    assert [record.getMessage() for record in handler.records] == ["order OABC stored"]
+    assert threading.current_thread() not in handler.threads
+    assert other.threads == {threading.current_thread()}
+
+
+def test_attach_again_replaces_handlers(test_logger):
+    pipeline = make_pipeline()
+    first = RecordingHandler()
+    second = RecordingHandler()
+    test_logger.addHandler(first)
+    queue_handler = pipeline.attach(test_logger, [first])
+    test_logger.addHandler(second)
+
+    assert pipeline.attach(test_logger, [second]) is queue_handler
+    test_logger.info("replaced")
+    pipeline.flush()
+
+    assert [type(h) for h in test_logger.handlers] == [LogQueueHandler]
+    assert not first.records
+    assert len(second.records) == 1
+
+
+def test_full_queue_drops_records_below_warning(test_logger):
+    pipeline = make_pipeline(size=2)
+    gate = threading.Event()
+    handler = RecordingHandler(gate)
+    test_logger.addHandler(handler)
+    pipeline.attach(test_logger, [handler])
+
+    # The listener is stuck on the first record, two more fill the queue
+    for number in range(10):
+        test_logger.debug("row %s", number)
+    assert pipeline.dropped > 0
+    dropped = pipeline.dropped
+
+    gate.set()
+    test_logger.warning("kept")
+    pipeline.flush()
+    test_logger.info("after")
+    pipeline.flush()
+
+    messages = [record.getMessage() for record in handler.records]
+    assert len(messages) == 10 - dropped + 3
+    assert "kept" in messages
+    assert f"Log queue full, {dropped} log records dropped." in messages
+    assert messages[-1] == "after"
+    assert pipeline.dropped == 0
+
+
+def test_block_policy_keeps_every_record(test_logger):
+    pipeline = make_pipeline(size=2, policy="block")
+    handler = RecordingHandler()
+    test_logger.addHandler(handler)
+    pipeline.attach(test_logger, [handler])
+
+    for number in range(50):
+        test_logger.debug("row %s", number)
+    pipeline.flush()
+
+    assert len(handler.records) == 50
+    assert pipeline.dropped == 0
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        make_pipeline(policy="spill")
@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from krakenfx.di.app_container import AppContainer
+
+container = AppContainer()
+
+
+def test_nonces_are_unique_under_concurrency():
+    nonce_manager = container.api_container().nonce_manager()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        nonces = list(executor.map(lambda _: nonce_manager.next_nonce(), range(2000)))
+
+    assert len(set(nonces)) == len(nonces)
+    assert nonce_manager.next_nonce() > max(nonces)
+
+
+def test_nonce_state_file_is_shared(tmp_path):
+    nonce_manager = container.api_container().nonce_manager()
+    state_file = tmp_path / "nonce"
+    # Simulate another process that already used a nonce far in the future
+    state_file.write_text("99999999999999")
+
+    last_nonce = nonce_manager._last_nonce
+    nonce_manager._state_file = str(state_file)
+    try:
+        assert nonce_manager.next_nonce() == 100000000000000
+        assert state_file.read_text() == "100000000000000"
+        assert nonce_manager.next_nonce() == 100000000000001
+    finally:
+        # Never leak the future nonce to calls made against the real API
+        nonce_manager._state_file = None
+        nonce_manager._last_nonce = last_nonce
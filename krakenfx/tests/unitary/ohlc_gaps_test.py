@@ -0,0 +1,102 @@
+import logging
+
+import pytest
+import pytest_asyncio
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
+from krakenfx.repository.models.ohlcModel import ModelOHLCAssetPair, ModelOHLCData
+from krakenfx.repository.ohlcGaps import OHLCGap, find_ohlc_gaps, plan_ohlc_backfill
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+# 2024-01-01 00:00:00 UTC
+BASE_TIME = 1704067200
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+def candle(asset_pair_id, interval, time):
+    return ModelOHLCData(asset_pair_id, interval, time, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def asset_pair_id(db_session):
+    """1m candles missing 00:03-00:04 and 00:08, 5m candles without gap."""
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    ohlc_asset_pair = ModelOHLCAssetPair("XBTUSD")
+    db_session.add(ohlc_asset_pair)
+    await db_session.flush()
+
+    for minute in (0, 1, 2, 5, 6, 7, 9):
+        db_session.add(candle(ohlc_asset_pair.id, 1, BASE_TIME + minute * 60))
+    for minute in (0, 5, 10):
+        db_session.add(candle(ohlc_asset_pair.id, 5, BASE_TIME + minute * 60))
+    await db_session.commit()
+    return ohlc_asset_pair.id
+
+
+@pytest.mark.asyncio
+async def test_find_ohlc_gaps(db_session, asset_pair_id):
+    gaps = await find_ohlc_gaps(db_session)
+
+    assert gaps == [
+        OHLCGap("XBTUSD", asset_pair_id, 1, BASE_TIME + 180, BASE_TIME + 300),
+        OHLCGap("XBTUSD", asset_pair_id, 1, BASE_TIME + 480, BASE_TIME + 540),
+    ]
+    assert [gap.missing for gap in gaps] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_find_ohlc_gaps_filters(db_session, asset_pair_id):
+    assert await find_ohlc_gaps(db_session, min_missing=2) == [
+        OHLCGap("XBTUSD", asset_pair_id, 1, BASE_TIME + 180, BASE_TIME + 300)
+    ]
+    assert await find_ohlc_gaps(db_session, intervals=[5]) == []
+    assert await find_ohlc_gaps(db_session, pairs=["XETHZUSD"]) == []
+
+
+def test_plan_ohlc_backfill_splits_on_api_window():
+    gap = OHLCGap("XBTUSD", 1, 1, BASE_TIME, BASE_TIME + 600)
+    # The API still serves the candles of the last 720 minutes
+    now = BASE_TIME + 720 * 60 + 300
+
+    tasks = plan_ohlc_backfill([gap], now=now)
+
+    assert [(task.source, task.start, task.end) for task in tasks] == [
+        ("csv", BASE_TIME, BASE_TIME + 300),
+        ("api", BASE_TIME + 300, BASE_TIME + 600),
+    ]
+    assert [task.source for task in plan_ohlc_backfill([gap], now=BASE_TIME)] == ["api"]
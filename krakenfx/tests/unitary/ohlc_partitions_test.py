@@ -0,0 +1,53 @@
+import pytest
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.ohlcPartitions import (
+    create_partition_sql,
+    ensure_ohlc_partitions,
+    iter_month_partitions,
+)
+
+container = AppContainer()
+
+# 2013-12-31 23:59:00 UTC and 2014-02-01 00:00:00 UTC
+DEC_31_2013 = 1388534340
+FEB_1_2014 = 1391212800
+
+
+def test_iter_month_partitions_spans_year_boundary():
+    partitions = list(iter_month_partitions(DEC_31_2013, FEB_1_2014))
+
+    assert [name for name, _, _ in partitions] == [
+        "ohlc_data_y2013m12",
+        "ohlc_data_y2014m01",
+        "ohlc_data_y2014m02",
+    ]
+    # Contiguous bounds, each one starting where the previous one ends
+    assert partitions[0][1] == 1385856000
+    assert partitions[0][2] == partitions[1][1] == 1388534400
+    assert partitions[1][2] == partitions[2][1] == FEB_1_2014
+    assert partitions[2][2] == 1393632000
+
+
+def test_iter_month_partitions_single_month():
+    partitions = list(iter_month_partitions(FEB_1_2014, FEB_1_2014 + 3600))
+
+    assert [name for name, _, _ in partitions] == ["ohlc_data_y2014m02"]
+
+
+def test_create_partition_sql():
+    assert create_partition_sql("ohlc_data_y2014m02", 1391212800, 1393632000) == (
+        "CREATE TABLE IF NOT EXISTS ohlc_data_y2014m02 PARTITION OF ohlc_data "
+        "FOR VALUES FROM (1391212800) TO (1393632000)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_ohlc_partitions_is_noop_on_sqlite():
+    engine = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+    assert await ensure_ohlc_partitions(engine, DEC_31_2013, FEB_1_2014) == []
@@ -0,0 +1,151 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
+from krakenfx.repository.models.ohlcModel import ModelOHLCAssetPair, ModelOHLCData
+from krakenfx.services.spot_market_data.resampleOHLCService import (
+    get_resampled_ohlc,
+    resample_cache,
+)
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+# 2024-01-01 00:00:00 UTC
+BASE_TIME = 1704067200
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    resample_cache.invalidate()
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="function")
+async def asset_pair_id(db_session):
+    """Seven 1m candles: a full 5m bucket at 00:00 and two candles at 00:05."""
+    db_session.add(ModelAssetsPairs(pair_name="XXBTZUSD", data={}))
+    ohlc_asset_pair = ModelOHLCAssetPair("XXBTZUSD")
+    db_session.add(ohlc_asset_pair)
+    await db_session.flush()
+
+    for minute in range(7):
+        price = 100.0 + minute
+        db_session.add(
+            ModelOHLCData(
+                ohlc_asset_pair.id,
+                1,
+                BASE_TIME + minute * 60,
+                price,
+                price + 5,
+                price - 5 if minute != 2 else 50.0,
+                price + 1,
+                price,
+                minute + 1.0,
+                minute + 10,
+            )
+        )
+    await db_session.commit()
+    return ohlc_asset_pair.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["sql", "numpy"])
+async def test_resample_1m_to_5m(db_session, asset_pair_id, method):
+    if method == "numpy":
+        pytest.importorskip("numpy")
+
+    candles = await get_resampled_ohlc(
+        db_session, asset_pair_id, 1, 5, BASE_TIME, BASE_TIME + 600, method=method
+    )
+
+    assert [candle.time for candle in candles] == [BASE_TIME, BASE_TIME + 300]
+    first, second = candles
+    assert first.open == 100.0
+    assert first.high == 109.0
+    assert first.low == 50.0
+    assert first.close == 105.0
+    assert first.volume == 15.0
+    assert first.count == 60
+    # (100*1 + 101*2 + 102*3 + 103*4 + 104*5) / 15
+    assert first.vwap == pytest.approx(1540 / 15)
+    assert second.open == 105.0
+    assert second.close == 107.0
+    assert second.volume == 13.0
+    assert second.count == 31
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["sql", "numpy"])
+async def test_resample_candles_without_vwap(db_session, asset_pair_id, method):
+    if method == "numpy":
+        pytest.importorskip("numpy")
+    # The OHLCVT files have no vwap, the importer stores 0
+    for candle in await db_session.scalars(
+        select(ModelOHLCData).where(ModelOHLCData.time < BASE_TIME + 120)
+    ):
+        candle.vwap = 0.0
+    await db_session.commit()
+
+    first, _ = await get_resampled_ohlc(
+        db_session, asset_pair_id, 1, 5, BASE_TIME, BASE_TIME + 600, method=method
+    )
+    # Typical prices (105 + 95 + 101) / 3 and (106 + 96 + 102) / 3 for volumes 1 and 2
+    assert first.vwap == pytest.approx((301 / 3 + 304 / 3 * 2 + 1238) / 15)
+
+
+@pytest.mark.asyncio
+async def test_resample_is_cached_per_range(db_session, asset_pair_id):
+    candles = await get_resampled_ohlc(
+        db_session, asset_pair_id, 1, 5, BASE_TIME, BASE_TIME + 600
+    )
+    # Unaligned bounds are widened to the same buckets
+    cached = await get_resampled_ohlc(
+        db_session, asset_pair_id, 1, 5, BASE_TIME + 30, BASE_TIME + 590
+    )
+    assert cached is candles
+
+    resample_cache.invalidate(asset_pair_id)
+    fresh = await get_resampled_ohlc(
+        db_session, asset_pair_id, 1, 5, BASE_TIME, BASE_TIME + 600
+    )
+    assert fresh is not candles
+    assert fresh == candles
+
+
+@pytest.mark.asyncio
+async def test_resample_rejects_non_multiple_interval(db_session, asset_pair_id):
+    with pytest.raises(Exception, match="multiple of the base one"):
+        await get_resampled_ohlc(db_session, asset_pair_id, 5, 12)
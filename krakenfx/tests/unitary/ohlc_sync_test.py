@@ -0,0 +1,121 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.future import select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.assetsPairsModel import ModelAssetsPairs
+from krakenfx.repository.models.ohlcModel import ModelOHLCAssetPair, ModelOHLCData
+from krakenfx.repository.storeOHLC import get_ohlc_since, process_ohlc
+from krakenfx.services.spot_market_data.schemas.ohlcSchemas import OHLCResponse
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+def ohlc_response(candles, last):
+    return OHLCResponse.from_response(
+        {"error": [], "result": {"XXBTZUSD": candles, "last": last}}
+    )
+
+
+FIRST_POLL = [
+    [1688671200, "30306.1", "30306.2", "30305.7", "30305.7", "30306.1", "3.39", 23],
+    [1688671260, "30305.7", "30310.0", "30305.7", "30309.9", "30308.0", "1.50", 7],
+]
+# The 1688671260 candle was still open, it is returned again with more trades
+SECOND_POLL = [
+    [1688671260, "30305.7", "30312.0", "30305.7", "30311.0", "30309.0", "2.10", 11],
+    [1688671320, "30311.0", "30311.0", "30309.5", "30310.2", "30310.1", "0.40", 3],
+]
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        session.add(ModelAssetsPairs(pair_name="XXBTZUSD", data={}))
+        await session.commit()
+        yield session
+
+
+def test_ohlc_response_parses_kraken_arrays():
+    response = ohlc_response(FIRST_POLL, 1688671200)
+
+    assert response.result.last == 1688671200
+    candles = response.result.data["XXBTZUSD"]
+    assert [candle.time for candle in candles] == [1688671200, 1688671260]
+    assert candles[0].open == 30306.1
+    assert candles[0].volume == 3.39
+    assert candles[0].count == 23
+
+
+@pytest.mark.asyncio
+async def test_process_ohlc_inserts_new_and_updates_open_candle(db_session):
+    assert await get_ohlc_since("XXBTZUSD", 1, db_session) is None
+
+    first = ohlc_response(FIRST_POLL, 1688671200).result
+    assert await process_ohlc(1, first, db_session) == (2, 0)
+    assert await get_ohlc_since("XXBTZUSD", 1, db_session) == 1688671200
+
+    second = ohlc_response(SECOND_POLL, 1688671260).result
+    assert await process_ohlc(1, second, db_session) == (1, 1)
+    assert await get_ohlc_since("XXBTZUSD", 1, db_session) == 1688671260
+    # Cursors are kept per interval
+    assert await get_ohlc_since("XXBTZUSD", 5, db_session) is None
+
+    result = await db_session.execute(
+        select(ModelOHLCData.time, ModelOHLCData.close, ModelOHLCData.count).order_by(
+            ModelOHLCData.time
+        )
+    )
+    assert result.all() == [
+        (1688671200, 30305.7, 23),
+        (1688671260, 30311.0, 11),
+        (1688671320, 30310.2, 3),
+    ]
+
+    # Polling the same candles again does not rewrite them
+    assert await process_ohlc(1, second, db_session) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_process_ohlc_stores_under_requested_pair_name(db_session):
+    # Requested as XBTUSD, the name of the OHLCVT files, Kraken answers XXBTZUSD
+    db_session.add(ModelAssetsPairs(pair_name="XBTUSD", data={}))
+    await db_session.commit()
+
+    first = ohlc_response(FIRST_POLL, 1688671200).result
+    assert await process_ohlc(1, first, db_session, pair_name="XBTUSD") == (2, 0)
+
+    assert await get_ohlc_since("XBTUSD", 1, db_session) == 1688671200
+    assert await get_ohlc_since("XXBTZUSD", 1, db_session) is None
+    names = await db_session.scalars(select(ModelOHLCAssetPair.name))
+    assert names.all() == ["XBTUSD"]
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from krakenfx.services.account_data import ledgerService
+from krakenfx.utils.pagination import iter_offset_pages
+
+TOTAL_RECORDS = 230
+PAGE_SIZE = 50
+
+
+@pytest.mark.asyncio
+async def test_iter_offset_pages_fetches_every_page_in_order():
+    in_flight = 0
+    max_in_flight = 0
+    requested_offsets = []
+
+    async def fetch_page(ofs):
+        nonlocal in_flight, max_in_flight
+        requested_offsets.append(ofs)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later pages answer faster to check pages are still yielded in order
+        await asyncio.sleep(0.01 / (1 + ofs))
+        in_flight -= 1
+        ids = range(ofs, min(ofs + PAGE_SIZE, TOTAL_RECORDS))
+        return {"count": TOTAL_RECORDS, "items": {f"L{i}": i for i in ids}}
+
+    pages = [
+        page
+        async for page in iter_offset_pages(
+            fetch_page,
+            get_items=lambda page: page["items"],
+            get_count=lambda page: page["count"],
+            concurrency=2,
+        )
+    ]
+
+    assert sorted(requested_offsets) == [0, 50, 100, 150, 200]
+    assert max_in_flight <= 2
+    assert [len(page) for page in pages] == [50, 50, 50, 50, 30]
+    assert [value for page in pages for value in page.values()] == list(
+        range(TOTAL_RECORDS)
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_offset_pages_stops_on_empty_first_page():
+    async def fetch_page(ofs):
+        return {"count": 0, "items": {}}
+
+    pages = [
+        page
+        async for page in iter_offset_pages(
+            fetch_page,
+            get_items=lambda page: page["items"],
+            get_count=lambda page: page["count"],
+        )
+    ]
+    assert pages == []
+
+
+@pytest.mark.asyncio
+async def test_private_pages_are_fetched_one_at_a_time_by_default(monkeypatch):
+    # Each page is signed with a nonce, pages in flight together could reach
+    # Kraken out of order
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch_ledgers(settings, start, end, ofs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        ids = range(ofs, min(ofs + PAGE_SIZE, TOTAL_RECORDS))
+        return SimpleNamespace(
+            result=SimpleNamespace(
+                ledger={f"L{i}": i for i in ids}, count=TOTAL_RECORDS
+            )
+        )
+
+    monkeypatch.setattr(ledgerService, "fetch_ledgers", fetch_ledgers)
+    pages = [page async for page in ledgerService.iter_ledgers(settings=None)]
+
+    assert len(pages) == 5
+    assert max_in_flight == 1
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from krakenfx.services.syncJobs import iter_fetched
+from krakenfx.utils.errors import KrakenNoItemsReturnedException
+from krakenfx.utils.pipeline import run_pipeline
+
+
+class Pages:
+    """Source of pages recording when each one is fetched."""
+
+    def __init__(self, count, events):
+        self.count = count
+        self.events = events
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            for number in range(self.count):
+                await asyncio.sleep(0.01)
+                self.events.append(("fetched", number))
+                yield {"page": number}
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_fetch_overlaps_store_in_order():
+    events = []
+
+    async def store(page):
+        events.append(("storing", page["page"]))
+        await asyncio.sleep(0.03)
+        events.append(("stored", page["page"]))
+
+    assert await run_pipeline(Pages(4, events).__aiter__(), [store]) == 4
+
+    assert [event[1] for event in events if event[0] == "stored"] == [0, 1, 2, 3]
+    # Page 1 is fetched while page 0 is being stored
+    assert events.index(("fetched", 1)) < events.index(("stored", 0))
+
+
+@pytest.mark.asyncio
+async def test_queue_bounds_the_fetch_ahead():
+    events = []
+    release = asyncio.Event()
+
+    async def store(page):
+        await release.wait()
+
+    task = asyncio.create_task(
+        run_pipeline(Pages(10, events).__aiter__(), [store], queue_size=2)
+    )
+    await asyncio.sleep(0.2)
+    # One page in the store stage, two queued, one waiting to be queued
+    assert len(events) == 4
+    release.set()
+    assert await task == 10
+
+
+@pytest.mark.asyncio
+async def test_stages_chain_and_drop():
+    stored = []
+
+    async def validate(page):
+        return page if page["page"] % 2 == 0 else None
+
+    async def store(page):
+        stored.append(page["page"])
+
+    assert await run_pipeline(Pages(5, []).__aiter__(), [validate, store]) == 3
+    assert stored == [0, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_store_failure_stops_the_source():
+    pages = Pages(10, [])
+    source = pages.__aiter__()
+
+    async def store(page):
+        if page["page"] == 1:
+            raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        await run_pipeline(source, [store])
+    assert pages.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_fetched_skips_empty_results():
+    async def no_orders():
+        raise KrakenNoItemsReturnedException("No items found! Order: 0")
+
+    async def closed_orders():
+        return {"OABC": {}}
+
+    results = [
+        result
+        async for result in iter_fetched(no_orders, closed_orders, description="orders")
+    ]
+    assert results == [{"OABC": {}}]
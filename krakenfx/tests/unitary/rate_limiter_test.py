@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.utils.rate_limiter import TokenBucket
+
+container = AppContainer()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_queues_calls_over_the_limit():
+    bucket = TokenBucket(max_counter=2, decay_rate=20)
+
+    started = time.monotonic()
+    assert await bucket.acquire() == 0
+    assert await bucket.acquire() == 0
+    # Counter is full, the third call must wait for 1 / 20 s of decay
+    assert await bucket.acquire() > 0
+    assert time.monotonic() - started >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_serves_waiting_calls_in_order():
+    bucket = TokenBucket(max_counter=1, decay_rate=50)
+    served = []
+
+    async def call(index):
+        await bucket.acquire()
+        served.append(index)
+
+    await asyncio.gather(*(call(index) for index in range(5)))
+    assert served == [0, 1, 2, 3, 4]
+
+
+def test_rate_limiter_endpoint_costs():
+    rate_limiter = container.api_container().rate_limiter()
+
+    assert rate_limiter.get_cost("/0/private/Ledgers") == 2
+    assert rate_limiter.get_cost("/0/private/TradesHistory") == 2
+    assert rate_limiter.get_cost("/0/private/Balance") == 1
+    assert rate_limiter.get_cost("/0/public/Ticker") == 1
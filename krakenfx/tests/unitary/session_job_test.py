@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.storeSyncState import get_sync_start, update_sync_cursor
+from krakenfx.services import syncJobs
+from krakenfx.services.account_data.schemas.ledgerSchemas import SchemasLedger
+from krakenfx.utils.database import DatabaseFactory
+from krakenfx.utils.errors import KrakenNoItemsReturnedException
+from krakenfx.utils.jobs import session_job, skip_if_empty
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session_provider():
+    """Sessions of the SQLite engine, handed out like DatabaseContainer.session."""
+    database_factory = container.database_container().database_factory()
+    engine = await database_factory.get_sqlite_memory_async_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async_session = await database_factory.get_sqlite_memory_async_session_factory()
+
+    opened = []
+
+    @asynccontextmanager
+    async def provider():
+        async with async_session() as session:
+            opened.append(session)
+            yield session
+
+    provider.opened = opened
+    yield provider
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.mark.asyncio
+async def test_one_session_per_run(session_provider):
+    async def job(session):
+        await update_sync_cursor("Ledgers", session, last_time=1700000000.0)
+        await session.commit()
+        return await get_sync_start("Ledgers", session)
+
+    run = session_job(job, session_provider)
+    assert run.__name__ == "job"
+    assert await run() == 1700000000.0
+    assert await run() == 1700000000.0
+
+    first, second = session_provider.opened
+    assert first is not second
+    assert not first.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_rolls_back(session_provider):
+    async def job(session):
+        await update_sync_cursor("Ledgers", session, last_time=1700000000.0)
+        raise RuntimeError("Kraken unavailable")
+
+    with pytest.raises(RuntimeError):
+        await session_job(job, session_provider)()
+
+    async with session_provider() as session:
+        count = await session.scalar(text("SELECT COUNT(*) FROM sync_state"))
+    assert count == 0
+    assert not session_provider.opened[0].in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_skip_if_empty():
+    async def fetch_nothing():
+        raise KrakenNoItemsReturnedException("No items found! Return: 0")
+
+    async def fetch_one():
+        return {"OABC": {}}
+
+    assert await skip_if_empty(fetch_nothing(), logger, "orders") is None
+    assert await skip_if_empty(fetch_one(), logger, "orders") == {"OABC": {}}
+
+
+@pytest.mark.asyncio
+async def test_async_session_factory_awaits_engine():
+    # A factory of our own, the application one keeps its cached engines
+    saved = DatabaseFactory._instance
+    DatabaseFactory._instance = None
+    try:
+        database_factory = DatabaseFactory(
+            container.config_container().config(), logger
+        )
+        engine = await database_factory.get_async_engine()
+        async with database_factory.session() as session:
+            assert session.bind is engine
+        await engine.dispose()
+    finally:
+        DatabaseFactory._instance = saved
+
+
+def make_ledger(time):
+    return SchemasLedger(
+        aclass="currency",
+        amount="0.5",
+        asset="XXBT",
+        balance="1.0",
+        fee="0.0",
+        refid=f"R{time}",
+        time=time,
+        type="trade",
+    )
+
+
+def pages_then(pages, error=None):
+    """Stand-in for iter_ledgers yielding `pages`, newest first, then failing."""
+
+    async def iter_ledgers(settings, start=None, *, concurrency):
+        # One page at a time unless the key has a nonce window
+        assert concurrency == settings.KRAKEN_PAGE_CONCURRENCY == 1
+        for page in pages:
+            yield page
+        if error:
+            # Let the store stage write the pages yielded so far first
+            await asyncio.sleep(0.1)
+            raise error
+
+    return iter_ledgers
+
+
+@pytest.mark.asyncio
+async def test_ledgers_cursor_moves_after_the_whole_run(session_provider, monkeypatch):
+    pages = [
+        {"L3": make_ledger(1700000300.0), "L2": make_ledger(1700000200.0)},
+        {"L1": make_ledger(1700000100.0)},
+    ]
+
+    monkeypatch.setattr(
+        syncJobs, "iter_ledgers", pages_then(pages[:1], RuntimeError("timeout"))
+    )
+    with pytest.raises(RuntimeError):
+        await session_job(syncJobs.ledgers_job, session_provider)()
+    async with session_provider() as session:
+        # The older page was never stored, the next run must fetch it again
+        assert await get_sync_start("Ledgers", session) is None
+
+    monkeypatch.setattr(syncJobs, "iter_ledgers", pages_then(pages))
+    assert await session_job(syncJobs.ledgers_job, session_provider)() == 2
+    async with session_provider() as session:
+        assert await get_sync_start("Ledgers", session) == "L3"
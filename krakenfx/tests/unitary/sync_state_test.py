@@ -0,0 +1,138 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.recentTradesModel import ModelRecentTrade
+from krakenfx.repository.models.spreadsModel import ModelSpread
+from krakenfx.repository.storeRecentTrades import process_recent_trades
+from krakenfx.repository.storeSpreads import process_spreads
+from krakenfx.repository.storeSyncState import (
+    get_sync_cursor,
+    get_sync_start,
+    update_sync_cursor,
+)
+from krakenfx.services.spot_market_data.schemas.recentTradesSchemas import (
+    SchemasRecentTradesResponse,
+)
+from krakenfx.services.spot_market_data.schemas.spreadsSchemas import (
+    SchemasGetRecentSpreadsResponse,
+)
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_sync_cursor_only_moves_forward(db_session):
+    assert await get_sync_start("Ledgers", db_session) is None
+
+    await update_sync_cursor(
+        "Ledgers", db_session, last_time=1700000100.5, last_id="L2"
+    )
+    await db_session.commit()
+    assert await get_sync_start("Ledgers", db_session) == "L2"
+
+    # An older batch (e.g. a backfill) must not move the cursor back
+    await update_sync_cursor("Ledgers", db_session, last_time=1600000000, last_id="L1")
+    orm_syncState = await get_sync_cursor("Ledgers", db_session)
+    assert (orm_syncState.last_time, orm_syncState.last_id) == (1700000100.5, "L2")
+
+
+@pytest.mark.asyncio
+async def test_sync_cursor_scoped_per_pair(db_session):
+    await update_sync_cursor("Trades", db_session, last_id="1688", scope="XXBTZUSD")
+    await update_sync_cursor("ClosedOrders", db_session, last_time=1700000000.0)
+    await db_session.commit()
+
+    assert await get_sync_start("Trades", db_session, scope="XXBTZUSD") == "1688"
+    assert await get_sync_start("Trades", db_session, scope="XETHZUSD") is None
+    assert await get_sync_start("ClosedOrders", db_session) == 1700000000.0
+
+
+@pytest.mark.asyncio
+async def test_recent_trades_cursor_per_pair(db_session):
+    # Requested as XBTUSD, Kraken answers with XXBTZUSD
+    Trades = SchemasRecentTradesResponse.from_response(
+        {
+            "error": [],
+            "result": {
+                "XXBTZUSD": [
+                    ["30243.4", "0.34", 1688669597.827, "b", "m", "", 61044951],
+                    ["30243.3", "0.00", 1688669597.961, "s", "l", "", 61044952],
+                ],
+                "last": "1688669597961482064",
+            },
+        }
+    )
+    assert await process_recent_trades("XBTUSD", Trades, db_session) == (2, 0)
+    assert await process_recent_trades("XBTUSD", Trades, db_session) == (0, 0)
+
+    pairs = await db_session.scalars(select(ModelRecentTrade.pair).distinct())
+    assert pairs.all() == ["XBTUSD"]
+    assert await get_sync_start("Trades", db_session, scope="XBTUSD") == (
+        "1688669597961482064"
+    )
+
+
+@pytest.mark.asyncio
+async def test_spreads_cursor_per_pair(db_session):
+    Spreads = SchemasGetRecentSpreadsResponse(
+        **{
+            "error": [],
+            "result": {
+                "XXBTZUSD": [
+                    [1688671834, "30292.10000", "30297.50000"],
+                    [1688671834, "30292.10000", "30296.70000"],
+                    [1688671835, "30292.70000", "30296.70000"],
+                ],
+                "last": 1688671835,
+            },
+        }
+    )
+    assert await process_spreads("XXBTZUSD", Spreads, db_session) == (2, 0)
+
+    # Only the last spread of a second is kept
+    ask = await db_session.scalar(
+        select(ModelSpread.ask).where(ModelSpread.timestamp == 1688671834)
+    )
+    assert ask == "30296.70000"
+    assert await db_session.scalar(select(func.count()).select_from(ModelSpread)) == 2
+    assert await get_sync_start("Spread", db_session, scope="XXBTZUSD") == (
+        "1688671835"
+    )
@@ -0,0 +1,93 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+
+from krakenfx.di.app_container import AppContainer
+from krakenfx.repository.models._base import Base
+from krakenfx.repository.models.tradesModel import ModelTradeInfo as ORMTradeInfo
+from krakenfx.repository.storeTradeHistory import process_tradeHistory
+from krakenfx.services.account_data.schemas.tradesSchemas import SchemasTradeInfo
+
+container = AppContainer()
+
+# Retrieve the logger from the container
+logger = container.logger_container().logger()
+logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def engine():
+    return (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_engine()
+    )
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def create_tables(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    async_session = (
+        await container.database_container()
+        .database_factory()
+        .get_sqlite_memory_async_session_factory()
+    )
+    async with async_session() as session:
+        yield session
+
+
+def make_trades(count, fee="1.0"):
+    return {
+        f"T{index:05d}": SchemasTradeInfo(
+            trade_id=0,
+            ordertxid=f"O{index:05d}",
+            postxid="P0001",
+            pair="XXBTZUSD",
+            time=1700000000.0 + index,
+            type="buy",
+            ordertype="limit",
+            price="30000.0",
+            cost="300.0",
+            fee=fee if index == 0 else "1.0",
+            vol="0.01",
+            margin="0.0",
+            maker=True,
+        )
+        for index in range(count)
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_tradeHistory_prefetch(db_session, engine):
+    assert await process_tradeHistory(make_trades(200), db_session) == (200, 0)
+    assert await db_session.scalar(select(func.count(ORMTradeInfo.id))) == 200
+
+    selects = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_selects)
+    try:
+        Trades = make_trades(201, fee="2.0")
+        assert await process_tradeHistory(Trades, db_session) == (1, 1)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_selects)
+
+    # One prefetch of trade_info plus the sync cursor lookup
+    trade_selects = [statement for statement in selects if "trade_info" in statement]
+    assert len(trade_selects) == 1
+
+    orm_tradeInfo = await db_session.get(ORMTradeInfo, "T00000")
+    assert orm_tradeInfo.fee == "2.0"
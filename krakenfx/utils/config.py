@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import List, Optional
 
 import dotenv
 from pydantic import HttpUrl, PostgresDsn
@@ -16,6 +17,66 @@ class Settings(BaseSettings):
     KRAKEN_API_SECRET: str
     LOGGING_LEVEL: str
 
+    # Log handlers run on a background thread behind a bounded queue. When it
+    # is full, "drop" discards the records below WARNING, "block" waits
+    LOGGING_QUEUE_ENABLED: bool = True
+    LOGGING_QUEUE_SIZE: int = 10000
+    LOGGING_QUEUE_POLICY: str = "drop"
+
+    # SQLAlchemy engines. Statements are only logged with DATABASE_ECHO, the
+    # pool is sized for the concurrent jobs (pool_size + max_overflow
+    # connections at most) and recycled before the server drops idle ones.
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 1800
+    # Prepared statements cached per asyncpg connection, 0 behind pgbouncer
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # Rows per batched INSERT ... VALUES of executemany(), and the psycopg2
+    # executemany_mode of the sync engine
+    DATABASE_INSERTMANYVALUES_PAGE_SIZE: int = 1000
+    DATABASE_EXECUTEMANY_MODE: str = "values_plus_batch"
+
+    # Shared HTTP client (connection pooling)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 30.0
+    HTTP2_ENABLED: bool = False
+
+    # Rate limiting (defaults match Kraken's Starter tier)
+    RATE_LIMIT_PRIVATE_MAX_COUNTER: float = 15
+    RATE_LIMIT_PRIVATE_DECAY_RATE: float = 0.33
+    RATE_LIMIT_PUBLIC_MAX_COUNTER: float = 1
+    RATE_LIMIT_PUBLIC_DECAY_RATE: float = 1.0
+
+    # Pages waiting between the fetch and store stages of the sync jobs
+    PIPELINE_QUEUE_SIZE: int = 2
+
+    # Pages of Ledgers, TradesHistory and ClosedOrders fetched at the same time
+    # by the sync jobs. Above 1 nonces can reach Kraken out of order: only
+    # raise it when the API key has a nonce window
+    KRAKEN_PAGE_CONCURRENCY: int = 1
+
+    # Nonce state shared across restarts and worker processes (disabled if unset)
+    NONCE_STATE_FILE: Optional[str] = None
+
+    # Cache of the resampled OHLC candles, entries expire after the TTL (seconds).
+    # The TTL also bounds how long candles imported by another process go unseen
+    OHLC_RESAMPLE_CACHE_SIZE: int = 256
+    OHLC_RESAMPLE_CACHE_TTL: float = 60.0
+
+    # Pairs and intervals in minutes polled on /0/public/OHLC by the scheduler.
+    # Candles are stored under these names: use the names of the imported
+    # OHLCVT files (e.g. ["XBTUSD"]) to extend the imported series
+    OHLC_SYNC_PAIRS: List[str] = []
+    OHLC_SYNC_INTERVALS: List[int] = [1]
+
+    # Pairs polled on /0/public/Trades and /0/public/Spread by the scheduler
+    RECENT_TRADES_SYNC_PAIRS: List[str] = []
+    SPREADS_SYNC_PAIRS: List[str] = []
+
     model_config = SettingsConfigDict(
         env_file=str(env_path),
         env_prefix="",
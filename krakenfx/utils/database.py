@@ -1,6 +1,8 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -37,12 +39,34 @@ class DatabaseFactory:
             self._sqlite_memory_sync_session_factory = None
             self._initialized = True
 
+    def _engine_options(self, url: str) -> dict:
+        """Keyword arguments of the PostgreSQL engines, read from the settings."""
+        settings = self._settings
+        options = {
+            "future": True,
+            "echo": settings.DATABASE_ECHO,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+            "insertmanyvalues_page_size": settings.DATABASE_INSERTMANYVALUES_PAGE_SIZE,
+        }
+        driver = make_url(url).get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {
+                "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE
+            }
+        elif driver == "psycopg2":
+            options["executemany_mode"] = settings.DATABASE_EXECUTEMANY_MODE
+        return options
+
     # PostgreSQL methods
     async def get_async_engine(self):
         if not self._async_engine:
             try:
+                url = self._settings.DATABASE_URL.unicode_string()
                 self._async_engine = create_async_engine(
-                    self._settings.DATABASE_URL.unicode_string(), future=True, echo=True
+                    url, **self._engine_options(url)
                 )
                 self._logger.info(
                     "Async PostgreSQL database engine created successfully."
@@ -57,9 +81,8 @@ class DatabaseFactory:
     def get_sync_engine(self):
         if not self._sync_engine:
             try:
-                self._sync_engine = create_engine(
-                    self._settings.DATABASE_URL.unicode_string(), future=True, echo=True
-                )
+                url = self._settings.DATABASE_URL.unicode_string()
+                self._sync_engine = create_engine(url, **self._engine_options(url))
                 self._logger.info(
                     "Sync PostgreSQL database engine created successfully."
                 )
@@ -73,7 +96,7 @@ class DatabaseFactory:
     async def get_async_session_factory(self):
         if not self._async_session_factory:
             try:
-                async_engine = self.get_async_engine()
+                async_engine = await self.get_async_engine()
                 self._async_session_factory = sessionmaker(
                     bind=async_engine, class_=AsyncSession, expire_on_commit=False
                 )
@@ -105,9 +128,20 @@ class DatabaseFactory:
         return self._sync_session_factory
 
     async def get_async_session(self):
-        async_session_factory = self.get_async_session_factory()
+        async_session_factory = await self.get_async_session_factory()
         return async_session_factory()
 
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Session on the pooled PostgreSQL engine, closed on exit.
+
+        Closing the session rolls back what was not committed and returns its
+        connection to the pool, also when the body raises.
+        """
+        async_session_factory = await self.get_async_session_factory()
+        async with async_session_factory() as session:
+            yield session
+
     def get_sync_session(self):
         sync_session_factory = self.get_sync_session_factory()
         return sync_session_factory()
@@ -117,7 +151,9 @@ class DatabaseFactory:
         if not self._sqlite_memory_async_engine:
             try:
                 self._sqlite_memory_async_engine = create_async_engine(
-                    "sqlite+aiosqlite:///:memory:", future=True, echo=True
+                    "sqlite+aiosqlite:///:memory:",
+                    future=True,
+                    echo=self._settings.DATABASE_ECHO,
                 )
                 self._logger.info(
                     "SQLite memory async database engine created successfully."
@@ -133,7 +169,9 @@ class DatabaseFactory:
         if not self._sqlite_memory_sync_engine:
             try:
                 self._sqlite_memory_sync_engine = create_engine(
-                    "sqlite:///:memory:", future=True, echo=True
+                    "sqlite:///:memory:",
+                    future=True,
+                    echo=self._settings.DATABASE_ECHO,
                 )
                 self._logger.info(
                     "SQLite memory sync database engine created successfully."
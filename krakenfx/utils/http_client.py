@@ -0,0 +1,106 @@
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+
+from krakenfx.utils.config import Settings
+
+
+class HttpClientFactory:
+    _instance = None
+    _initialized = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(
+        self,
+        settings: Settings,
+        logger: logging.Logger,
+    ):
+        if not self._initialized:
+            self._settings = settings
+            self._logger = logger
+            self._async_client = None
+            self._async_client_loop = None
+            self._stale_client_tasks = set()
+            self._initialized = True
+
+    def _http2_enabled(self) -> bool:
+        if not self._settings.HTTP2_ENABLED:
+            return False
+        # HTTP/2 support in httpx relies on the optional 'h2' package
+        if importlib.util.find_spec("h2") is None:
+            self._logger.warning(
+                "HTTP2_ENABLED is set but package 'h2' is not installed, falling back to HTTP/1.1."
+            )
+            return False
+        return True
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared AsyncClient, creating it on first use.
+
+        Pooled connections are bound to the event loop that opened them, so a new
+        client is created if the running loop differs from the one that owns it,
+        the previous one is closed (see _close_stale_client).
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_client is None
+            or self._async_client.is_closed
+            or self._async_client_loop is not loop
+        ):
+            if self._async_client is not None and not self._async_client.is_closed:
+                self._close_stale_client(self._async_client, self._async_client_loop)
+            limits = httpx.Limits(
+                max_connections=self._settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self._settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self._settings.HTTP_KEEPALIVE_EXPIRY,
+            )
+            self._async_client = httpx.AsyncClient(
+                limits=limits,
+                timeout=self._settings.HTTP_TIMEOUT,
+                http2=self._http2_enabled(),
+            )
+            self._async_client_loop = loop
+            self._logger.info("Shared HTTP client created successfully.")
+        return self._async_client
+
+    def _close_stale_client(
+        self, client: httpx.AsyncClient, client_loop: asyncio.AbstractEventLoop
+    ):
+        """Close a client replaced because the running loop changed.
+
+        When its loop still runs (in another thread) the client is closed there.
+        Otherwise its connections cannot be closed gracefully anymore: the client
+        is closed from the running loop and the transport errors are only logged.
+        """
+        if client_loop.is_running() and not client_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            self._logger.info("Previous shared HTTP client closed on its event loop.")
+            return
+        task = asyncio.get_running_loop().create_task(self._drop_stale_client(client))
+        self._stale_client_tasks.add(task)
+        task.add_done_callback(self._stale_client_tasks.discard)
+
+    async def _drop_stale_client(self, client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+            self._logger.info("Previous shared HTTP client closed.")
+        except Exception as e:
+            self._logger.warning(
+                f"Previous shared HTTP client dropped, its event loop is gone: {e!r}"
+            )
+
+    async def close(self):
+        if self._stale_client_tasks:
+            await asyncio.gather(*self._stale_client_tasks)
+        if self._async_client is not None and not self._async_client.is_closed:
+            await self._async_client.aclose()
+            self._logger.info("Shared HTTP client closed.")
+        self._async_client = None
+        self._async_client_loop = None
@@ -0,0 +1,40 @@
+import functools
+import logging
+from contextlib import AbstractAsyncContextManager
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from krakenfx.utils.errors import KrakenNoItemsReturnedException
+
+T = TypeVar("T")
+
+
+def session_job(
+    job: Callable[[AsyncSession], Awaitable[T]],
+    session_provider: Callable[[], AbstractAsyncContextManager],
+) -> Callable[[], Awaitable[T]]:
+    """Wrap `job(session)` into a scheduler job opening one session per run.
+
+    `session_provider` is DatabaseContainer.session: the session is taken from
+    the engine pool when the run starts and given back when it ends, whether
+    the job succeeded or raised.
+    """
+
+    @functools.wraps(job)
+    async def run() -> T:
+        async with session_provider() as session:
+            return await job(session)
+
+    return run
+
+
+async def skip_if_empty(
+    fetch: Awaitable[T], logger: logging.Logger, description: str
+) -> T:
+    """Await a fetch, returning None when Kraken has nothing new to return."""
+    try:
+        return await fetch
+    except KrakenNoItemsReturnedException:
+        logger.flow2(f"No new {description} returned, nothing to store.")
+        return None
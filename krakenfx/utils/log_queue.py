@@ -0,0 +1,179 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Sequence, Tuple
+
+from krakenfx.utils.config import Settings
+
+# "drop": when the queue is full, records below WARNING are dropped and counted
+# "block": the caller waits for the listener thread to make room
+LOG_QUEUE_POLICIES = ("drop", "block")
+
+
+class LogQueueHandler(QueueHandler):
+    """Queue the records of a logger for the handlers moved off this thread.
+
+    The record is merged with its args here, so payloads are serialized on the
+    calling thread, the listener thread only formats and writes.
+    """
+
+    def __init__(self, pipeline: "LogQueuePipeline", handlers: Sequence):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.handlers: Tuple[logging.Handler, ...] = tuple(handlers)
+
+    def enqueue(self, record: logging.LogRecord):
+        self.pipeline.put(record, self.handlers)
+
+    def close(self):
+        self.pipeline.flush()
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+
+def _dispatch(record: logging.LogRecord, handlers: Tuple[logging.Handler, ...]):
+    for handler in handlers:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class _RoutingQueueListener(QueueListener):
+    """Dispatch each queued record to the handlers of the logger it came from."""
+
+    def handle(self, item):
+        _dispatch(*item)
+
+    def enqueue_sentinel(self):
+        # put_nowait() of the base class fails on a full bounded queue
+        self.queue.put(self._sentinel)
+
+
+class LogQueuePipeline:
+    """Move the I/O of the logging handlers to a background thread.
+
+    Handlers attached to a logger (coloredlogs streams, log files) are moved
+    behind a single LogQueueHandler and run by a QueueListener thread, so a
+    slow terminal or disk does not stall the event loop. The queue holds at
+    most LOGGING_QUEUE_SIZE records, LOGGING_QUEUE_POLICY decides what happens
+    when it is full. The listener thread starts on the first attach.
+    """
+
+    _instance = None
+    _initialized = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, settings: Settings):
+        if not self._initialized:
+            self.enabled = settings.LOGGING_QUEUE_ENABLED
+            self.policy = settings.LOGGING_QUEUE_POLICY
+            if self.policy not in LOG_QUEUE_POLICIES:
+                raise ValueError(
+                    f"Unknown LOGGING_QUEUE_POLICY {self.policy}, "
+                    f"expected one of {', '.join(LOG_QUEUE_POLICIES)}."
+                )
+            self.queue = queue.Queue(maxsize=settings.LOGGING_QUEUE_SIZE)
+            self.dropped = 0
+            self._dropped_lock = threading.Lock()
+            self._listener = None
+            self._initialized = True
+
+    @classmethod
+    def current(cls) -> Optional["LogQueuePipeline"]:
+        """The pipeline if it was configured, None otherwise."""
+        if cls._instance is None or not cls._instance._initialized:
+            return None
+        return cls._instance
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None and self._listener._thread is not None
+
+    def start(self):
+        if not self.running:
+            self._listener = _RoutingQueueListener(self.queue)
+            self._listener.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Write out the queued records and stop the listener thread."""
+        if self.running:
+            self._listener.stop()
+            atexit.unregister(self.stop)
+
+    def flush(self):
+        """Wait until every queued record has been handled."""
+        if self.running and not self._on_listener_thread():
+            self.queue.join()
+
+    def attach(
+        self, logger: logging.Logger, handlers: Sequence[logging.Handler]
+    ) -> Optional[LogQueueHandler]:
+        """Move handlers of a logger behind the queue.
+
+        Only the given handlers are moved, those added by someone else (e.g.
+        pytest's capture handlers) stay on the logger. They replace the
+        handlers of a previous attach, as coloredlogs and setup_custom_logging
+        replace the handlers they installed.
+        """
+        if not self.enabled or not handlers:
+            return None
+        for handler in handlers:
+            logger.removeHandler(handler)
+        queue_handler = next(
+            (
+                handler
+                for handler in logger.handlers
+                if isinstance(handler, LogQueueHandler)
+            ),
+            None,
+        )
+        if queue_handler is None:
+            queue_handler = LogQueueHandler(self, handlers)
+            logger.addHandler(queue_handler)
+        else:
+            self.flush()
+            queue_handler.handlers = tuple(handlers)
+        self.start()
+        return queue_handler
+
+    def put(self, record: logging.LogRecord, handlers: Tuple[logging.Handler, ...]):
+        if not self.running or self._on_listener_thread():
+            # A handler logging from the listener thread must not wait on itself
+            _dispatch(record, handlers)
+            return
+
+        if self.policy == "block" or record.levelno >= logging.WARNING:
+            self.queue.put((record, handlers))
+            return
+
+        with self._dropped_lock:
+            try:
+                if self.dropped:
+                    self.queue.put_nowait((self._dropped_record(), handlers))
+                    self.dropped = 0
+                self.queue.put_nowait((record, handlers))
+            except queue.Full:
+                self.dropped += 1
+
+    def _dropped_record(self) -> logging.LogRecord:
+        return logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            f"Log queue full, {self.dropped} log records dropped.",
+            None,
+            None,
+        )
+
+    def _on_listener_thread(self) -> bool:
+        thread = self._listener._thread if self._listener else None
+        return thread is not None and thread is threading.current_thread()
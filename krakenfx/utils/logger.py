@@ -1,14 +1,42 @@
 import inspect
+import json
 import logging
 import os
 from datetime import datetime
+from typing import Optional
 
 import coloredlogs
 
 from krakenfx.utils.config import Settings
+from krakenfx.utils.log_queue import LogQueuePipeline
 
 
-def setup_main_logging(settings: Settings):
+class LazyJson:
+    """Defer json.dumps until the log record is actually formatted.
+
+    Meant as a %-style argument of the custom levels, e.g.
+    logger.trace("Orders:\n%s", LazyJson(Orders)). When `obj` is callable it is
+    only called at that time too, e.g. LazyJson(trade.model_dump).
+    """
+
+    __slots__ = ("obj", "kwargs", "_text")
+
+    def __init__(self, obj, **kwargs):
+        self.obj = obj
+        self.kwargs = {"indent": 4, "default": str, **kwargs}
+        self._text = None
+
+    def __str__(self):
+        # Serialized once, even when the record is formatted by several handlers
+        if self._text is None:
+            obj = self.obj() if callable(self.obj) else self.obj
+            self._text = json.dumps(obj, **self.kwargs)
+        return self._text
+
+
+def setup_main_logging(
+    settings: Settings, log_pipeline: Optional[LogQueuePipeline] = None
+):
     # Define custom logging levels
     TRACE_LEVEL_NUM = 5
     FLOW1_LEVEL_NUM = 25
@@ -18,17 +46,24 @@ def setup_main_logging(settings: Settings):
     logging.addLevelName(FLOW1_LEVEL_NUM, "FLOW1")
     logging.addLevelName(FLOW2_LEVEL_NUM, "FLOW2")
 
+    # The message is built only when the level is enabled: pass %-style args
+    # (LazyJson for serialized payloads) or a callable returning the message.
+    def _log_lazy(self, level, message, args, kwargs):
+        if self.isEnabledFor(level):
+            if callable(message):
+                message = message()
+            # Report the caller of trace/flow1/flow2, not these helpers
+            kwargs.setdefault("stacklevel", 3)
+            self._log(level, message, args, **kwargs)
+
     def trace(self, message, *args, **kwargs):
-        if self.isEnabledFor(TRACE_LEVEL_NUM):
-            self._log(TRACE_LEVEL_NUM, message, args, **kwargs)
+        _log_lazy(self, TRACE_LEVEL_NUM, message, args, kwargs)
 
     def flow1(self, message, *args, **kwargs):
-        if self.isEnabledFor(FLOW1_LEVEL_NUM):
-            self._log(FLOW1_LEVEL_NUM, message, args, **kwargs)
+        _log_lazy(self, FLOW1_LEVEL_NUM, message, args, kwargs)
 
     def flow2(self, message, *args, **kwargs):
-        if self.isEnabledFor(FLOW2_LEVEL_NUM):
-            self._log(FLOW2_LEVEL_NUM, message, args, **kwargs)
+        _log_lazy(self, FLOW2_LEVEL_NUM, message, args, kwargs)
 
     logging.Logger.trace = trace
     logging.Logger.flow1 = flow1
@@ -55,6 +90,13 @@ def setup_main_logging(settings: Settings):
     # Set the log level for the root logger explicitly
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
+    # Handlers installed below are moved behind the log queue at the end.
+    # coloredlogs replaces a stream handler found up the hierarchy, so each
+    # install may land on the root logger rather than on the given one.
+    specific_loggers = ["aiosqlite", "asyncio", "sqlalchemy"]
+    previous_handlers = set(root_logger.handlers)
+    for logger_name in specific_loggers:
+        previous_handlers.update(logging.getLogger(logger_name).handlers)
 
     # Configure basic logging
     logging.basicConfig(
@@ -86,7 +128,6 @@ def setup_main_logging(settings: Settings):
     coloredlogs.install(level=numeric_level, logger=root_logger)
 
     # Ensure specific loggers do not propagate to the root logger
-    specific_loggers = ["aiosqlite", "asyncio", "sqlalchemy"]
     for logger_name in specific_loggers:
         logger = logging.getLogger(logger_name)
         logger.setLevel(numeric_level)
@@ -103,10 +144,26 @@ def setup_main_logging(settings: Settings):
 
     logger = logging.getLogger(caller_module)
     logger.setLevel(numeric_level)
+    previous_handlers.update(logger.handlers)
     coloredlogs.install(
         level=numeric_level, fmt="%(levelname)s - %(name)s: %(message)s", logger=logger
     )
 
+    # Move the coloredlogs handlers off the calling (event loop) thread
+    if log_pipeline is not None:
+        handled_loggers = [root_logger, logger] + [
+            logging.getLogger(logger_name) for logger_name in specific_loggers
+        ]
+        for handled_logger in handled_loggers:
+            log_pipeline.attach(
+                handled_logger,
+                [
+                    handler
+                    for handler in handled_logger.handlers
+                    if handler not in previous_handlers
+                ],
+            )
+
     current_level = logging.getLevelName(logger.getEffectiveLevel())
     logger.info(f"Current log level: {current_level}")
 
@@ -117,7 +174,7 @@ def setup_custom_logging(loggername: str, LOG_DIR: str = None, noscreen: bool =
     local_logger = logging.getLogger(loggername)
 
     # Remove existing handlers if they exist
-    while local_logger.hasHandlers():
+    while local_logger.handlers:
         local_logger.removeHandler(local_logger.handlers[0])
 
     if LOG_DIR:
@@ -145,6 +202,10 @@ def setup_custom_logging(loggername: str, LOG_DIR: str = None, noscreen: bool =
             for handler in local_logger.handlers
             if isinstance(handler, logging.FileHandler)
         ]
+
+    log_pipeline = LogQueuePipeline.current()
+    if log_pipeline is not None:
+        log_pipeline.attach(local_logger, list(local_logger.handlers))
     return local_logger
 
 
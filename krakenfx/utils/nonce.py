@@ -0,0 +1,63 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+
+from krakenfx.utils.config import Settings
+
+
+class NonceManager:
+    """Process-wide generator of strictly increasing API nonces.
+
+    Nonces are millisecond timestamps bumped by one whenever two calls land in
+    the same millisecond. When NONCE_STATE_FILE is set, the last nonce is kept
+    in that file under an exclusive lock so it survives restarts and is shared
+    by every worker process using the same API key.
+    """
+
+    _instance = None
+    _initialized = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(
+        self,
+        settings: Settings,
+        logger: logging.Logger,
+    ):
+        if not self._initialized:
+            self._settings = settings
+            self._logger = logger
+            self._state_file = settings.NONCE_STATE_FILE
+            self._lock = threading.Lock()
+            self._last_nonce = 0
+            self._initialized = True
+
+    def next_nonce(self) -> int:
+        with self._lock:
+            nonce = max(self._last_nonce + 1, int(time.time() * 1000))
+            if self._state_file:
+                nonce = self._reserve_persisted_nonce(nonce)
+            self._last_nonce = nonce
+            return nonce
+
+    def _reserve_persisted_nonce(self, nonce: int) -> int:
+        fd = os.open(self._state_file, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                content = state_file.read().strip()
+                if content:
+                    nonce = max(nonce, int(content) + 1)
+                state_file.seek(0)
+                state_file.write(str(nonce))
+                state_file.truncate()
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+        return nonce
@@ -0,0 +1,60 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+# Number of records Kraken returns per page on offset paginated endpoints
+KRAKEN_PAGE_SIZE = 50
+
+T = TypeVar("T")
+
+
+async def iter_offset_pages(
+    fetch_page: Callable[[int], Awaitable[T]],
+    get_items: Callable[[T], Dict],
+    get_count: Callable[[T], Optional[int]],
+    concurrency: int = 1,
+) -> AsyncIterator[Dict]:
+    """Yield every page of an `ofs` paginated Kraken endpoint.
+
+    The first page gives the total `count`, the remaining offsets are then
+    fetched with up to `concurrency` requests in flight (still subject to the
+    shared rate limiter) and yielded in offset order. Only the pages in flight
+    are held in memory.
+
+    Args:
+        fetch_page: Coroutine function fetching the page starting at an offset.
+        get_items: Returns the records of a page.
+        get_count: Returns the total number of records reported by a page.
+        concurrency: Maximum number of pages fetched at the same time. Private
+            requests in flight together can reach Kraken with their nonces out
+            of order, above 1 the API key needs a nonce window.
+    """
+    first_page = await fetch_page(0)
+    first_items = get_items(first_page)
+    if not first_items:
+        return
+    yield first_items
+
+    count = get_count(first_page) or 0
+    page_size = len(first_items)
+    offsets = iter(range(page_size, count, page_size))
+
+    pending = deque()
+    try:
+        for ofs in offsets:
+            pending.append(asyncio.create_task(fetch_page(ofs)))
+            if len(pending) >= concurrency:
+                break
+
+        while pending:
+            page = await pending.popleft()
+            ofs = next(offsets, None)
+            if ofs is not None:
+                pending.append(asyncio.create_task(fetch_page(ofs)))
+
+            items = get_items(page)
+            if items:
+                yield items
+    finally:
+        for task in pending:
+            task.cancel()
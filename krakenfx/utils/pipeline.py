@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+# Marks the end of the stream on the queue between two stages
+_DONE = object()
+
+Stage = Callable[[Any], Awaitable[Optional[Any]]]
+
+
+async def run_pipeline(
+    source: AsyncIterator[Any], stages: Sequence[Stage], queue_size: int = 2
+) -> int:
+    """Stream the items of `source` through `stages`, each stage in its own task.
+
+    Stages are connected by queues of at most `queue_size` items, so the
+    source keeps fetching page N+1 while a later stage stores page N, and
+    stops fetching when the store falls `queue_size` pages behind. A stage
+    returns the item handed to the next one, None drops the item. Items go
+    through each stage one at a time and in order, so the last stage can
+    safely use a single session.
+
+    When a stage or the source fails, the other tasks are cancelled and the
+    error is raised.
+
+    Returns:
+        int: Number of items which went through the last stage.
+    """
+    queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    completed = 0
+
+    async def feed():
+        try:
+            async for item in source:
+                await queues[0].put(item)
+        finally:
+            # Let the source clean up, e.g. cancel the pages still in flight
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        await queues[0].put(_DONE)
+
+    async def work(index: int, stage: Stage):
+        nonlocal completed
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+        while (item := await inbox.get()) is not _DONE:
+            item = await stage(item)
+            if outbox is None:
+                completed += 1
+            elif item is not None:
+                await outbox.put(item)
+        if outbox is not None:
+            await outbox.put(_DONE)
+
+    tasks = [asyncio.create_task(feed())] + [
+        asyncio.create_task(work(index, stage)) for index, stage in enumerate(stages)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return completed
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+
+from krakenfx.utils.config import Settings
+
+# Call counter cost per private endpoint, endpoints not listed cost 1.
+# Reference: https://docs.kraken.com/api/docs/guides/spot-rest-ratelimits
+KRAKEN_PRIVATE_ENDPOINT_COSTS = {
+    "/0/private/Ledgers": 2,
+    "/0/private/QueryLedgers": 2,
+    "/0/private/TradesHistory": 2,
+}
+
+
+class TokenBucket:
+    """Call counter that decays over time, modelled on Kraken's API counter.
+
+    Each call increases the counter by its cost and the counter decreases by
+    `decay_rate` per second. Callers wait (in FIFO order) until the call fits
+    under `max_counter` instead of being rejected.
+    """
+
+    def __init__(self, max_counter: float, decay_rate: float):
+        self.max_counter = max_counter
+        self.decay_rate = decay_rate
+        self._counter = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio.Lock binds to the running loop, recreate it if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _decay(self):
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._counter = max(0.0, self._counter - elapsed * self.decay_rate)
+        self._updated_at = now
+
+    @property
+    def counter(self) -> float:
+        self._decay()
+        return self._counter
+
+    async def acquire(self, cost: float = 1) -> float:
+        """Wait until `cost` fits in the bucket and consume it.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        cost = min(cost, self.max_counter)
+        waited = 0.0
+        async with self._get_lock():
+            while True:
+                self._decay()
+                if self._counter + cost <= self.max_counter:
+                    self._counter += cost
+                    return waited
+                delay = (self._counter + cost - self.max_counter) / self.decay_rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class KrakenRateLimiter:
+    _instance = None
+    _initialized = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(
+        self,
+        settings: Settings,
+        logger: logging.Logger,
+    ):
+        if not self._initialized:
+            self._settings = settings
+            self._logger = logger
+            self.private_bucket = TokenBucket(
+                settings.RATE_LIMIT_PRIVATE_MAX_COUNTER,
+                settings.RATE_LIMIT_PRIVATE_DECAY_RATE,
+            )
+            self.public_bucket = TokenBucket(
+                settings.RATE_LIMIT_PUBLIC_MAX_COUNTER,
+                settings.RATE_LIMIT_PUBLIC_DECAY_RATE,
+            )
+            self._initialized = True
+
+    def get_cost(self, urlpath: str) -> int:
+        return KRAKEN_PRIVATE_ENDPOINT_COSTS.get(urlpath, 1)
+
+    async def acquire(self, urlpath: str):
+        """Wait for a slot in the bucket matching the endpoint before calling it."""
+        if urlpath.startswith("/0/private/"):
+            bucket = self.private_bucket
+        else:
+            bucket = self.public_bucket
+
+        cost = self.get_cost(urlpath)
+        waited = await bucket.acquire(cost)
+        if waited > 0:
+            self._logger.debug(
+                f"Rate limiter delayed {urlpath} by {waited:.2f}s (cost: {cost})."
+            )
@@ -0,0 +1,71 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from krakenfx.utils.config import Settings
+
+
+class OHLCResampleCache:
+    """LRU cache of resampled OHLC candles.
+
+    Keys start with the ohlc asset pair id so the entries of a pair can be
+    invalidated when new candles are stored. Entries older than
+    OHLC_RESAMPLE_CACHE_TTL seconds are treated as missing, as the last
+    bucket of a range may still be filling up.
+
+    The cache lives in the memory of each process and invalidate() only
+    reaches the entries of the calling one. Candles written by another
+    process (the import_OHLCVT and backfill_OHLCVT scripts, another worker)
+    are not seen until the entries expire: OHLC_RESAMPLE_CACHE_TTL is the
+    bound on how stale a resample can get.
+    """
+
+    _instance = None
+    _initialized = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(
+        self,
+        settings: Settings,
+        logger: logging.Logger,
+    ):
+        if not self._initialized:
+            self._settings = settings
+            self._logger = logger
+            self.max_size = settings.OHLC_RESAMPLE_CACHE_SIZE
+            self.ttl = settings.OHLC_RESAMPLE_CACHE_TTL
+            self._entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self._initialized = True
+
+    def get(self, key: Hashable) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: object):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, asset_pair_id: Optional[int] = None):
+        """Drop the entries of a pair, or every entry when no pair is given."""
+        if asset_pair_id is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == asset_pair_id]:
+                del self._entries[key]
+        self._logger.debug(f"Resampled OHLC cache invalidated ({asset_pair_id}).")
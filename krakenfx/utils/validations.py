@@ -21,7 +21,7 @@ T = TypeVar("T", bound=BaseModel)
 @async_handle_errors
 async def check_response_errors(response):
     if response["error"] and len(response["error"]) > 0:
-        logger.trace(json.dumps(f"L> Response contain errors: {response['error']}"))
+        logger.trace("L> Response contain errors: %s", response["error"])
         if "EAPI:Invalid key" in response["error"]:
             raise KrakenInvalidAPIKeyException(
                 f"KrakenInvalidAPIKeyException: {response['error']}"